@@ -0,0 +1,76 @@
+"""hot path indexes
+
+Revision ID: 15a0dc10a964
+Revises: d73b8847ad71
+Create Date: 2026-10-18 10:12:41.207513
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "15a0dc10a964"
+down_revision = "d73b8847ad71"
+branch_labels = None
+depends_on = None
+
+# name, table, columns, partial index condition
+INDEXES = [
+    ("taskstags_task_index", "taskstags", ["task_id"], None),
+    ("tags_tenant_index", "tags", ["tenant_id", "id"], None),
+    ("tasks_tenant_index", "tasks", ["tenant_id", "id"], None),
+    (
+        "tasks_assigned_scheduled_index",
+        "tasks",
+        ["assigned_to", "scheduled_at"],
+        "scheduled_at IS NOT NULL",
+    ),
+    (
+        "tasks_scheduled_assigned_index",
+        "tasks",
+        ["scheduled_at", "assigned_to"],
+        "scheduled_at IS NOT NULL",
+    ),
+    (
+        "events_tenant_created_index",
+        "events",
+        ["tenant_id", sa.text("created_at DESC")],
+        None,
+    ),
+    (
+        "subscriptions_contact_name_index",
+        "subscriptions",
+        ["contact_id", "name"],
+        None,
+    ),
+    ("tokens_last_activity_index", "tokens", ["last_activity_at"], None),
+    ("tokens_temp_created_index", "tokens", ["created_at"], "temp"),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run in a transaction but doesn't lock writes on tables
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,54 @@
+"""events outbox
+
+Revision ID: 4c7e2f90b1d3
+Revises: a031baaf11ce
+Create Date: 2026-10-18 16:42:10.218734
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4c7e2f90b1d3"
+down_revision = "a031baaf11ce"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "events_outbox",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("tenant_id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("idempotency_key", sa.String(), nullable=True),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("observers_done", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("idempotency_key"),
+    )
+    op.create_index(
+        "events_outbox_pending_index",
+        "events_outbox",
+        ["available_at"],
+        unique=False,
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+    op.create_index(
+        "events_outbox_processed_index",
+        "events_outbox",
+        ["processed_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("events_outbox_processed_index", table_name="events_outbox")
+    op.drop_index("events_outbox_pending_index", table_name="events_outbox")
+    op.drop_table("events_outbox")
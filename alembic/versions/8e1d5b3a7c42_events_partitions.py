@@ -0,0 +1,100 @@
+"""events partitions
+
+Revision ID: 8e1d5b3a7c42
+Revises: 4c7e2f90b1d3
+Create Date: 2026-10-18 18:05:27.631904
+
+"""
+
+from datetime import date, datetime, timezone
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8e1d5b3a7c42"
+down_revision = "4c7e2f90b1d3"
+branch_labels = None
+depends_on = None
+
+# Next ones are created by the maintain_events_partitions job
+MONTHS_AHEAD = 3
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def create_events_table(name: str, **kwargs) -> None:
+    op.create_table(
+        name,
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("tenant_id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint(*kwargs.pop("primary_key", ["id"])),
+        **kwargs,
+    )
+
+
+def upgrade() -> None:
+    op.drop_index("events_tenant_created_index", table_name="events")
+    op.rename_table("events", "events_unpartitioned")
+    op.execute(
+        "ALTER TABLE events_unpartitioned "
+        "RENAME CONSTRAINT events_pkey TO events_unpartitioned_pkey"
+    )
+
+    create_events_table(
+        "events",
+        primary_key=["id", "created_at"],
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "events_tenant_created_index",
+        "events",
+        ["tenant_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+    # Monthly partitions from the oldest event up to the coming months
+    today = datetime.now(tz=timezone.utc).date()
+    oldest = op.get_bind().scalar(
+        sa.text("SELECT min(created_at) FROM events_unpartitioned")
+    )
+    month = (oldest.astimezone(timezone.utc).date() if oldest else today).replace(day=1)
+    last_month = today.replace(day=1)
+    for _ in range(MONTHS_AHEAD):
+        last_month = next_month(last_month)
+
+    while month <= last_month:
+        op.execute(
+            f"CREATE TABLE events_y{month.year}m{month.month:02d} "
+            f"PARTITION OF events FOR VALUES FROM ('{month} 00:00:00+00') "
+            f"TO ('{next_month(month)} 00:00:00+00')"
+        )
+        month = next_month(month)
+
+    op.execute("INSERT INTO events SELECT * FROM events_unpartitioned")
+    op.drop_table("events_unpartitioned")
+
+
+def downgrade() -> None:
+    create_events_table("events_unpartitioned")
+    op.execute("INSERT INTO events_unpartitioned SELECT * FROM events")
+
+    # Partitions are dropped with their table
+    op.drop_table("events")
+    op.rename_table("events_unpartitioned", "events")
+    op.execute(
+        "ALTER TABLE events RENAME CONSTRAINT events_unpartitioned_pkey TO events_pkey"
+    )
+    op.create_index(
+        "events_tenant_created_index",
+        "events",
+        ["tenant_id", sa.text("created_at DESC")],
+        unique=False,
+    )
@@ -0,0 +1,59 @@
+"""user permissions
+
+Revision ID: a031baaf11ce
+Revises: 15a0dc10a964
+Create Date: 2026-10-18 14:05:27.481390
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a031baaf11ce"
+down_revision = "15a0dc10a964"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_permissions",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("resource", sa.String(length=80), nullable=False),
+        sa.Column("tenant_id", sa.String(), nullable=False),
+        sa.Column("permissions", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["tenant_id"],
+            ["groups.id"],
+            name="fk_user_permissions_tenant_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name="fk_user_permissions_user_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("user_id", "resource", "tenant_id"),
+    )
+    op.create_index(
+        "user_permissions_covering_index",
+        "user_permissions",
+        ["user_id", "resource", "tenant_id"],
+        unique=False,
+        postgresql_include=["permissions"],
+    )
+
+    # Backfill from existing roles and rights, in the same transaction
+    op.execute("""
+        INSERT INTO user_permissions (user_id, tenant_id, resource, permissions)
+        SELECT roles.user_id, roles.group_id, rights.resource, rights.permissions
+        FROM roles JOIN rights ON rights.roletype_id = roles.roletype_id
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index("user_permissions_covering_index", table_name="user_permissions")
+    op.drop_table("user_permissions")
@@ -1,4 +1,4 @@
-from src.events.persistence.sqlalchemy import EventDB
+from src.events.persistence.sqlalchemy import EventDB, OutboxDB
 
 from .settings import APP_NAME
 
@@ -8,6 +8,7 @@ def common_data(project_dir: str) -> dict:
         "domains": [APP_NAME],
         "repositories": [
             (APP_NAME, "Event", EventDB()),
+            (APP_NAME, "OutboxEvent", OutboxDB()),
         ],
         "permissions_resources": [
             "Event",
@@ -1,10 +1,11 @@
 from datetime import timedelta
 
 from flask import current_app, g, request
-from src.events.hmi.dto import EventDTOMapperDTO
+from src.events.hmi.dto import EventDTO, EventDTOMapperDTO
 from src.events.services import EventsService
 from src.libs.flask.utils import ResponseAPI
 from src.libs.hmi import list_dto_to_dict, list_models_to_list_dto
+from src.libs.hmi.querystring import QueryStringFilter
 from src.libs.iam.flask.config import login_required
 from src.libs.redis import rate_limited
 
@@ -20,12 +21,20 @@ def get_events(tenant_id: str):
     event_service = EventsService(current_app.dependencies)
 
     if request.method == "GET":
+        qsf = QueryStringFilter(
+            query_string=request.query_string.decode(),
+            dto=EventDTO,
+            default_sort=("created_at", False),
+        )
+
         events = event_service.get_all_tenant_events(
-            user_id=g.user.id, tenant_id=tenant_id
+            user_id=g.user.id, tenant_id=tenant_id, qs_filters=qsf.get_filters()
         )
         events_dto = list_models_to_list_dto(EventDTOMapperDTO, events)
 
-        return ResponseAPI.get_response(list_dto_to_dict(events_dto), 200)
+        return ResponseAPI.get_list_response(
+            list_dto_to_dict(events_dto, qsf.get_fields()), qsf.get_next_cursor(events)
+        )
 
     else:
         return ResponseAPI.get_405_response()
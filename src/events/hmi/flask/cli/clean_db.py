@@ -10,7 +10,7 @@ from . import events_cli_bp, logger
 @with_appcontext
 def clean_events_data():
     with current_app.dependencies.persistence.get_session() as session:
-        statement = text("TRUNCATE TABLE events CASCADE;")
+        statement = text("TRUNCATE TABLE events, events_outbox CASCADE;")
         session.execute(statement)
         session.commit()
         logger.info("SQL events tables cleaned.")
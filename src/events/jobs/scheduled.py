@@ -1,5 +1,6 @@
 from celery import Celery
 from celery.schedules import crontab
+from src.settings import EVENTS_OUTBOX, EVENTS_OUTBOX_RELAY_INTERVAL
 
 
 def schedule_tasks(app: Celery):
@@ -7,3 +8,14 @@ def schedule_tasks(app: Celery):
         "task": "src.events.jobs.tasks.celery_health_check",
         "schedule": crontab(minute=0),
     }
+
+    app.conf.beat_schedule["maintain-events-partitions"] = {
+        "task": "src.events.jobs.tasks.maintain_events_partitions",
+        "schedule": crontab(hour=2, minute=30),
+    }
+
+    if EVENTS_OUTBOX:
+        app.conf.beat_schedule["relay-outbox-events"] = {
+            "task": "src.events.jobs.tasks.relay_outbox_events",
+            "schedule": EVENTS_OUTBOX_RELAY_INTERVAL,
+        }
@@ -1,4 +1,5 @@
-from celery import shared_task
+from celery import current_app, shared_task
+from src.events.services import EventsService
 
 
 @shared_task()
@@ -6,3 +7,27 @@ def celery_health_check(msg: str):
     """A task to check if celery is running"""
     print(msg)
     return msg
+
+
+@shared_task()
+def run_async_observers(events: list[dict]):
+    """Run observers of events emitted elsewhere (eg: during a request)"""
+
+    current_app.dependencies.eventbus.run_async_observers(events)
+
+    return len(events)
+
+
+@shared_task()
+def relay_outbox_events():
+    """Dispatch events of the outbox, many relays can run at the same time"""
+
+    return current_app.dependencies.eventbus.relay_outbox_events()
+
+
+@shared_task()
+def maintain_events_partitions():
+    """Create partitions of the coming months and apply events retentions"""
+
+    service = EventsService(services=current_app.dependencies)
+    return service.maintain_partitions()
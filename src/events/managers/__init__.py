@@ -1 +1,2 @@
 from .event_manager import *
+from .outbox_manager import *
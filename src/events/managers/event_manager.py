@@ -1,8 +1,18 @@
+from datetime import date, datetime, time, timedelta
+from logging import getLogger
+from typing import Callable
+from zoneinfo import ZoneInfo
+
 from src.events.models import Event
 from src.events.persistence import EventDBPort
-from src.events.settings import APP_NAME
+from src.events.settings import APP_NAME, MAX_RETENTION_DAYS, RETENTION_BY_NAME
 from src.libs.dependencies import DependencyInjector
+from src.libs.hmi.querystring import Filter
 from src.libs.iam.constants import Permissions
+from src.libs.utils import next_month
+from src.settings import EVENTS_PARTITIONS_AHEAD, EVENTS_RETENTION_DAYS
+
+logger = getLogger(__name__)
 
 
 class EventManager:
@@ -13,7 +23,11 @@ class EventManager:
         )
 
     def get_all_tenant_events(
-        self, session, user_id: str, tenant_id: str
+        self,
+        session,
+        user_id: str,
+        tenant_id: str,
+        qs_filters: list[Filter] | None = None,
     ) -> list[Event]:
         tenant_ids = self.services.identity.all_tenants_with_access(
             session,
@@ -24,7 +38,7 @@ class EventManager:
 
         if tenant_id in tenant_ids:
             return self.event_db.get_all_from_tenant(
-                session=session, tenant_id=tenant_id
+                session=session, tenant_id=tenant_id, filters=qs_filters
             )
 
         return []
@@ -41,4 +55,60 @@ class EventManager:
         return event
 
     def bulk_add(self, session, events: list[Event]) -> list[Event]:
-        return self.event_db.bulk_save(session, objs=events)
+        self.event_db.bulk_insert(session, objs=events)
+        return events
+
+    def maintain_partitions(self, session, now: datetime | None = None) -> dict:
+        """
+        Create partitions of the coming months and drop the ones holding
+        only expired events, then delete events of shorter retentions.
+        """
+
+        now = now or datetime.now(tz=ZoneInfo("UTC"))
+        partitions = self.event_db.get_partitions(session)
+
+        created = []
+        month = now.date().replace(day=1)
+        for _ in range(EVENTS_PARTITIONS_AHEAD + 1):
+            if month not in partitions:
+                if self._in_savepoint(
+                    session, self.event_db.create_partition, month=month
+                ):
+                    created.append(month)
+            month = next_month(month)
+
+        oldest = now - timedelta(days=MAX_RETENTION_DAYS)
+        dropped = [
+            month
+            for month in partitions
+            if datetime.combine(next_month(month), time(), ZoneInfo("UTC")) <= oldest
+        ]
+        dropped = [
+            month
+            for month in dropped
+            if self._in_savepoint(session, self.event_db.drop_partition, month=month)
+        ]
+
+        self.event_db.delete_expired(
+            session,
+            before=now - timedelta(days=EVENTS_RETENTION_DAYS),
+            excluded_names=list(RETENTION_BY_NAME),
+        )
+        for name, days in RETENTION_BY_NAME.items():
+            self.event_db.delete_expired(
+                session, before=now - timedelta(days=days), name=name
+            )
+
+        return {"created": len(created), "dropped": len(dropped)}
+
+    def _in_savepoint(self, session, operation: Callable, month: date) -> bool:
+        """A partition failing to change doesn't prevent others to"""
+
+        try:
+            with session.begin_nested():
+                operation(session, month=month)
+        except Exception as e:
+            logger.error(f"Partition of {month} not changed: {e}")
+            return False
+
+        return True
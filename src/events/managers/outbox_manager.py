@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from src.events.models import Event, OutboxEvent
+from src.events.persistence import OutboxDBPort
+from src.events.settings import APP_NAME
+from src.libs.dependencies import DependencyInjector
+from src.settings import (
+    EVENTS_OUTBOX_MAX_ATTEMPTS,
+    EVENTS_OUTBOX_RETENTION,
+    EVENTS_OUTBOX_RETRY_DELAY,
+)
+
+
+class OutboxManager:
+    def __init__(self, services: DependencyInjector) -> None:
+        self.services = services
+        self.outbox_db: OutboxDBPort = self.services.persistence.get_repository(
+            APP_NAME, "OutboxEvent"
+        )
+
+    def add_events(
+        self,
+        session,
+        events: list[Event],
+        idempotency_keys: list[str | None] | None = None,
+    ) -> list[OutboxEvent]:
+        idempotency_keys = idempotency_keys or [None] * len(events)
+        outbox_events = [
+            OutboxEvent(
+                tenant_id=event.tenant_id,
+                name=event.name,
+                data=event.data,
+                idempotency_key=idempotency_key,
+                id=event.id,
+                created_at=event.created_at,
+            )
+            for event, idempotency_key in zip(events, idempotency_keys)
+        ]
+        self.outbox_db.add_events(session, events=outbox_events)
+
+        return outbox_events
+
+    def claim_events(self, session, limit: int) -> list[OutboxEvent]:
+        """Events locked until the end of the transaction, skipped by other relays"""
+
+        return self.outbox_db.claim_events(session, limit=limit)
+
+    def mark_processed(self, session, events: list[OutboxEvent]) -> None:
+        self.outbox_db.mark_processed(session, ids=[event.id for event in events])
+
+    def mark_failed(self, session, events: list[OutboxEvent]) -> None:
+        self.outbox_db.mark_failed(
+            session,
+            ids=[event.id for event in events],
+            max_attempts=EVENTS_OUTBOX_MAX_ATTEMPTS,
+            retry_delay=EVENTS_OUTBOX_RETRY_DELAY,
+        )
+
+    def clean_processed(self, session) -> None:
+        before = datetime.now(tz=ZoneInfo("UTC")) - timedelta(
+            seconds=EVENTS_OUTBOX_RETENTION
+        )
+        self.outbox_db.clean_processed(session, before=before)
@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from src.libs.security.utils import get_id
+
+
+@dataclass
+class OutboxEvent:
+    """An event waiting for its async observers, saved with the emitting transaction"""
+
+    tenant_id: str
+    name: str
+    data: dict = field(default_factory=dict)
+    idempotency_key: str | None = None
+    id: str = field(kw_only=True, default="")
+    created_at: datetime | None = field(kw_only=True, default=None)
+    available_at: datetime | None = field(kw_only=True, default=None)
+    processed_at: datetime | None = field(kw_only=True, default=None)
+    attempts: int = field(kw_only=True, default=0)
+    # Observers already run, they are not run again when the event is retried
+    observers_done: list[str] = field(kw_only=True, default_factory=list)
+
+    def __post_init__(self):
+        self.id = self.id or get_id()
+        self.created_at = self.created_at or datetime.now(tz=ZoneInfo("UTC"))
+        self.available_at = self.available_at or self.created_at
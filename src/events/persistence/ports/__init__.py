@@ -1 +1,2 @@
 from .event import *
+from .outbox import *
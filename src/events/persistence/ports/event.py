@@ -1,10 +1,36 @@
 from abc import ABC, abstractmethod
+from datetime import date, datetime
 
 from src.events.models import Event
+from src.libs.hmi.querystring import Filter
 from src.ports import AbstractDBPort
 
 
 class EventDBPort(AbstractDBPort, ABC):
     @abstractmethod
-    def get_all_from_tenant(self, session, tenant_id: str) -> list[Event]:
+    def get_all_from_tenant(
+        self, session, tenant_id: str, filters: list[Filter] | None = None
+    ) -> list[Event]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_partitions(self, session) -> list[date]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def create_partition(self, session, month: date) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def drop_partition(self, session, month: date) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def delete_expired(
+        self,
+        session,
+        before: datetime,
+        name: str | None = None,
+        excluded_names: list[str] | None = None,
+    ) -> None:
         raise NotImplementedError()
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from src.events.models import OutboxEvent
+from src.ports import AbstractDBPort
+
+
+class OutboxDBPort(AbstractDBPort, ABC):
+    @abstractmethod
+    def add_events(self, session, events: list[OutboxEvent]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def claim_events(self, session, limit: int) -> list[OutboxEvent]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def mark_processed(self, session, ids: list[str]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def mark_failed(
+        self, session, ids: list[str], max_attempts: int, retry_delay: int
+    ) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def clean_processed(self, session, before: datetime) -> None:
+        raise NotImplementedError()
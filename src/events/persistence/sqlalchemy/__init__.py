@@ -1 +1 @@
-from .adapters import EventDB
+from .adapters import EventDB, OutboxDB
@@ -1 +1,2 @@
 from .event_db import *
+from .outbox_db import *
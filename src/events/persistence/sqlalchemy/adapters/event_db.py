@@ -1,18 +1,115 @@
+import re
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, text
 from sqlalchemy.orm import Session
 
 from src.events.models import Event
 from src.events.persistence.ports import EventDBPort
 from src.events.persistence.sqlalchemy.querysets import EventQueryset
+from src.events.persistence.sqlalchemy.tables import events_table
+from src.events.settings import MAX_RETENTION_DAYS
+from src.libs.hmi.querystring import Filter, with_default_sort
 from src.libs.sqlalchemy.default_adapter import DefaultDB
+from src.libs.utils import next_month
+
+PARTITION_NAME = re.compile(r"^events_y(\d{4})m(\d{2})$")
+
+
+def get_partition_name(month: date) -> str:
+    return f"events_y{month.year}m{month.month:02d}"
 
 
 class EventDB(EventDBPort, DefaultDB):
+    """
+    Events are partitioned by month (range of created_at), in tables named
+    events_yYYYYmMM, with a default partition for events out of them.
+    """
+
     def __init__(self) -> None:
         super().__init__()
         self.qs = EventQueryset()
 
-    def get_all_from_tenant(self, session: Session, tenant_id: str) -> list[Event]:
-        self.qs.select().where(Event.tenant_id == tenant_id).order_by(
-            created_at="DESC"
-        ).limit(100)
-        return session.scalars(self.qs.statement).all()
+    def get_all_from_tenant(
+        self, session: Session, tenant_id: str, filters: list[Filter] | None = None
+    ) -> list[Event]:
+        # Events older than the longest retention are expired, their partitions
+        # are skipped until dropped
+        since = datetime.now(tz=ZoneInfo("UTC")) - timedelta(days=MAX_RETENTION_DAYS)
+        qs = (
+            self.qs.select()
+            .from_filters(with_default_sort(filters, "created_at", asc=False))
+            .filter_by(tenant_id=tenant_id)
+            .created_since(since)
+        )
+        return session.scalars(qs.statement, qs.params).all()
+
+    def get_partitions(self, session: Session) -> list[date]:
+        """First day of months with a partition"""
+
+        names = session.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = 'events'::regclass"
+            )
+        ).all()
+
+        return sorted(
+            date(int(match[1]), int(match[2]), 1)
+            for name in names
+            if (match := PARTITION_NAME.match(name))
+        )
+
+    def create_partition(self, session: Session, month: date) -> None:
+        """
+        A partition can't be created while the default partition holds rows
+        of its range: they are moved to the new partition, the default one
+        being detached meanwhile.
+        """
+
+        # Bounds in UTC, whatever the timezone of the database session
+        lower, upper = f"{month} 00:00:00+00", f"{next_month(month)} 00:00:00+00"
+        in_range = f"created_at >= '{lower}' AND created_at < '{upper}'"
+
+        has_default_rows = session.scalar(
+            text(f"SELECT EXISTS (SELECT 1 FROM events_default WHERE {in_range})")
+        )
+        if has_default_rows:
+            session.execute(text("ALTER TABLE events DETACH PARTITION events_default"))
+
+        session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {get_partition_name(month)} "
+                f"PARTITION OF events FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            )
+        )
+
+        if has_default_rows:
+            session.execute(
+                text(f"INSERT INTO events SELECT * FROM events_default WHERE {in_range}")
+            )
+            session.execute(text(f"DELETE FROM events_default WHERE {in_range}"))
+            session.execute(
+                text("ALTER TABLE events ATTACH PARTITION events_default DEFAULT")
+            )
+
+    def drop_partition(self, session: Session, month: date) -> None:
+        session.execute(text(f"DROP TABLE IF EXISTS {get_partition_name(month)}"))
+
+    def delete_expired(
+        self,
+        session: Session,
+        before: datetime,
+        name: str | None = None,
+        excluded_names: list[str] | None = None,
+    ) -> None:
+        """Delete events of a name, or of all names but excluded ones"""
+
+        statement = delete(events_table).where(events_table.c.created_at < before)
+        if name is not None:
+            statement = statement.where(events_table.c.name == name)
+        if excluded_names:
+            statement = statement.where(events_table.c.name.not_in(excluded_names))
+        session.execute(statement)
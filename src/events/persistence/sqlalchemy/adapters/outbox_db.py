@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.events.models import OutboxEvent
+from src.events.persistence.ports import OutboxDBPort
+from src.events.persistence.sqlalchemy.querysets import OutboxQueryset
+from src.events.persistence.sqlalchemy.tables import outbox_table
+from src.libs.sqlalchemy.default_adapter import DefaultDB
+
+
+class OutboxDB(OutboxDBPort, DefaultDB):
+    """
+    Events are claimed with FOR UPDATE SKIP LOCKED: many relays can run at once,
+    each one gets its own events, locked until its transaction ends.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.qs = OutboxQueryset()
+
+    def add_events(self, session: Session, events: list[OutboxEvent]) -> None:
+        """Events with an idempotency key already known are ignored"""
+
+        if not events:
+            return
+
+        rows = [
+            {column.key: getattr(event, column.key) for column in outbox_table.columns}
+            for event in events
+        ]
+        session.execute(
+            insert(outbox_table).on_conflict_do_nothing(
+                index_elements=["idempotency_key"]
+            ),
+            rows,
+        )
+
+    def claim_events(self, session: Session, limit: int) -> list[OutboxEvent]:
+        statement = (
+            select(OutboxEvent)
+            .where(
+                outbox_table.c.processed_at.is_(None),
+                outbox_table.c.available_at <= func.now(),
+            )
+            .order_by(outbox_table.c.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return session.scalars(statement).all()
+
+    def mark_processed(self, session: Session, ids: list[str]) -> None:
+        if ids:
+            session.execute(
+                update(outbox_table)
+                .where(outbox_table.c.id.in_(ids))
+                .values(processed_at=func.now())
+            )
+
+    def mark_failed(
+        self, session: Session, ids: list[str], max_attempts: int, retry_delay: int
+    ) -> None:
+        """Retry later, an event failing max_attempts times is marked processed"""
+
+        if not ids:
+            return
+
+        attempts = outbox_table.c.attempts + 1
+        session.execute(
+            update(outbox_table)
+            .where(outbox_table.c.id.in_(ids))
+            .values(
+                attempts=attempts,
+                available_at=func.now() + attempts * timedelta(seconds=retry_delay),
+                processed_at=case((attempts >= max_attempts, func.now()), else_=None),
+            )
+        )
+
+    def clean_processed(self, session: Session, before: datetime) -> None:
+        session.execute(delete(outbox_table).where(outbox_table.c.processed_at < before))
@@ -1 +1,2 @@
 from .event_qs import *
+from .outbox_qs import *
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Self
 
 from src.events.models import Event
@@ -9,5 +10,13 @@ class EventQueryset(Queryset):
         super().__init__(Event)
 
     def of_type(self, event_name: str) -> Self:
-        self._query = self._query.where(Event.name == event_name)
-        return self
+        return self.filter_by(name=event_name)
+
+    def created_since(self, since: datetime) -> Self:
+        """Bound on the partition key: older partitions are not scanned"""
+
+        return self._chain(
+            "created_since",
+            lambda query, since: query.where(Event.created_at >= since),
+            since=since,
+        )
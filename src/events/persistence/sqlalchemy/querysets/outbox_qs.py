@@ -0,0 +1,7 @@
+from src.events.models import OutboxEvent
+from src.libs.sqlalchemy.queryset import Queryset
+
+
+class OutboxQueryset(Queryset):
+    def __init__(self):
+        super().__init__(OutboxEvent)
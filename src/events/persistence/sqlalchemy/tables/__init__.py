@@ -1 +1,2 @@
 from .event_table import *
+from .outbox_table import *
@@ -1,11 +1,12 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import Column, DateTime, String, Table, types
+from sqlalchemy import DDL, Column, DateTime, Index, String, Table, event, types
 
 from src.events.models import Event
 from src.libs.sqlalchemy.base import mapper_registry
 
+# Partitioned by month (see EventDB), created_at must be part of the primary key
 events_table = Table(
     "events",
     mapper_registry.metadata,
@@ -14,11 +15,25 @@ events_table = Table(
         "created_at",
         DateTime(timezone=True),
         default=datetime.now(tz=ZoneInfo("UTC")),
-        nullable=False,
+        primary_key=True,
     ),
     Column("tenant_id", String, nullable=False),
     Column("name", String, nullable=False),
     Column("data", types.JSON, nullable=True),
+    postgresql_partition_by="RANGE (created_at)",
+)
+
+Index(
+    "events_tenant_created_index",
+    events_table.c.tenant_id,
+    events_table.c.created_at.desc(),
+)
+
+# Events out of monthly partitions are never rejected
+event.listen(
+    events_table,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT"),
 )
 
 
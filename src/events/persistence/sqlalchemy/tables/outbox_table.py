@@ -0,0 +1,33 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, Table, types
+
+from src.events.models import OutboxEvent
+from src.libs.sqlalchemy.base import mapper_registry
+
+outbox_table = Table(
+    "events_outbox",
+    mapper_registry.metadata,
+    Column("id", String, primary_key=True),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("tenant_id", String, nullable=False),
+    Column("name", String, nullable=False),
+    Column("data", types.JSON, nullable=True),
+    Column("idempotency_key", String, nullable=True, unique=True),
+    Column("available_at", DateTime(timezone=True), nullable=False),
+    Column("processed_at", DateTime(timezone=True), nullable=True),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("observers_done", types.JSON, nullable=False, default=list),
+)
+
+# Relays only look for pending events: the index stays small
+Index(
+    "events_outbox_pending_index",
+    outbox_table.c.available_at,
+    postgresql_where=outbox_table.c.processed_at.is_(None),
+)
+Index("events_outbox_processed_index", outbox_table.c.processed_at)
+
+
+mapper_registry.map_imperatively(
+    OutboxEvent,
+    outbox_table,
+)
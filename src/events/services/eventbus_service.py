@@ -1,19 +1,46 @@
-from copy import copy
+import logging
+from contextvars import ContextVar
+from threading import Lock
 from typing import Callable, Self
 
-from src.events.models import Event
+from celery import Celery
+from src.events.models import Event, OutboxEvent
+from src.libs.celery import create_celery_producer
 from src.ports import EventBusPort, ObserverPort
+from src.settings import ASYNC_OBSERVERS, EVENTS_BUFFER_SIZE, EVENTS_OUTBOX
 
 from .events_service import EventsService
 
+logger = logging.getLogger(__name__)
+
+
+def get_observer_name(func: Callable) -> str:
+    """Stable name of a subscribed function (eg: Observer.run_batch)"""
+
+    owner = getattr(func, "__self__", None)
+    if isinstance(owner, type):
+        return f"{owner.__module__}.{owner.__qualname__}.{func.__name__}"
+    return f"{func.__module__}.{func.__qualname__}"
+
 
 class EventBusService(EventBusPort):
-    events: dict[str, list[Event]] = {}
-    index: dict[str, list[Callable]] = {}
+    """
+    Shared by all requests and tasks of a process: emitted events are buffered
+    per context (thread, greenlet...), subscriptions are shared and only read
+    once set_context is done.
+    """
+
+    index: dict[str, list[Callable]]
+    async_index: dict[str, list[Callable]]
 
     def __init__(self, **kwargs) -> None:
-        self.events = {}
         self.index = {}
+        self.async_index = {}
+        self._events: ContextVar[dict[str, list[Event]] | None] = ContextVar(
+            "events", default=None
+        )
+        self._producer: Celery | None = None
+        self._lock = Lock()
 
     def set_context(self, **ctx) -> None:
         self.app = ctx.get("app")
@@ -22,21 +49,45 @@ class EventBusService(EventBusPort):
         observers = ObserverPort.__subclasses__()
         for obs in observers:
             [
-                self.subscribe(event_name=name, function=func)
+                self.subscribe(
+                    event_name=name, function=func, sync_required=obs.sync_required
+                )
                 for name, func in obs.self_subscribe()
             ]
 
+    @property
+    def events(self) -> dict[str, list[Event]]:
+        """Events emitted in the current context, not yet executed"""
+
+        events = self._events.get()
+        if events is None:
+            events = {}
+            self._events.set(events)
+        return events
+
     def __enter__(self) -> Self:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.execute()
 
-    def emit(self, tenant_id: str, event_name: str, event_data: dict) -> None:
-        if event_name not in self.events:
-            self.events[event_name] = []
+    def emit(
+        self,
+        tenant_id: str,
+        event_name: str,
+        event_data: dict,
+        idempotency_key: str | None = None,
+    ) -> None:
+        """An idempotency key dispatches the event once to async observers"""
+
+        events = self.events
+        if event_name not in events:
+            events[event_name] = []
 
-        self.events[event_name].append(
+        if idempotency_key is not None:
+            event_data["_idempotency_key"] = idempotency_key
+
+        events[event_name].append(
             Event(
                 tenant_id=tenant_id,
                 name=event_name,
@@ -44,30 +95,151 @@ class EventBusService(EventBusPort):
             )
         )
 
-    def subscribe(self, event_name: str, function: Callable):
-        if event_name not in self.index:
-            self.index[event_name] = []
+        # Bounded buffer: a long loop of emits is executed as it goes
+        if sum(len(e) for e in events.values()) >= EVENTS_BUFFER_SIZE:
+            logger.warning(f"{EVENTS_BUFFER_SIZE} events buffered, executed early")
+            self.execute()
 
-        self.index[event_name].append(function)
+    def subscribe(self, event_name: str, function: Callable, sync_required=True):
+        """
+        function(app_ctx, event_name, events) is called once with the data
+        of all events of this name executed together.
+        """
 
-    def execute(self):
-        self.event_service = EventsService(services=self.app.dependencies)
+        is_async = not sync_required and (ASYNC_OBSERVERS or EVENTS_OUTBOX)
+        index = self.async_index if is_async else self.index
 
-        local_events = copy(self.events)
-        self.events.clear()
+        if event_name not in index:
+            index[event_name] = []
 
+        index[event_name].append(function)
+
+    def execute(self, event_service: EventsService | None = None):
+        """
+        The bus is shared by the whole process:
+        the events service is kept per call, not on the instance.
+        """
+
+        event_service = event_service or EventsService(services=self.app.dependencies)
+
+        # Events emitted by observers go to a new buffer
+        local_events = self.events
+        self._events.set({})
+
+        async_events = []
+        outbox_events, idempotency_keys = [], []
         for event_name, events in local_events.items():
-            self.event_service.bulk_add_events(events)
+            keys = [event.data.pop("_idempotency_key", None) for event in events]
+
+            if EVENTS_OUTBOX and event_name in self.async_index:
+                outbox_events.extend(events)
+                idempotency_keys.extend(keys)
+            else:
+                event_service.bulk_add_events(events)
+
+            observers = self.index.get(event_name, [])
+            for func in observers:
+                func(self.app, event_name, [event.data for event in events])
+
+            if not EVENTS_OUTBOX and event_name in self.async_index:
+                async_events.extend(
+                    {"name": event_name, "data": event.data} for event in events
+                )
+
+        if outbox_events:
+            event_service.add_outbox_events(
+                outbox_events, idempotency_keys, after_commit=self.wake_up_relay
+            )
 
-            for event in events:
-                observers = self.index.get(event_name, [])
-                for func in observers:
-                    func(self.app, event_name, event.data)
+        # Workers must not run observers of rolled back changes, nor read them
+        if async_events:
+            event_service.after_commit(self.dispatch, async_events)
 
         if len(self.events):
-            self.execute()
+            self.execute(event_service)
+
+    def _get_producer(self) -> Celery:
+        if isinstance(self.app, Celery):
+            return self.app
+
+        if self._producer is None:
+            with self._lock:
+                if self._producer is None:
+                    self._producer = create_celery_producer(self.app.dependencies)
+
+        return self._producer
+
+    def dispatch(self, events: list[dict]) -> None:
+        """
+        Send events to a worker in a single task, to run async observers.
+        Observers are run in place if the broker can't be reached.
+        """
+
+        try:
+            self._get_producer().send_task(
+                "src.events.jobs.tasks.run_async_observers", args=[events]
+            )
+        except Exception as e:
+            logger.error(f"Async observers dispatch failed, run in place: {e}")
+            self.run_async_observers(events)
+
+    def wake_up_relay(self) -> None:
+        """Relay new events at once, instead of waiting for the next periodic run"""
+
+        try:
+            self._get_producer().send_task("src.events.jobs.tasks.relay_outbox_events")
+        except Exception as e:
+            logger.warning(f"Outbox relay not woken up: {e}")
+
+    def relay_outbox_events(self) -> int:
+        """Run async observers of committed events of the outbox"""
+
+        event_service = EventsService(services=self.app.dependencies)
+        return event_service.relay_outbox_events(self._run_outbox_events)
+
+    def _run_outbox_events(
+        self, event_name: str, events: list[OutboxEvent], savepoint: Callable
+    ) -> None:
+        """
+        All observers run, each one in a savepoint. Events are retried if one
+        of them failed, only for observers which have not run them yet.
+        """
+
+        errors = []
+        for func in self.async_index.get(event_name, []):
+            observer = get_observer_name(func)
+            pending = [event for event in events if observer not in event.observers_done]
+            if not pending:
+                continue
+
+            try:
+                with savepoint():
+                    func(self.app, event_name, [event.data for event in pending])
+            except Exception as e:
+                errors.append(e)
+                continue
+
+            for event in pending:
+                event.observers_done = [*event.observers_done, observer]
+
+        if errors:
+            raise errors[0]
+
+    def run_async_observers(self, events: list[dict]) -> None:
+        """An observer failing doesn't prevent others to run"""
+
+        events_data: dict[str, list[dict]] = {}
+        for event in events:
+            events_data.setdefault(event["name"], []).append(event["data"])
+
+        for event_name, data in events_data.items():
+            for func in self.async_index.get(event_name, []):
+                try:
+                    func(self.app, event_name, data)
+                except Exception as e:
+                    logger.exception(f"Observer of {event_name} failed: {e}")
 
 
 class TestEventBusService(EventBusService):
-    def execute(self):
+    def execute(self, event_service: EventsService | None = None):
         self.events.clear()
@@ -1,8 +1,14 @@
+import logging
 from datetime import datetime
+from typing import Callable
 
-from src.events.managers import EventManager
-from src.events.models import Event
+from src.events.managers import EventManager, OutboxManager
+from src.events.models import Event, OutboxEvent
 from src.libs.dependencies import DependencyInjector
+from src.libs.hmi.querystring import Filter
+from src.settings import EVENTS_OUTBOX_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
 
 
 class EventsService:
@@ -15,21 +21,31 @@ class EventsService:
         """Define managers from domain (no DI here)"""
 
         self.event_manager = EventManager(services=self.services)
+        self.outbox_manager = OutboxManager(services=self.services)
 
     def get_all_events(self) -> list[Event]:
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.event_manager.get_all_events(session=session)
 
-    def get_all_tenant_events(self, user_id: str, tenant_id: str) -> list[Event]:
-        with self.services.persistence.get_session() as session:
+    def get_all_tenant_events(
+        self, user_id: str, tenant_id: str, qs_filters: list[Filter] | None = None
+    ) -> list[Event]:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.event_manager.get_all_tenant_events(
-                session=session, user_id=user_id, tenant_id=tenant_id
+                session=session,
+                user_id=user_id,
+                tenant_id=tenant_id,
+                qs_filters=qs_filters,
             )
 
     def get_all_events_of_name(self, name: str) -> list[Event]:
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.event_manager.get_all_events_of_name(session=session, name=name)
 
+    def maintain_partitions(self) -> dict:
+        with self.services.persistence.get_session() as session:
+            return self.event_manager.maintain_partitions(session=session)
+
     def add_event(
         self,
         tenant_id: str,
@@ -46,7 +62,77 @@ class EventsService:
                 created_at=created_at,
             )
 
+    def _bulk_add_events(self, session, events: list[Event]) -> None:
+        events_to_save = [e for e in events if e.data.pop("_save", True)]
+        self.event_manager.bulk_add(session=session, events=events_to_save)
+
     def bulk_add_events(self, events: list[Event]) -> list[Event]:
         with self.services.persistence.get_session() as session:
-            events_to_save = [e for e in events if e.data.pop("_save", True)]
-            self.event_manager.bulk_add(session=session, events=events_to_save)
+            self._bulk_add_events(session, events)
+
+    def add_outbox_events(
+        self,
+        events: list[Event],
+        idempotency_keys: list[str | None] | None = None,
+        after_commit: Callable | None = None,
+    ) -> None:
+        """
+        Save events and their dispatch at once, in the transaction of the emitter
+        when there is a unit of work: none is lost if it's committed.
+        """
+
+        with self.services.persistence.get_session() as session:
+            self._bulk_add_events(session, events)
+            self.outbox_manager.add_events(session, events, idempotency_keys)
+
+            if after_commit is not None:
+                self.services.persistence.after_commit(session, after_commit)
+
+    def after_commit(self, callback: Callable, *args) -> None:
+        """Run callback once the current unit of work (if any) is committed"""
+
+        with self.services.persistence.get_session() as session:
+            self.services.persistence.after_commit(session, callback, *args)
+
+    def relay_outbox_events(
+        self, dispatch: Callable[[str, list[OutboxEvent], Callable], None]
+    ) -> int:
+        """
+        Dispatch pending events by batches, each batch is committed on its own
+        and its events are dispatched by name.
+        An event is dispatched at least once: dispatched again if it fails
+        or if the relay stops before the commit.
+
+        dispatch(event_name, events, savepoint) must run each observer in a
+        savepoint(): observers may share the session holding the claimed
+        events, a failing statement must not abort its transaction.
+        """
+
+        nb_events = 0
+        with self.services.persistence.get_session() as session:
+            while events := self.outbox_manager.claim_events(
+                session, limit=EVENTS_OUTBOX_BATCH_SIZE
+            ):
+                events_by_name: dict[str, list[OutboxEvent]] = {}
+                for event in events:
+                    events_by_name.setdefault(event.name, []).append(event)
+
+                processed, failed = [], []
+                for event_name, named_events in events_by_name.items():
+                    try:
+                        dispatch(event_name, named_events, session.begin_nested)
+                        processed.extend(named_events)
+                    except Exception as e:
+                        logger.error(f"Outbox events {event_name} failed: {e}")
+                        failed.extend(named_events)
+
+                self.outbox_manager.mark_processed(session, processed)
+                self.outbox_manager.mark_failed(session, failed)
+                session.commit()
+
+                nb_events += len(events)
+
+            self.outbox_manager.clean_processed(session)
+            session.commit()
+
+        return nb_events
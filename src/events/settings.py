@@ -1 +1,13 @@
+from src.settings import EVENTS_RETENTION_BY_NAME, EVENTS_RETENTION_DAYS
+
 APP_NAME = "events"
+
+# Retention (days) of events by name, from "name=days,name=days"
+RETENTION_BY_NAME = {
+    name.strip(): int(days)
+    for name, days in (
+        item.split("=") for item in EVENTS_RETENTION_BY_NAME.split(",") if item.strip()
+    )
+}
+# Partitions older than the longest retention only hold expired events
+MAX_RETENTION_DAYS = max([EVENTS_RETENTION_DAYS, *RETENTION_BY_NAME.values()])
@@ -1,9 +1,16 @@
 import logging
 
 from celery import Celery
+from celery.signals import task_postrun, task_prerun
 from src.libs.dependencies import DependencyInjector
 from src.libs.self_setup import AppTypes, app_setup
-from src.settings import APP_NAME
+from src.libs.sqlalchemy.instrumentation import log_query_stats
+from src.settings import (
+    APP_NAME,
+    SQL_INSTRUMENTATION,
+    SQL_REPEAT_WARNING,
+    UNIT_OF_WORK,
+)
 
 from .config import Config
 
@@ -19,6 +26,72 @@ def create_celery_app(dependencies: DependencyInjector) -> Celery:
     config = Config(dependencies=dependencies)
     app.config_from_object(config)
 
+    if UNIT_OF_WORK:
+        setup_unit_of_work(dependencies)
+    else:
+        setup_read_your_writes(dependencies)
+
+    # After the unit of work: statements sent by the final commit are counted too
+    if SQL_INSTRUMENTATION:
+        setup_query_stats(dependencies)
+
     logger.info(f"{APP_NAME} ready !")
 
     return app
+
+
+def create_celery_producer(dependencies: DependencyInjector) -> Celery:
+    """A Celery app only sending tasks to workers (eg: from a web process)"""
+
+    return Celery(
+        __name__,
+        broker=dependencies.cache.get_database_url(),
+        set_as_current=False,
+    )
+
+
+def setup_unit_of_work(dependencies: DependencyInjector) -> None:
+    """Services and managers share a single session per task"""
+
+    def begin_unit_of_work(**kwargs):
+        dependencies.persistence.begin_unit_of_work()
+
+    def end_unit_of_work(state: str | None = None, **kwargs):
+        dependencies.persistence.end_unit_of_work(commit=state == "SUCCESS")
+
+    task_prerun.connect(begin_unit_of_work, weak=False)
+    task_postrun.connect(end_unit_of_work, weak=False)
+
+
+def setup_read_your_writes(dependencies: DependencyInjector) -> None:
+    """Writes of a task send its next reads to primary, not the ones of others"""
+
+    def reset_written(**kwargs):
+        dependencies.persistence.reset_written()
+
+    task_prerun.connect(reset_written, weak=False)
+
+
+def setup_query_stats(dependencies: DependencyInjector) -> None:
+    """Log SQL statements count and database time of each task"""
+
+    def begin_query_stats(**kwargs):
+        dependencies.persistence.begin_query_stats()
+
+    def report_query_stats(task=None, state: str | None = None, **kwargs):
+        query_stats = dependencies.persistence.end_query_stats()
+        if query_stats is None:
+            return
+
+        task_name = getattr(task, "name", "unknown")
+        log_query_stats(
+            logger,
+            task_name,
+            query_stats,
+            SQL_REPEAT_WARNING,
+            task=task_name,
+            state=state,
+        )
+
+    task_prerun.connect(begin_query_stats, weak=False)
+    task_postrun.connect(report_query_stats, weak=False)
@@ -1,9 +1,17 @@
 import logging
 
-from flask import Flask
+from flask import Flask, Response, g, request
 from src.libs.dependencies import DependencyInjector
+from src.libs.flask.utils import ResponseAPI
+from src.libs.hmi.querystring import InvalidCursorError
 from src.libs.self_setup import AppTypes, app_setup
-from src.settings import APP_NAME
+from src.libs.sqlalchemy.instrumentation import log_query_stats
+from src.settings import (
+    APP_NAME,
+    SQL_INSTRUMENTATION,
+    SQL_REPEAT_WARNING,
+    UNIT_OF_WORK,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +24,98 @@ def create_flask_app(dependencies: DependencyInjector) -> Flask:
     app = Flask(__name__)
     app_setup(app=app, app_type=AppTypes.FLASK, dependencies=dependencies)
     app.extensions["celery"] = celery
+    setup_error_handlers(app)
+
+    # Before the unit of work: after_request hooks run in reverse order,
+    # so statements sent by the final commit are counted too
+    if SQL_INSTRUMENTATION:
+        setup_query_stats(app)
+
+    if UNIT_OF_WORK:
+        setup_unit_of_work(app)
+    else:
+        setup_read_your_writes(app)
 
     logger.info(f"{APP_NAME} ready !")
 
     return app
+
+
+def setup_error_handlers(app: Flask) -> None:
+    """Errors raised by any endpoint for a bad request"""
+
+    @app.errorhandler(InvalidCursorError)
+    def invalid_cursor(error: InvalidCursorError) -> Response:
+        return ResponseAPI.get_400_response(str(error))
+
+
+def setup_unit_of_work(app: Flask) -> None:
+    """Services and managers share a single session per request"""
+
+    persistence = app.dependencies.persistence
+
+    @app.before_request
+    def begin_unit_of_work():
+        persistence.begin_unit_of_work()
+        g.unit_of_work_started = True
+
+    @app.after_request
+    def commit_unit_of_work(response: Response) -> Response:
+        if g.pop("unit_of_work_started", False):
+            persistence.end_unit_of_work(commit=response.status_code < 500)
+        return response
+
+    @app.teardown_request
+    def end_unit_of_work(exc: BaseException | None):
+        # Rollback if an unhandled error occurs before after_request
+        if g.pop("unit_of_work_started", False):
+            persistence.end_unit_of_work()
+
+
+def setup_read_your_writes(app: Flask) -> None:
+    """Writes of a request send its next reads to primary, not the ones of others"""
+
+    persistence = app.dependencies.persistence
+
+    @app.before_request
+    def reset_written():
+        persistence.reset_written()
+
+
+def setup_query_stats(app: Flask) -> None:
+    """Report SQL statements of each request in a Server-Timing header and logs"""
+
+    persistence = app.dependencies.persistence
+
+    @app.before_request
+    def begin_query_stats():
+        persistence.begin_query_stats()
+        g.query_stats_started = True
+
+    @app.after_request
+    def report_query_stats(response: Response) -> Response:
+        if not g.pop("query_stats_started", False):
+            return response
+
+        query_stats = persistence.end_query_stats()
+        if query_stats is None:
+            return response
+
+        response.headers.add("Server-Timing", query_stats.get_server_timing())
+        log_query_stats(
+            logger,
+            f"{request.method} {request.path}",
+            query_stats,
+            SQL_REPEAT_WARNING,
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+        )
+
+        return response
+
+    @app.teardown_request
+    def end_query_stats(exc: BaseException | None):
+        # Stop counting if an unhandled error occurs before after_request
+        if g.pop("query_stats_started", False):
+            persistence.end_query_stats()
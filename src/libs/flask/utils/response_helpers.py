@@ -4,6 +4,7 @@ from typing import Any
 from flask import Response
 
 JSON_MIME_TYPE = "application/json"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 class ResponseAPI:
@@ -24,6 +25,17 @@ class ResponseAPI:
             content_type=JSON_MIME_TYPE,
         )
 
+    @classmethod
+    def get_list_response(
+        cls, data: list, next_cursor: str | None = None, headers: dict | None = None
+    ) -> Response:
+        """The cursor to the next page (if any) is given in a header"""
+
+        headers = headers or {}
+        if next_cursor:
+            headers[NEXT_CURSOR_HEADER] = next_cursor
+        return cls.get_response(data, 200, headers=headers)
+
     @classmethod
     def get_error_response(
         cls, message: str, status: int, headers: dict | None = None
@@ -86,3 +98,10 @@ class ResponseAPI:
     ) -> Response:
         message = message or "Internal Error"
         return cls.get_error_response(message=message, status=500, headers=headers)
+
+    @classmethod
+    def get_503_response(
+        cls, message: str = "", headers: dict | None = None
+    ) -> Response:
+        message = message or "Service unavailable"
+        return cls.get_error_response(message=message, status=503, headers=headers)
@@ -14,10 +14,16 @@ def list_models_to_list_dto(dto_cls, objs: list | None) -> list:
     return [dto_cls.model_to_dto(obj) for obj in objs] if objs else []
 
 
-def list_dto_to_dict(dtos: list) -> list[dict]:
+def list_dto_to_dict(dtos: list, fields: list[str] | None = None) -> list[dict]:
     """
     Give list of DTO objects and retrieve a list of dict (for serialization)
+    Fournish fields to keep only them (and id)
     """
+    if fields:
+        return [
+            {k: v for k, v in asdict(dto).items() if k in fields or k == "id"}
+            for dto in dtos
+        ]
     return [asdict(dto) for dto in dtos]
 
 
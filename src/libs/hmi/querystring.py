@@ -1,10 +1,19 @@
 from dataclasses import dataclass, fields, is_dataclass
 from datetime import date, datetime, time, timedelta
 from enum import Enum
-from typing import Any, _GenericAlias, types
+from typing import Any, Self, _GenericAlias, types
 from urllib.parse import parse_qs
 
+from src.libs.security.utils import load_signed_payload, sign_payload
+from src.settings import SECRET_KEY
+
 TRUTHY = (1, "1", "y", "Y", "t", "T", "true", "True", "TRUE")
+DEFAULT_PAGE_SIZE = 100
+CURSOR_SECRET = f"{SECRET_KEY}:cursor"
+
+
+class InvalidCursorError(ValueError):
+    pass
 
 
 class Operations(Enum):
@@ -28,6 +37,14 @@ class Operations(Enum):
     ENDSWITH = "ends with"
     NENDSWITH = "not ends with"
     ISNULL = "is null"
+    AFTER = "after"
+    BEFORE = "before"
+    FIELDS = "fields"
+    INCLUDE = "include"
+
+
+CURSOR_OPERATIONS = (Operations.AFTER, Operations.BEFORE)
+SELECTION_OPERATIONS = (Operations.FIELDS, Operations.INCLUDE)
 
 
 @dataclass
@@ -40,15 +57,138 @@ class Filter:
         return f"{self.field} {self.operation.value} {self.value}"
 
 
+def get_sort_keys(filters: list[Filter]) -> list[tuple[str, bool]]:
+    """
+    Fields to sort on with their direction (True for ascending),
+    id is always the last key to break ties.
+    """
+
+    sort_keys = [
+        (f.field, f.operation is Operations.ASC)
+        for f in filters
+        if f.operation in [Operations.ASC, Operations.DESC]
+    ]
+    if "id" not in [field for field, _ in sort_keys]:
+        sort_keys.append(("id", True))
+    return sort_keys
+
+
+def with_default_sort(
+    filters: list[Filter] | None, field: str, asc: bool = True
+) -> list[Filter]:
+    """Filters sorted on field when they have no sort of their own"""
+
+    filters = list(filters or [])
+    if not any(f.operation in [Operations.ASC, Operations.DESC] for f in filters):
+        operation = Operations.ASC if asc else Operations.DESC
+        filters.append(Filter(field=field, operation=operation, value=field))
+    return filters
+
+
+def normalize_filters(filters: list[Filter] | None) -> list[str]:
+    """
+    Same filters give the same result whatever their order (eg: for cache keys),
+    except sort filters.
+    """
+
+    sort_operations = [Operations.ASC, Operations.DESC]
+    filters = filters or []
+
+    return sorted(str(f) for f in filters if f.operation not in sort_operations) + [
+        str(f) for f in filters if f.operation in sort_operations
+    ]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.name
+    elif isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    elif isinstance(value, date):
+        return {"date": value.isoformat()}
+    elif isinstance(value, time):
+        return {"time": value.isoformat()}
+    elif isinstance(value, timedelta):
+        return {"timedelta": value.total_seconds()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        elif "date" in value:
+            return date.fromisoformat(value["date"])
+        elif "time" in value:
+            return time.fromisoformat(value["time"])
+        elif "timedelta" in value:
+            return timedelta(seconds=value["timedelta"])
+    return value
+
+
+@dataclass
+class Cursor:
+    """
+    Opaque keyset pagination cursor.
+    It keeps the sort keys values of a row (id included)
+    to continue the listing right after (or before) this row.
+    Cursors are signed: clients can't forge values to query with.
+    """
+
+    sort_keys: list[tuple[str, bool]]
+    values: list[Any]
+
+    @classmethod
+    def from_object(cls, obj: Any, sort_keys: list[tuple[str, bool]]) -> Self:
+        return cls(
+            sort_keys=sort_keys, values=[getattr(obj, field) for field, _ in sort_keys]
+        )
+
+    def encode(self) -> str:
+        data = {
+            "k": [[field, asc] for field, asc in self.sort_keys],
+            "v": [_encode_value(value) for value in self.values],
+        }
+        return sign_payload(data, CURSOR_SECRET)
+
+    @classmethod
+    def decode(cls, cursor: str) -> Self | None:
+        """Return None if the cursor is not valid or not signed by us"""
+
+        data = load_signed_payload(cursor, CURSOR_SECRET)
+        if not isinstance(data, dict):
+            return None
+
+        try:
+            sort_keys = [(str(field), bool(asc)) for field, asc in data["k"]]
+            values = [_decode_value(value) for value in data["v"]]
+        except (ValueError, TypeError, KeyError):
+            return None
+
+        if not sort_keys or len(sort_keys) != len(values):
+            return None
+
+        return cls(sort_keys=sort_keys, values=values)
+
+    def __str__(self) -> str:
+        return self.encode()
+
+
 class QueryStringFilter:
     _filters: list = []
     _dto_data: dict | None = None
     _dto_fields: list[str] | None = None
 
-    def __init__(self, query_string: str, dto: Any | None = None):
+    def __init__(
+        self,
+        query_string: str,
+        dto: Any | None = None,
+        default_sort: tuple[str, bool] | None = None,
+    ):
         """
         Generate filters from query string args.
         Fournish a DTO instance (using dataclass required) to cast values
+        default_sort: (field, asc) applied without orderby in the query string
         """
 
         self._set_dto(dto)
@@ -59,6 +199,9 @@ class QueryStringFilter:
             list_values = self._separate_values(v)
             [self._create_filter(k, val) for val in list_values if val]
 
+        if default_sort is not None:
+            self._filters = with_default_sort(self._filters, *default_sort)
+
     def _set_dto(self, dto: Any | None = None):
         """Define accepted fields"""
 
@@ -71,6 +214,10 @@ class QueryStringFilter:
             self._dto_data["offset"] = int
             self._dto_data["limit"] = int
             self._dto_data["page"] = int
+            self._dto_data["after"] = Cursor
+            self._dto_data["before"] = Cursor
+            self._dto_data["fields"] = str
+            self._dto_data["include"] = str
             self._dto_fields = list(self._dto_data.keys())
 
     def _cast_filter_value(self, filter: Filter, field_type: Any):
@@ -131,9 +278,20 @@ class QueryStringFilter:
                 else:
                     value = False
 
+            elif op in CURSOR_OPERATIONS:
+                value = Cursor.decode(value)
+                if value is None:
+                    return
+
+            # Only DTO fields can be selected
+            elif op in SELECTION_OPERATIONS:
+                if self._dto_fields and value not in self._dto_fields:
+                    return
+
             filtr = Filter(field=field, operation=op, value=value)
 
-            if self._dto_fields:
+            # Order values are field names, not values to cast
+            if self._dto_fields and op not in [Operations.ASC, Operations.DESC]:
                 field_type = self._dto_data[filtr.field]
                 self._cast_filter_value(filtr, field_type)
 
@@ -144,6 +302,8 @@ class QueryStringFilter:
 
         if "_" in key:
             for op in Operations:
+                if op in CURSOR_OPERATIONS or op in SELECTION_OPERATIONS:
+                    continue
                 op_name = f"_{op.name.lower()}"
                 if key.endswith(op_name):
                     size = len(op_name)
@@ -161,11 +321,45 @@ class QueryStringFilter:
             return key, Operations.LIMIT
         elif key == "page":
             return key, Operations.PAGE
+        elif key == "after":
+            return key, Operations.AFTER
+        elif key == "before":
+            return key, Operations.BEFORE
+        elif key == "fields":
+            return key, Operations.FIELDS
+        elif key == "include":
+            return key, Operations.INCLUDE
 
         return None, None
 
     def get_filters(self) -> list[Filter]:
         return self._filters
 
+    def get_fields(self) -> list[str] | None:
+        """Fields to output, None for all"""
+
+        fields = [f.value for f in self._filters if f.operation == Operations.FIELDS]
+        return fields or None
+
+    def get_next_cursor(self, items: list) -> str | None:
+        """
+        Cursor to fetch the page following these items (sorted by these filters),
+        None if it's the last page.
+        """
+
+        if not items:
+            return None
+
+        limit = DEFAULT_PAGE_SIZE
+        limit_filter = [f for f in self._filters if f.operation == Operations.LIMIT]
+        if len(limit_filter) > 0:
+            limit = int(limit_filter[0].value)
+
+        backward = any(f.operation == Operations.BEFORE for f in self._filters)
+        if len(items) < limit and not backward:
+            return None
+
+        return Cursor.from_object(items[-1], get_sort_keys(self._filters)).encode()
+
     def __str__(self) -> str:
         return "Filters: [" + ", ".join([str(f) for f in self.get_filters()]) + "]"
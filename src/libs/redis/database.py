@@ -1,8 +1,44 @@
-from redis import Redis, from_url
+import json
+import os
+from hashlib import sha256
+from threading import Lock
+from typing import Any, Callable
+
+from redis import Redis
+from redis.commands.core import Script
 
 from src.ports import CachePort
 
-from .settings import CACHE_HOST, CACHE_NAME, CACHE_PORT, CACHE_TEST, CACHE_TYPE
+from .local_cache import LocalCache
+from .pool import MonitoredConnectionPool
+from .settings import (
+    CACHE_ENTRY_MAX_SIZE,
+    CACHE_HEALTH_CHECK_INTERVAL,
+    CACHE_HOST,
+    CACHE_LOCAL_SIZE,
+    CACHE_MAX_CONNECTIONS,
+    CACHE_NAME,
+    CACHE_POOL_TIMEOUT,
+    CACHE_PORT,
+    CACHE_SOCKET_CONNECT_TIMEOUT,
+    CACHE_SOCKET_TIMEOUT,
+    CACHE_TEST,
+    CACHE_TYPE,
+    CACHE_VERSION_TTL,
+)
+
+# Loaded once per Redis server, then run by its SHA
+REMOVE_SCORES_SCRIPT = Script(
+    None,
+    b"""
+for i = 1, #ARGV, 2 do
+    local score = redis.call('ZSCORE', KEYS[1], ARGV[i])
+    if score and tonumber(score) <= tonumber(ARGV[i + 1]) then
+        redis.call('ZREM', KEYS[1], ARGV[i])
+    end
+end
+""",
+)
 
 
 class CacheSession:
@@ -18,15 +54,176 @@ class CacheSession:
 
 
 class CacheService(CachePort):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.local_cache = LocalCache(kwargs.get("local_size", CACHE_LOCAL_SIZE))
+        self.max_connections = kwargs.get("max_connections", CACHE_MAX_CONNECTIONS)
+        self._engine: Redis | None = None
+        self._pid: int | None = None
+        self._lock = Lock()
+
     def get_database_url(self) -> str:
         return f"{CACHE_TYPE}://{CACHE_HOST}:{CACHE_PORT}/{CACHE_NAME}"
 
+    def _create_pool(self) -> MonitoredConnectionPool:
+        return MonitoredConnectionPool.from_url(
+            self.get_database_url(),
+            max_connections=self.max_connections,
+            timeout=CACHE_POOL_TIMEOUT,
+            socket_timeout=CACHE_SOCKET_TIMEOUT,
+            socket_connect_timeout=CACHE_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=CACHE_HEALTH_CHECK_INTERVAL,
+        )
+
     def get_engine(self) -> Redis:
-        return from_url(self.get_database_url())
+        """
+        Return the client shared by the process, built on first call.
+        Connections can't be shared between processes (gunicorn or celery workers):
+        after a fork, the child drops inherited connections without closing them
+        and starts with a fresh pool.
+        """
+
+        pid = os.getpid()
+        if self._engine is None or self._pid != pid:
+            with self._lock:
+                if self._engine is None or self._pid != pid:
+                    self._engine = Redis(connection_pool=self._create_pool())
+                    self._pid = pid
+
+        return self._engine
 
     def get_session(self) -> CacheSession:
         return CacheSession(self.get_engine())
 
+    def get(self, key: str) -> Any | None:
+        """Read the process memory first, then Redis"""
+
+        value = self.local_cache.get(key)
+        if value is not None:
+            return value
+
+        data = self.get_engine().get(key)
+        if data is None:
+            return None
+
+        # Local TTL is stored with the value to fill memory of other processes
+        entry = json.loads(data)
+        if entry["local_ttl"]:
+            self.local_cache.set(key, entry["value"], entry["local_ttl"])
+
+        return entry["value"]
+
+    def set(self, key: str, value: Any, ttl: int, local_ttl: int = 0) -> None:
+        local_ttl = min(local_ttl, ttl)
+        data = json.dumps({"value": value, "local_ttl": local_ttl})
+        self.get_engine().set(key, data, ex=ttl)
+
+        if local_ttl:
+            self.local_cache.set(key, value, local_ttl)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.local_cache.delete(*keys)
+            self.get_engine().delete(*keys)
+
+    def set_max_score(self, key: str, member: str, score: float) -> None:
+        self.get_engine().zadd(key, {member: score}, gt=True)
+
+    def get_score(self, key: str, member: str) -> float | None:
+        return self.get_engine().zscore(key, member)
+
+    def get_scores(self, key: str) -> dict[str, float]:
+        scores = self.get_engine().zrange(key, 0, -1, withscores=True)
+        return {member.decode(): score for member, score in scores}
+
+    def remove_scores(self, key: str, scores: dict[str, float]) -> None:
+        if scores:
+            args = [arg for member_score in scores.items() for arg in member_score]
+            REMOVE_SCORES_SCRIPT(keys=[key], args=args, client=self.get_engine())
+
+    def _get_version_key(self, scope: str) -> str:
+        return f"cache:version:{scope}"
+
+    def get_versions(self, scopes: list[str]) -> list[int]:
+        """Current versions of scopes, 0 if never bumped"""
+
+        if not scopes:
+            return []
+
+        versions = self.get_engine().mget([self._get_version_key(s) for s in scopes])
+        return [int(version or 0) for version in versions]
+
+    def bump_versions(self, *scopes: str) -> None:
+        """
+        Entries keyed with previous versions are never read again
+        and expire with their TTL.
+        """
+
+        if not scopes:
+            return
+
+        pipe = self.get_engine().pipeline(transaction=False)
+        for scope in set(scopes):
+            key = self._get_version_key(scope)
+            pipe.incr(key)
+            pipe.expire(key, CACHE_VERSION_TTL)
+        pipe.execute()
+
+    def get_or_load(
+        self,
+        namespace: str,
+        scopes: list[str],
+        params: Any,
+        loader: Callable[[], Any],
+        ttl: int,
+        local_ttl: int = 0,
+        dump: Callable[[Any], Any] | None = None,
+        load: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        """
+        Versions are read before loading: if a scope is bumped meanwhile,
+        the loaded value is cached under the old versions and never read.
+        Values are stored as JSON, too large ones are not cached.
+        Versions are always read from Redis, process memory only saves the value.
+        """
+
+        scopes = sorted(set(scopes))
+        versions = self.get_versions(scopes)
+        digest = sha256(
+            json.dumps([scopes, versions, params], default=str).encode()
+        ).hexdigest()
+        key = f"cache:{namespace}:{digest}"
+
+        data = self.local_cache.get(key)
+        if data is None:
+            data = self.get_engine().get(key)
+            if data is not None and local_ttl:
+                self.local_cache.set(key, data, min(local_ttl, ttl))
+
+        if data is not None:
+            value = json.loads(data)
+            return load(value) if load else value
+
+        value = loader()
+        data = json.dumps(dump(value) if dump else value).encode()
+        if len(data) <= CACHE_ENTRY_MAX_SIZE:
+            self.get_engine().set(key, data, ex=ttl)
+            if local_ttl:
+                self.local_cache.set(key, data, min(local_ttl, ttl))
+
+        return value
+
+    def get_pool_stats(self) -> dict:
+        """Return live statistics of the connection pool"""
+
+        return self.get_engine().connection_pool.get_stats()
+
+    def dispose(self) -> None:
+        """Close all connections of the pool"""
+
+        if self._engine is not None:
+            self._engine.connection_pool.disconnect()
+
 
 class TestCacheService(CacheService):
     def get_database_url(self) -> str:
@@ -3,12 +3,17 @@ from functools import wraps
 from logging import Logger
 from typing import Callable
 
-from flask import current_app, g, request
+from flask import current_app, g, make_response, request
 from src.libs.flask.utils import ResponseAPI, get_ip
-from src.libs.redis.ratelimit import LimitExceededError, RateLimit
+from src.libs.redis.ratelimit import LimitExceededError, RateLimit, RateLimitAlgorithm
 
 
-def rate_limited(logger: Logger, hit: int = 1, period: timedelta = timedelta(seconds=1)):
+def rate_limited(
+    logger: Logger,
+    hit: int = 1,
+    period: timedelta = timedelta(seconds=1),
+    algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW,
+):
     def decorator(func: Callable):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -16,18 +21,25 @@ def rate_limited(logger: Logger, hit: int = 1, period: timedelta = timedelta(sec
             identifier = token or get_ip(request)
             path = f"{request.method}:{request.path}"
 
+            rate_limit = RateLimit(
+                current_app.dependencies.cache.get_engine(),
+                identifier,
+                path,
+                hit,
+                period,
+                algorithm,
+            )
             try:
-                RateLimit(
-                    current_app.dependencies.cache.get_engine(),
-                    identifier,
-                    path,
-                    hit,
-                    period,
-                )()
-                return func(*args, **kwargs)
+                rate_limit()
             except LimitExceededError as e:
                 logger.warning(f"429 Error: {e}")
-                return ResponseAPI.get_429_response()
+                return ResponseAPI.get_429_response(
+                    headers=rate_limit.result.get_headers()
+                )
+
+            response = make_response(func(*args, **kwargs))
+            response.headers.update(rate_limit.result.get_headers())
+            return response
 
         return wrapper
 
@@ -0,0 +1,49 @@
+from threading import Lock
+from time import perf_counter
+
+from redis import BlockingConnectionPool
+
+
+class MonitoredConnectionPool(BlockingConnectionPool):
+    """
+    A BlockingConnectionPool keeping track of the time spent to get a connection.
+    When all connections are in use, callers wait for one to be released
+    (up to timeout) instead of failing.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def get_connection(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return super().get_connection(*args, **kwargs)
+        finally:
+            self._add_wait_time(perf_counter() - start)
+
+    def _add_wait_time(self, wait_time: float) -> None:
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    def get_stats(self) -> dict:
+        """Return live statistics about the pool usage"""
+
+        available = len(self._get_free_connections())
+        in_use = len(self._get_in_use_connections())
+
+        with self._stats_lock:
+            return {
+                "max_connections": self.max_connections,
+                "created": available + in_use,
+                "available": available,
+                "in_use": in_use,
+                "checkouts": self.checkouts,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_max": self.wait_time_max,
+            }
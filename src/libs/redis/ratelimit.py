@@ -1,17 +1,112 @@
+from dataclasses import dataclass
 from datetime import timedelta
+from enum import Enum
+from math import ceil
+from uuid import uuid4
 
 from redis import Redis
+from redis.commands.core import Script
+
+# Scripts run atomically in Redis: a check costs a single round trip.
+# Time is read from Redis, so all app servers share the same clock.
+# They return {allowed (0 or 1), remaining hits, retry after (ms)}.
+
+FIXED_WINDOW_SCRIPT = """
+local limit, period = tonumber(ARGV[1]), tonumber(ARGV[2])
+local count = redis.call('INCR', KEYS[1])
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+    redis.call('PEXPIRE', KEYS[1], period)
+    ttl = period
+end
+if count > limit then
+    return {0, 0, ttl}
+end
+return {1, limit - count, 0}
+"""
+
+SLIDING_LOG_SCRIPT = """
+local limit, period = tonumber(ARGV[1]), tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - period)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, 0, tonumber(oldest[2]) + period - now}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], period)
+return {1, limit - count - 1, 0}
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local limit, period = tonumber(ARGV[1]), tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or limit
+local updated_at = tonumber(bucket[2]) or now
+local rate = limit / period
+tokens = math.min(limit, tokens + (now - updated_at) * rate)
+local allowed, retry_after = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', now)
+redis.call('PEXPIRE', KEYS[1], period)
+return {allowed, math.floor(tokens), retry_after}
+"""
 
 
 class LimitExceededError(Exception):
     pass
 
 
+class RateLimitAlgorithm(Enum):
+    # Counter reset each period, bursts are possible around a reset
+    FIXED_WINDOW = "fixed_window"
+    # Timestamp of each hit kept for a period, exact but stores every hit
+    SLIDING_LOG = "sliding_log"
+    # Hits refilled continuously, allow a burst up to the limit
+    TOKEN_BUCKET = "token_bucket"
+
+
+# Loaded once per Redis server, then run by their SHA
+SCRIPTS = {
+    RateLimitAlgorithm.FIXED_WINDOW: Script(None, FIXED_WINDOW_SCRIPT.encode()),
+    RateLimitAlgorithm.SLIDING_LOG: Script(None, SLIDING_LOG_SCRIPT.encode()),
+    RateLimitAlgorithm.TOKEN_BUCKET: Script(None, TOKEN_BUCKET_SCRIPT.encode()),
+}
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds
+
+    def get_headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, ceil(self.retry_after)))
+
+        return headers
+
+
 class RateLimit:
     user: str = ""
     resource_name: str = ""
     period: timedelta = timedelta(seconds=1)
     limit: int = 1
+    algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW
 
     def __init__(
         self,
@@ -20,37 +115,43 @@ class RateLimit:
         resource_name: str,
         limit: int = 1,
         period: timedelta | None = None,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW,
     ) -> None:
         self.redis = redis
         self.user = user
         self.resource_name = resource_name
         self.period = period or timedelta(seconds=1)
         self.limit = limit or 1
+        self.algorithm = algorithm
+        self.result: RateLimitResult | None = None
 
     def __call__(self):
-        self.value = self._check_key()
-        self._increment()
+        self.result = self.check()
+        if not self.result.allowed:
+            raise LimitExceededError(
+                f"Too many request from {self.user} to access {self.resource_name}"
+            )
 
     @property
     def key(self) -> str:
         return (
             f"{self.user}_{self.resource_name}_"
-            f"{self.period.total_seconds()}_{self.limit}"
+            f"{self.period.total_seconds()}_{self.limit}_{self.algorithm.value}"
         )
 
-    def _increment(self):
-        self.value = self.redis.get(self.key)
-        self._check_limit()
-        self.redis.incr(self.key)
+    def check(self) -> RateLimitResult:
+        """Count a hit and return the limit state, in one atomic call"""
 
-    def _check_key(self):
-        self.value = self.redis.get(self.key)
-        if self.value is None:
-            self.redis.set(self.key, 0, ex=self.period)
-            self.value = 0
+        period_ms = max(1, int(self.period.total_seconds() * 1000))
+        allowed, remaining, retry_after_ms = SCRIPTS[self.algorithm](
+            keys=[self.key],
+            args=[self.limit, period_ms, uuid4().hex],
+            client=self.redis,
+        )
 
-    def _check_limit(self):
-        if int(self.value) >= self.limit:
-            raise LimitExceededError(
-                f"Too many request from {self.user} to access {self.resource_name}"
-            )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=self.limit,
+            remaining=max(0, int(remaining)),
+            retry_after=int(retry_after_ms) / 1000,
+        )
@@ -5,3 +5,18 @@ CACHE_HOST = os.getenv("CACHE_HOST")
 CACHE_PORT = os.getenv("CACHE_PORT")
 CACHE_NAME = os.getenv("CACHE_NAME")
 CACHE_TEST = os.getenv("CACHE_TEST")
+
+# Max number of entries kept in each process memory
+CACHE_LOCAL_SIZE = int(os.getenv("CACHE_LOCAL_SIZE", 1000))
+
+# Connection pool (one per process)
+CACHE_MAX_CONNECTIONS = int(os.getenv("CACHE_MAX_CONNECTIONS", 50))
+CACHE_POOL_TIMEOUT = float(os.getenv("CACHE_POOL_TIMEOUT", 5))
+CACHE_SOCKET_TIMEOUT = float(os.getenv("CACHE_SOCKET_TIMEOUT", 5))
+CACHE_SOCKET_CONNECT_TIMEOUT = float(os.getenv("CACHE_SOCKET_CONNECT_TIMEOUT", 2))
+CACHE_HEALTH_CHECK_INTERVAL = int(os.getenv("CACHE_HEALTH_CHECK_INTERVAL", 30))
+
+# Versioned entries (cache-aside reads): max size of a value (bytes)
+# and lifetime of a version counter (seconds), longer than any entry TTL
+CACHE_ENTRY_MAX_SIZE = int(os.getenv("CACHE_ENTRY_MAX_SIZE", 256 * 1024))
+CACHE_VERSION_TTL = int(os.getenv("CACHE_VERSION_TTL", 7 * 24 * 3600))
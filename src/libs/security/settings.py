@@ -0,0 +1,12 @@
+import os
+
+# Argon2id parameters, existing hashes are upgraded at next login
+PASSWORD_HASH_TIME_COST = int(os.getenv("PASSWORD_HASH_TIME_COST", 3))
+PASSWORD_HASH_MEMORY_COST = int(os.getenv("PASSWORD_HASH_MEMORY_COST", 64 * 1024))  # KiB
+PASSWORD_HASH_PARALLELISM = int(os.getenv("PASSWORD_HASH_PARALLELISM", 4))
+
+# Hashes computed at once by a process, size it from the threads of a worker
+# (memory used is about workers x memory cost, per process)
+PASSWORD_HASH_MAX_WORKERS = int(os.getenv("PASSWORD_HASH_MAX_WORKERS", 2))
+# Max time waiting for a free worker (seconds), then hashing fails as overloaded
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", 5))
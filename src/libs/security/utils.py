@@ -1,30 +1,128 @@
-from base64 import b64encode
-from hashlib import sha512
+import hmac
+import json
+import os
+from base64 import b64encode, urlsafe_b64decode, urlsafe_b64encode
+from hashlib import sha256, sha512
 from secrets import choice, token_hex
 from string import ascii_lowercase, ascii_uppercase, digits
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable
 from uuid import uuid4
 
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
+from .settings import (
+    PASSWORD_HASH_MAX_WORKERS,
+    PASSWORD_HASH_MEMORY_COST,
+    PASSWORD_HASH_PARALLELISM,
+    PASSWORD_HASH_TIME_COST,
+    PASSWORD_HASH_TIMEOUT,
+)
+
+
+class HashingOverloadError(Exception):
+    pass
+
+
+class HashingExecutor:
+    """
+    Run memory hard hashes in the caller thread (argon2 releases the GIL),
+    at most max_workers at once per process: a burst of logins can't exhaust
+    memory. Callers wait for a free slot up to timeout, then fail as overloaded.
+    """
+
+    def __init__(self, max_workers: int, timeout: float) -> None:
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._slots: BoundedSemaphore | None = None
+        self._pid: int | None = None
+        self._lock = Lock()
+
+    def _get_slots(self) -> BoundedSemaphore:
+        """Each forked process has its own slots, ones taken at fork are never freed"""
+
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._slots = BoundedSemaphore(self.max_workers)
+                    self._pid = pid
+
+        return self._slots
+
+    def run(self, func: Callable, *args) -> Any:
+        slots = self._get_slots()
+
+        if not slots.acquire(timeout=self.timeout):
+            raise HashingOverloadError("Too many passwords are being hashed")
+
+        try:
+            return func(*args)
+        finally:
+            slots.release()
+
+
+password_hasher = PasswordHasher(
+    time_cost=PASSWORD_HASH_TIME_COST,
+    memory_cost=PASSWORD_HASH_MEMORY_COST,
+    parallelism=PASSWORD_HASH_PARALLELISM,
+)
+hashing_executor = HashingExecutor(PASSWORD_HASH_MAX_WORKERS, PASSWORD_HASH_TIMEOUT)
+
 
 def hash_from_password(password: str) -> str:
-    ph = PasswordHasher()
-    return ph.hash(password)
+    return hashing_executor.run(password_hasher.hash, password)
 
 
 def check_password(hash: str, password: str) -> bool:
-    ph = PasswordHasher()
     try:
-        return ph.verify(hash, password)
+        return hashing_executor.run(password_hasher.verify, hash, password)
     except VerifyMismatchError:
         return False
 
 
+def password_needs_rehash(hash: str) -> bool:
+    """True if hash was computed with other parameters than current ones"""
+
+    return password_hasher.check_needs_rehash(hash)
+
+
 def hash_str(string: str) -> str:
     return sha512(string.encode()).hexdigest()
 
 
+def _b64encode(data: bytes) -> str:
+    return urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _sign(body: str, secret: str) -> str:
+    return _b64encode(hmac.new(secret.encode(), body.encode(), sha256).digest())
+
+
+def sign_payload(payload: dict, secret: str) -> str:
+    """
+    Encode a payload with its HMAC signature: it can be read by anyone,
+    but can't be changed without the secret.
+    """
+
+    body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    return f"{body}.{_sign(body, secret)}"
+
+
+def load_signed_payload(signed: str, secret: str) -> dict | None:
+    """Return the payload only if its signature is valid"""
+
+    body, _, signature = signed.rpartition(".")
+    if not body or not hmac.compare_digest(signature, _sign(body, secret)):
+        return None
+
+    try:
+        return json.loads(urlsafe_b64decode(body + "=" * (-len(body) % 4)))
+    except ValueError:
+        return None
+
+
 def get_id() -> str:
     """
     Generate an unique id with a very low level of collision risk
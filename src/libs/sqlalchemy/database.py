@@ -1,19 +1,33 @@
-from typing import Literal
+import os
+from contextvars import ContextVar
+from itertools import count
+from threading import Lock
+from typing import Callable, Literal
 from unittest.mock import MagicMock
 
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.orm import Session, registry, scoped_session, sessionmaker
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import ORMExecuteState, Session, registry, sessionmaker
 
 from src.ports import PersistencePort, SessionPort
 
 from .base import mapper_registry
+from .instrumentation import QueryStats, instrument_engine
+from .pool import MonitoredQueuePool
 from .settings import (
     BD_DRIVER,
     DB_HOST,
+    DB_MAX_OVERFLOW,
     DB_NAME,
     DB_PASS,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
     DB_PORT,
+    DB_REPLICA_STRATEGY,
+    DB_REPLICAS,
     DB_TEST,
+    DB_TEST_REPLICAS,
     DB_TYPE,
     DB_USER,
     DEBUG_SQL,
@@ -35,6 +49,69 @@ class SQLSession(SessionPort):
         self.session.close()
 
 
+class SharedSQLSession(SQLSession):
+    """Session of a unit of work, committed and closed only when it ends"""
+
+    def __exit__(self, type, value, traceback) -> None:
+        if type is None:
+            self.session.flush()
+
+
+class ReadOnlySQLSession(SQLSession):
+    """Session on a replica, there is nothing to commit"""
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.close()
+
+
+class UnitOfWork:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        readonly_session_factory: Callable[[], Session] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._readonly_session_factory = readonly_session_factory
+        self._session: Session | None = None
+        self._readonly_session: Session | None = None
+        self.depth = 1
+        self.rollback_only = False
+
+    @property
+    def session(self) -> Session:
+        """Open the session on first use, requests without queries cost nothing"""
+
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    @property
+    def readonly_session(self) -> Session:
+        if self._readonly_session_factory is None:
+            return self.session
+
+        if self._readonly_session is None:
+            self._readonly_session = self._readonly_session_factory()
+        return self._readonly_session
+
+    def end(self, commit: bool) -> None:
+        if self._readonly_session is not None:
+            self._readonly_session.close()
+            self._readonly_session = None
+
+        if self._session is None:
+            return
+
+        try:
+            if commit and not self.rollback_only:
+                self._session.commit()
+            else:
+                self._session.rollback()
+        finally:
+            self._session.close()
+            self._session = None
+
+
 class PersistenceService(PersistencePort):
     def __init__(self, echo: None | bool | Literal["debug"] = False, **kwargs) -> None:
         debug = False
@@ -44,7 +121,22 @@ class PersistenceService(PersistencePort):
             debug = DEBUG_SQL
 
         self.echo = echo or debug
+        self.replica_strategy = kwargs.get("replica_strategy", DB_REPLICA_STRATEGY)
         self._repository_registry = {}
+        self._engine: Engine | None = None
+        self._session_factory: sessionmaker | None = None
+        self._replica_engines: list[Engine] = []
+        self._replica_session_factories: list[sessionmaker] = []
+        self._replica_counter = count()
+        self._pid: int | None = None
+        self._lock = Lock()
+        self._unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+            "unit_of_work", default=None
+        )
+        self._has_written: ContextVar[bool] = ContextVar("has_written", default=False)
+        self._query_stats: ContextVar[QueryStats | None] = ContextVar(
+            "query_stats", default=None
+        )
         self.mapping()
 
     def set_context(self, **ctx) -> None:
@@ -57,20 +149,208 @@ class PersistenceService(PersistencePort):
             f"{DB_TYPE}+{BD_DRIVER}://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
         )
 
+    def get_replica_urls(self) -> list[str]:
+        return [url.strip() for url in DB_REPLICAS.split(",") if url.strip()]
+
     def mapping(self) -> None:
         """Import all sqlalchemy tables here to set registry mapping"""
         from .declare_tables import INIT
 
+    def _create_engine(self, url: str) -> Engine:
+        engine = create_engine(
+            url,
+            echo=self.echo,
+            poolclass=MonitoredQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+        instrument_engine(engine, self._query_stats.get)
+        return engine
+
+    def _check_fork(self) -> None:
+        """
+        Connections can't be shared between processes (gunicorn or celery workers).
+        After a fork, the child drops inherited connections without closing them
+        and starts with a fresh pool.
+        """
+
+        pid = os.getpid()
+        if self._pid != pid:
+            for engine in [self._engine, *self._replica_engines]:
+                engine.dispose(close=False)
+            self._pid = pid
+
+    def _set_written(self, *args, **kwargs) -> None:
+        self._has_written.set(True)
+
+    def _on_execute(self, orm_execute_state: ORMExecuteState) -> None:
+        if not orm_execute_state.is_select:
+            self._set_written()
+
+    def _run_after_commit(self, session: Session) -> None:
+        for callback, args in session.info.pop("after_commit", []):
+            callback(*args)
+
+    def _clear_after_commit(self, session: Session, transaction) -> None:
+        if transaction.parent is None:
+            session.info.pop("after_commit", None)
+
     def get_engine(self) -> Engine:
-        return create_engine(self.get_database_url(), pool_size=20, echo=self.echo)
+        """Return the engine shared by the process, built on first call"""
+
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._replica_engines = [
+                        self._create_engine(url) for url in self.get_replica_urls()
+                    ]
+                    self._replica_session_factories = [
+                        sessionmaker(engine) for engine in self._replica_engines
+                    ]
+
+                    engine = self._create_engine(self.get_database_url())
+                    self._session_factory = sessionmaker(engine)
+                    # Track writes to keep reading from primary afterwards
+                    event.listen(self._session_factory, "after_flush", self._set_written)
+                    event.listen(
+                        self._session_factory, "do_orm_execute", self._on_execute
+                    )
+                    event.listen(
+                        self._session_factory, "after_commit", self._run_after_commit
+                    )
+                    event.listen(
+                        self._session_factory,
+                        "after_transaction_end",
+                        self._clear_after_commit,
+                    )
+
+                    self._pid = os.getpid()
+                    self._engine = engine
 
-    def get_session(self, expire_on_commit=False) -> SQLSession:
-        return SQLSession(
-            scoped_session(
-                sessionmaker(self.get_engine(), expire_on_commit=expire_on_commit)
-            )()
+        self._check_fork()
+        return self._engine
+
+    def _get_replica_session_factory(self) -> sessionmaker | None:
+        """
+        Select a replica, None if there is none or if the current context
+        has already written to primary (read-your-writes).
+        """
+
+        if not self._replica_session_factories or self._has_written.get():
+            return None
+
+        if self.replica_strategy == "least_connections":
+            return min(
+                self._replica_session_factories,
+                key=lambda factory: factory.kw["bind"].pool.checkedout(),
+            )
+
+        index = next(self._replica_counter) % len(self._replica_session_factories)
+        return self._replica_session_factories[index]
+
+    def get_session(self, expire_on_commit=False, readonly=False) -> SQLSession:
+        """
+        readonly sessions are served by a replica when available,
+        primary is used once something has been written in the current context.
+        """
+
+        self.get_engine()
+
+        unit_of_work = self._unit_of_work.get()
+        if unit_of_work is not None:
+            if readonly and not self._has_written.get():
+                return SharedSQLSession(unit_of_work.readonly_session)
+            return SharedSQLSession(unit_of_work.session)
+
+        if readonly:
+            replica_session_factory = self._get_replica_session_factory()
+            if replica_session_factory is not None:
+                return ReadOnlySQLSession(replica_session_factory())
+
+        return SQLSession(self._session_factory(expire_on_commit=expire_on_commit))
+
+    def begin_unit_of_work(self) -> None:
+        """
+        Nested calls (eg: an eager celery task in a request) join
+        the current unit of work instead of opening a new one.
+        """
+
+        unit_of_work = self._unit_of_work.get()
+        if unit_of_work is not None:
+            unit_of_work.depth += 1
+            return
+
+        self.get_engine()
+        self.reset_written()
+        self._unit_of_work.set(
+            UnitOfWork(
+                lambda: self._session_factory(expire_on_commit=False),
+                self._get_replica_session_factory(),
+            )
         )
 
+    def end_unit_of_work(self, commit: bool = False) -> None:
+        unit_of_work = self._unit_of_work.get()
+        if unit_of_work is None:
+            return
+
+        unit_of_work.depth -= 1
+        if unit_of_work.depth > 0:
+            unit_of_work.rollback_only |= not commit
+            return
+
+        try:
+            unit_of_work.end(commit=commit)
+        finally:
+            self._unit_of_work.set(None)
+            self.reset_written()
+
+    def reset_written(self) -> None:
+        self._has_written.set(False)
+
+    def after_commit(self, session: Session, callback: Callable, *args) -> None:
+        """
+        Callbacks run in order, after the commit of the current transaction
+        (at the end of the unit of work if any), they are dropped on rollback.
+        """
+
+        session.info.setdefault("after_commit", []).append((callback, args))
+
+    def can_cache(self, session: Session) -> bool:
+        return not session.info.get("after_commit")
+
+    def begin_query_stats(self) -> None:
+        """Nested calls (eg: a test around a request) count queries for both"""
+
+        self._query_stats.set(QueryStats(parent=self._query_stats.get()))
+
+    def end_query_stats(self) -> QueryStats | None:
+        query_stats = self._query_stats.get()
+        if query_stats is not None:
+            self._query_stats.set(query_stats.parent)
+        return query_stats
+
+    def get_pool_stats(self) -> dict:
+        """Return live statistics of the connection pool"""
+
+        return self.get_engine().pool.get_stats()
+
+    def get_replica_pool_stats(self) -> list[dict]:
+        """Return live statistics of replicas connection pools"""
+
+        self.get_engine()
+        return [engine.pool.get_stats() for engine in self._replica_engines]
+
+    def dispose(self) -> None:
+        """Close all connections of the pools"""
+
+        if self._engine is not None:
+            for engine in [self._engine, *self._replica_engines]:
+                engine.dispose()
+
     def get_registry(self) -> registry:
         return mapper_registry
 
@@ -87,6 +367,9 @@ class TestPersistenceService(PersistenceService):
             f"{DB_TYPE}+{BD_DRIVER}://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_TEST}"
         )
 
+    def get_replica_urls(self) -> list[str]:
+        return [url.strip() for url in DB_TEST_REPLICAS.split(",") if url.strip()]
+
 
 class DummyPersistenceService(PersistenceService):
     def get_database_url(sef) -> None:
@@ -95,8 +378,18 @@ class DummyPersistenceService(PersistenceService):
     def get_engine(self) -> None:
         pass
 
-    def get_session(self) -> MagicMock:
+    def get_session(self, *args, **kwargs) -> MagicMock:
         return MagicMock()
 
+    def get_pool_stats(self) -> dict:
+        return {}
+
+    def after_commit(self, session, callback: Callable, *args) -> None:
+        callback(*args)
+
+    def can_cache(self, session) -> bool:
+        # Results of mocked sessions are never cached
+        return False
+
     def get_repository(self, *arg, **kwargs) -> MagicMock:
         return MagicMock()
@@ -1,22 +1,51 @@
-from sqlalchemy.orm import Session
+from functools import cached_property
+from io import StringIO
+
+from sqlalchemy import Table, insert, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from src.libs.sqlalchemy.queryset import Queryset
+from src.libs.sqlalchemy.settings import DB_BULK_CHUNK_SIZE, DB_BULK_COPY_THRESHOLD
 from src.ports import AbstractDBPort
 
 
+def _copy_value(value) -> str:
+    """Format a value for COPY ... FROM STDIN (text format)"""
+
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
 class DefaultDB(AbstractDBPort):
     qs = Queryset(None)
 
+    @cached_property
+    def _load_qs(self) -> Queryset:
+        """Loading by id is on every hot path, its queryset is built once"""
+
+        return self.qs.select().id("")
+
     def load(
         self, session: Session, id: str, with_unique: bool = False
     ) -> object | None:
         """Load an object with id from database"""
 
-        self.qs.select().id(id)
+        qs = self._load_qs
+        params = qs.bind(id=id)
         if with_unique:
-            result = session.scalars(self.qs.statement).unique().one_or_none()
+            result = session.scalars(qs.statement, params).unique().one_or_none()
         else:
-            result = session.scalars(self.qs.statement).one_or_none()
+            result = session.scalars(qs.statement, params).one_or_none()
         return result
 
     def save(self, session: Session, obj: object) -> None:
@@ -48,6 +77,72 @@ class DefaultDB(AbstractDBPort):
 
         return objs
 
+    def bulk_insert(
+        self,
+        session: Session,
+        objs: list[object],
+        chunk_size: int = DB_BULK_CHUNK_SIZE,
+        copy_threshold: int = DB_BULK_COPY_THRESHOLD,
+    ) -> None:
+        """
+        Insert many objects without the ORM unit of work (no identity map,
+        no relationships): objects are not attached to the session.
+        Large batches use Postgres COPY when copy_threshold is reached (0 to disable).
+        """
+
+        if not objs:
+            return
+
+        mapper = inspect(type(objs[0]))
+        table: Table = mapper.local_table
+        columns = {attr.key: attr.columns[0].key for attr in mapper.column_attrs}
+        rows = [
+            {column: getattr(obj, key) for key, column in columns.items()}
+            for obj in objs
+        ]
+
+        connection = session.connection()
+        if (
+            copy_threshold
+            and len(rows) >= copy_threshold
+            and connection.dialect.driver == "psycopg2"
+        ):
+            self._copy_rows(connection, table, rows, chunk_size)
+            return
+
+        for start in range(0, len(rows), chunk_size):
+            end = start + chunk_size
+            session.execute(insert(table), rows[start:end])
+
+    def _copy_rows(self, connection, table: Table, rows: list[dict], chunk_size: int):
+        processors = {
+            column.key: column.type.bind_processor(connection.dialect)
+            for column in table.columns
+            if column.key in rows[0]
+        }
+        columns = ", ".join(
+            connection.dialect.identifier_preparer.quote(k) for k in processors
+        )
+        table_name = connection.dialect.identifier_preparer.format_table(table)
+        sql = f"COPY {table_name} ({columns}) FROM STDIN"
+
+        cursor = connection.connection.cursor()
+        try:
+            for start in range(0, len(rows), chunk_size):
+                end = start + chunk_size
+                buffer = StringIO()
+                for row in rows[start:end]:
+                    values = [
+                        processor(row[key]) if processor else row[key]
+                        for key, processor in processors.items()
+                    ]
+                    buffer.write("\t".join(_copy_value(v) for v in values) + "\n")
+
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+        finally:
+            cursor.close()
+
     def delete(self, session: Session, obj: object) -> None:
         """Delete an object from database"""
 
@@ -56,11 +151,20 @@ class DefaultDB(AbstractDBPort):
     def delete_by_id(self, session: Session, id: str) -> None:
         """Delete an object from database from id"""
 
-        self.qs.delete().id(id)
-        session.execute(self.qs.statement)
+        qs = self.qs.delete().id(id)
+        session.execute(qs.statement, qs.params)
+
+    def restore(self, obj: object) -> object:
+        """
+        Mark an object rebuilt from its data (eg: from a cache) as already persisted,
+        saving it in a session will update it instead of inserting it.
+        """
+
+        make_transient_to_detached(obj)
+        return obj
 
     def exists(self, session: Session, id: str) -> bool:
         """Check if an object exists in database"""
 
-        self.qs.select().id(id)
-        return session.query(self.qs.statement.exists()).scalar()
+        qs = self.qs.select().id(id).exists()
+        return session.scalar(qs.statement, qs.params)
@@ -0,0 +1,96 @@
+from collections import Counter
+from logging import Logger
+from time import perf_counter
+from typing import Self
+
+from sqlalchemy import Engine, event
+
+
+class QueryStats:
+    """
+    SQL statements sent during a request or a task.
+    Statements are parameterized, so the same statement text is the same shape:
+    a shape repeated many times is likely an N+1 query.
+    """
+
+    def __init__(self, parent: Self | None = None) -> None:
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.shapes: Counter[str] = Counter()
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement] += 1
+
+        if self.parent is not None:
+            self.parent.add(statement, duration)
+
+    def get_duplicates(self, min_repeat: int = 2) -> dict[str, int]:
+        """Statement shapes sent at least min_repeat times"""
+
+        return {
+            statement: count
+            for statement, count in self.shapes.most_common()
+            if count >= min_repeat
+        }
+
+    def get_max_repeat(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+    def get_server_timing(self) -> str:
+        """Value of a Server-Timing header (duration in milliseconds)"""
+
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+    def get_log_fields(self) -> dict:
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.duration * 1000, 1),
+            "db_duplicated_shapes": len(self.get_duplicates()),
+            "db_max_repeat": self.get_max_repeat(),
+        }
+
+
+def log_query_stats(
+    logger: Logger, label: str, query_stats: QueryStats, repeat_warning: int, **fields
+) -> None:
+    """Log statistics as structured fields, warn about likely N+1 queries"""
+
+    log_fields = {**fields, **query_stats.get_log_fields()}
+    logger.info(
+        f"{label}: {query_stats.count} queries in {log_fields['db_time_ms']} ms",
+        extra=log_fields,
+    )
+
+    max_repeat = query_stats.get_max_repeat()
+    if max_repeat >= repeat_warning:
+        logger.warning(
+            f"{label}: a statement was sent {max_repeat} times, N+1 queries ?",
+            extra=log_fields,
+        )
+
+
+def instrument_engine(engine: Engine, get_stats) -> None:
+    """
+    Time each statement sent by the engine
+    and add it to the QueryStats given by get_stats (if any).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        duration = perf_counter() - conn.info["query_start"].pop()
+        stats = get_stats()
+        if stats is not None:
+            stats.add(statement, duration)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
@@ -1,192 +1,623 @@
-from typing import Self
+from collections import OrderedDict
+from copy import copy
+from datetime import date, time, timedelta
+from enum import Enum
+from threading import Lock
+from typing import Any, Callable, Hashable, Self
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    delete,
+    false,
+    inspect,
+    not_,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import (
+    QueryableAttribute,
+    aliased,
+    lazyload,
+    load_only,
+    noload,
+    raiseload,
+    selectinload,
+)
+from sqlalchemy.sql import Executable
+
+from src.libs.hmi.querystring import (
+    CURSOR_OPERATIONS,
+    DEFAULT_PAGE_SIZE,
+    Cursor,
+    Filter,
+    InvalidCursorError,
+    Operations,
+    get_sort_keys,
+)
+
+from .settings import STATEMENT_CACHE_SIZE
+
+
+class StatementCache:
+    """Thread safe LRU cache of statements, keyed by queryset shapes"""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._statements: OrderedDict[Hashable, Executable] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Executable | None:
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._statements.move_to_end(key)
+
+            return statement
+
+    def set(self, key: Hashable, statement: Executable) -> None:
+        with self._lock:
+            self._statements[key] = statement
+            self._statements.move_to_end(key)
+            if len(self._statements) > self.size:
+                self._statements.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> dict:
+        return {
+            "size": len(self._statements),
+            "max_size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+statement_cache = StatementCache(STATEMENT_CACHE_SIZE)
 
-from sqlalchemy import delete, not_, select, update
 
-from src.libs.hmi.querystring import Filter, Operations
+def _shape_of(element) -> Hashable | None:
+    """Mapped classes and attributes are singletons, others can't be shaped"""
 
-DEFAULT_PAGE_SIZE = 100
+    if isinstance(element, (type, QueryableAttribute)):
+        return element
+    return None
 
 
 class Queryset:
     """
     Queryset is used to avoid duplication in SQL queries.
     It's particulary usefull to chain complex queries.
+
+    A queryset is immutable: each chained call returns a new queryset,
+    so a single instance can be shared between threads.
+    Values are never embedded in statements but sent as bound parameters,
+    so statements with the same shape are built only once.
     """
 
     def __init__(self, qs_class):
         self.qs_class = qs_class
-        self._query = None
+        self._steps: tuple[tuple[Hashable, Callable, dict[str, str]], ...] = ()
+        self._last_steps: tuple[tuple[Hashable, Callable, dict[str, str]], ...] = ()
+        self._params: dict[str, Any] = {}
+
+    def _chain(self, shape: Hashable | None, build: Callable, **values) -> Self:
+        """
+        Return a new queryset with one more building step.
+
+        shape: describe the step without its values,
+            None if it can't be described (the statement will not be cached)
+        build: callable(query, **bindparams) returning the new query,
+            it must only depend on the shape and the given bindparams
+        values: sent to the database as bound parameters at execution
+        """
+
+        names = {}
+        params = dict(self._params)
+        for key, value in values.items():
+            # Prefixed, never clashing with anonymous binds of sqlalchemy (eg: id_1)
+            name = f"qs_{key}_{len(params) + 1}"
+            names[key] = name
+            params[name] = list(value) if isinstance(value, (set, tuple)) else value
+
+        if shape is not None:
+            expanding = tuple(isinstance(params[n], list) for n in names.values())
+            shape = (shape, expanding)
+
+        qs = copy(self)
+        qs._steps = self._steps + ((shape, build, names),)
+        qs._params = params
+        return qs
+
+    def _chain_last(self, shape: Hashable | None, build: Callable, **values) -> Self:
+        """Like _chain, but the step is built after all others, even later ones"""
+
+        qs = self._chain(shape, build, **values)
+        qs._last_steps = self._last_steps + qs._steps[-1:]
+        qs._steps = self._steps
+        return qs
+
+    def bind(self, **values) -> dict[str, Any]:
+        """
+        Bound parameters of this queryset with new values, by step keys.
+        Hot queries build their queryset once and only bind values at each call,
+        values must keep the same kind (None, list or scalar) as the built ones.
+        """
+
+        params = dict(self._params)
+        bound = set()
+        for _, _, names in self._steps + self._last_steps:
+            for key, name in names.items():
+                if key in values:
+                    value = values[key]
+                    params[name] = (
+                        list(value) if isinstance(value, (set, tuple)) else value
+                    )
+                    bound.add(key)
+
+        if unknown := set(values) - bound:
+            raise ValueError(f"Unknown parameters {sorted(unknown)} in queryset")
+
+        return params
+
+    def _reset(self) -> Self:
+        qs = copy(self)
+        qs._steps = ()
+        qs._last_steps = ()
+        qs._params = {}
+        return qs
 
     @property
-    def statement(self):
-        statement = self._query
-        self.clean()
-        return statement
+    def params(self) -> dict[str, Any]:
+        """Bound parameters to execute with the statement"""
+
+        return self._params
+
+    @property
+    def shape(self) -> Hashable | None:
+        shapes = tuple(step[0] for step in self._steps + self._last_steps)
+        if any(s is None for s in shapes):
+            return None
+        return (type(self), self.qs_class, shapes, len(self._last_steps))
 
-    def clean(self) -> None:
-        self.select()
+    @property
+    def statement(self) -> Executable:
+        shape = self.shape
+        if shape is not None:
+            statement = statement_cache.get(shape)
+            if statement is not None:
+                return statement
+
+        statement = None
+        for _, build, names in self._steps + self._last_steps:
+            bindparams = {
+                key: bindparam(name, expanding=isinstance(self._params[name], list))
+                for key, name in names.items()
+            }
+            statement = build(statement, **bindparams)
+
+        if shape is not None:
+            statement_cache.set(shape, statement)
+
+        return statement
 
     def select(self, *args) -> Self:
-        self._query = select(*args) if args else select(self.qs_class)
-        return self
+        shapes = tuple(_shape_of(arg) for arg in args)
+        shape = None if any(s is None for s in shapes) else ("select", shapes)
+
+        return self._reset()._chain(
+            shape, lambda _: select(*args) if args else select(self.qs_class)
+        )
 
     def update(self) -> Self:
-        self._query = update(self.qs_class)
-        return self
+        return self._reset()._chain("update", lambda _: update(self.qs_class))
 
     def delete(self) -> Self:
-        self._query = delete(self.qs_class)
-        return self
+        return self._reset()._chain("delete", lambda _: delete(self.qs_class))
 
     def values(self, **kwargs) -> Self:
-        self._query = self._query.values(**kwargs)
-        return self
+        return self._chain(
+            ("values", tuple(kwargs.keys())),
+            lambda query, **values: query.values(**values),
+            **kwargs,
+        )
+
+    def exists(self) -> Self:
+        """SELECT EXISTS of the query, wrapped after all other steps"""
+
+        return self._chain_last("exists", lambda query: select(query.exists()))
 
     def join(self, column) -> Self:
-        self._query = self._query.join(column)
-        return self
+        shape = _shape_of(column)
+        return self._chain(
+            None if shape is None else ("join", shape),
+            lambda query: query.join(column),
+        )
+
+    def distinct(self) -> Self:
+        return self._chain("distinct", lambda query: query.distinct())
 
     def where(self, *args) -> Self:
-        self._query = self._query.where(*args)
-        return self
+        """Free where clauses embed their values, they are never cached"""
+
+        return self._chain(None, lambda query: query.where(*args))
+
+    def filter_by(self, **kwargs) -> Self:
+        """Cacheable equality where clauses, None values are tested with IS NULL"""
+
+        nulls = tuple(k for k, v in kwargs.items() if v is None)
+        values = {k: v for k, v in kwargs.items() if v is not None}
+
+        return self._chain(
+            ("filter_by", tuple(values.keys()), nulls),
+            lambda query, **values: query.where(
+                *[getattr(self.qs_class, k) == v for k, v in values.items()],
+                *[getattr(self.qs_class, k) == None for k in nulls],  # noqa E711
+            ),
+            **values,
+        )
 
     def order_by(self, **kwargs) -> Self:
+        qs = self
         for k, v in kwargs.items():
-            if v.upper() == "ASC":
-                self._query = self._query.order_by(getattr(self.qs_class, k).asc())
-            else:
-                self._query = self._query.order_by(getattr(self.qs_class, k).desc())
-        return self
+            qs = qs._order_by_column(k, v.upper() == "ASC")
+        return qs
+
+    def _order_by_column(self, field: str, asc: bool) -> Self:
+        column = getattr(self.qs_class, field)
+        if asc:
+            return self._chain(
+                ("asc", field), lambda query: query.order_by(column.asc())
+            )
+        return self._chain(("desc", field), lambda query: query.order_by(column.desc()))
 
     def limit(self, limit: int) -> Self:
-        self._query = self._query.limit(limit)
-        return self
+        return self._chain("limit", lambda query, param: query.limit(param), param=limit)
 
     def id(self, id: str) -> Self:
-        self._query = self._query.where(self.qs_class.id == id)
-        return self
+        return self._chain(
+            "id", lambda query, id: query.where(self.qs_class.id == id), id=id
+        )
 
     def ids(self, ids: list[str]) -> Self:
-        self._query = self._query.where(self.qs_class.id.in_(ids))
-        return self
+        return self._chain(
+            "ids", lambda query, ids: query.where(self.qs_class.id.in_(ids)), ids=ids
+        )
 
     def options(self, *args, **kwargs) -> Self:
-        self._query = self._query.options(*args, **kwargs)
-        return self
+        """Free options are never cached, prefer loader methods below"""
+
+        return self._chain(None, lambda query: query.options(*args, **kwargs))
+
+    def _loader(self, strategy: Callable, *fields: str) -> Self:
+        attributes = [getattr(self.qs_class, field) for field in fields]
+        return self._chain(
+            (strategy.__name__, fields),
+            lambda query: query.options(*[strategy(attr) for attr in attributes]),
+        )
+
+    def selectinload(self, *fields: str) -> Self:
+        """Load these relationships with one more SELECT ... IN query"""
+
+        return self._loader(selectinload, *fields)
+
+    def lazyload(self, *fields: str) -> Self:
+        """Load these relationships on first access only"""
+
+        return self._loader(lazyload, *fields)
+
+    def noload(self, *fields: str) -> Self:
+        """Never load these relationships, they stay empty"""
+
+        return self._loader(noload, *fields)
+
+    def raiseload(self, *fields: str) -> Self:
+        """Raise an error if these relationships are accessed"""
+
+        return self._loader(raiseload, *fields)
+
+    def load_only(self, *fields: str) -> Self:
+        """Load only these columns, others are deferred"""
+
+        attributes = [getattr(self.qs_class, field) for field in fields]
+        return self._chain(
+            ("load_only", fields), lambda query: query.options(load_only(*attributes))
+        )
 
     def page(self, page_number: int, per_page: int = DEFAULT_PAGE_SIZE) -> Self:
         """A simple paginator"""
         offset = (page_number - 1) * per_page
-        self._query = self._query.offset(offset).limit(per_page)
-        return self
+        return self._add_offset_limit(offset, per_page)
 
     def from_filters(self, filters: list[Filter] | None = None) -> Self:
         """
-        Build a query statement from query string filters
+        Build a query statement from query string filters,
+        an empty query string still gives the first page (sorted by id).
+        None for all rows.
         """
 
-        if filters:
-            self._add_where(filters)
-            self._add_order_by(filters)
-            self._add_page(filters)
+        qs = self
+        if filters is not None:
+            qs = qs._add_where(filters)
+            qs = qs._add_loaders(filters)
+            qs = qs._add_order_by(filters)
+            qs = qs._add_cursor(filters)
+            qs = qs._add_page(filters)
 
-        return self
+        return qs
 
-    def _add_where(self, filters: list[Filter]) -> None:
+    def _add_where(self, filters: list[Filter]) -> Self:
         """Apply a where clause according to filters"""
-        [
-            self._add_simple_where_clause(f)
-            for f in filters
-            if f.operation not in [Operations.IN, Operations.NIN]
-        ]
-        self._add_composed_where_clause(
+
+        qs = self
+        for f in filters:
+            if f.operation not in [Operations.IN, Operations.NIN]:
+                qs = qs._add_simple_where_clause(f)
+
+        qs = qs._add_composed_where_clause(
             [fs for fs in filters if fs.operation is Operations.IN], Operations.IN
         )
-        self._add_composed_where_clause(
+        qs = qs._add_composed_where_clause(
             [fs for fs in filters if fs.operation is Operations.NIN], Operations.NIN
         )
+        return qs
+
+    def _add_simple_where_clause(self, f: Filter) -> Self:
+        column = getattr(self.qs_class, f.field, None)
 
-    def _add_simple_where_clause(self, f: Filter):
         if f.operation == Operations.EQ:
-            self._query = self._query.where(getattr(self.qs_class, f.field) == f.value)
+            clause = lambda value: column == value  # noqa: E731
         elif f.operation == Operations.NEQ:
-            self._query = self._query.where(getattr(self.qs_class, f.field) != f.value)
+            clause = lambda value: column != value  # noqa: E731
         elif f.operation == Operations.LT:
-            self._query = self._query.where(getattr(self.qs_class, f.field) < f.value)
+            clause = lambda value: column < value  # noqa: E731
         elif f.operation == Operations.LTE:
-            self._query = self._query.where(getattr(self.qs_class, f.field) <= f.value)
+            clause = lambda value: column <= value  # noqa: E731
         elif f.operation == Operations.GT:
-            self._query = self._query.where(getattr(self.qs_class, f.field) > f.value)
+            clause = lambda value: column > value  # noqa: E731
         elif f.operation == Operations.GTE:
-            self._query = self._query.where(getattr(self.qs_class, f.field) >= f.value)
+            clause = lambda value: column >= value  # noqa: E731
         elif f.operation == Operations.CONTAINS:
-            self._query = self._query.where(
-                getattr(self.qs_class, f.field).contains(f.value)
-            )
+            clause = lambda value: column.contains(value)  # noqa: E731
         elif f.operation == Operations.NCONTAINS:
-            self._query = self._query.where(
-                not_(getattr(self.qs_class, f.field).contains(f.value))
-            )
+            clause = lambda value: not_(column.contains(value))  # noqa: E731
         elif f.operation == Operations.STARTSWITH:
-            self._query = self._query.where(
-                getattr(self.qs_class, f.field).startswith(f.value)
-            )
+            clause = lambda value: column.startswith(value)  # noqa: E731
         elif f.operation == Operations.NSTARTSWITH:
-            self._query = self._query.where(
-                not_(getattr(self.qs_class, f.field).startswith(f.value))
-            )
+            clause = lambda value: not_(column.startswith(value))  # noqa: E731
         elif f.operation == Operations.ENDSWITH:
-            self._query = self._query.where(
-                getattr(self.qs_class, f.field).endswith(f.value)
-            )
+            clause = lambda value: column.endswith(value)  # noqa: E731
         elif f.operation == Operations.NENDSWITH:
-            self._query = self._query.where(
-                not_(getattr(self.qs_class, f.field).endswith(f.value))
-            )
+            clause = lambda value: not_(column.endswith(value))  # noqa: E731
         elif f.operation == Operations.ISNULL:
             if f.value is True:
-                self._query = self._query.where(
-                    getattr(self.qs_class, f.field) == None  # noqa E711
-                )
-            else:
-                self._query = self._query.where(
-                    not_(getattr(self.qs_class, f.field) == None)  # noqa E711
+                return self._chain(
+                    ("isnull", f.field),
+                    lambda query: query.where(column == None),  # noqa E711
                 )
+            return self._chain(
+                ("notnull", f.field),
+                lambda query: query.where(not_(column == None)),  # noqa E711
+            )
+        else:
+            return self
+
+        return self._chain(
+            (f.operation, f.field),
+            lambda query, **values: query.where(clause(values[f.field])),
+            **{f.field: f.value},
+        )
 
-    def _add_composed_where_clause(self, fs: list[Filter], operation: Operations):
-        fields = {f.field for f in fs}
+    def _add_composed_where_clause(
+        self, fs: list[Filter], operation: Operations
+    ) -> Self:
+        qs = self
+        fields = sorted({f.field for f in fs})
         for field in fields:
             values = [f.value for f in fs if f.field == field]
-            if operation == Operations.IN:
-                self._query = self._query.where(
-                    getattr(self.qs_class, field).in_(values)
-                )
-            elif operation == Operations.NIN:
-                self._query = self._query.where(
-                    getattr(self.qs_class, field).notin_(values)
-                )
+            qs = qs._add_in_clause(field, values, operation)
+        return qs
+
+    def _add_in_clause(self, field: str, values: list, operation: Operations) -> Self:
+        column = getattr(self.qs_class, field)
+        if operation == Operations.IN:
+            clause = column.in_
+        elif operation == Operations.NIN:
+            clause = column.notin_
+        else:
+            return self
+
+        return self._chain(
+            (operation, field),
+            lambda query, **v: query.where(clause(v[field])),
+            **{field: values},
+        )
 
-    def _add_order_by(self, filters: list[Filter]) -> None:
-        """Apply order by clauses found in filters"""
+    def _add_loaders(self, filters: list[Filter]) -> Self:
+        """
+        With fields or include filters, relationships not requested
+        are not loaded at all (no join nor extra query).
+        """
 
-        order_by_filters = [
-            f for f in filters if f.operation in [Operations.ASC, Operations.DESC]
+        selection = [
+            f.value
+            for f in filters
+            if f.operation in [Operations.FIELDS, Operations.INCLUDE]
         ]
-        for order in order_by_filters:
-            if order.operation == Operations.DESC:
-                self._query = self._query.order_by(
-                    getattr(self.qs_class, order.field).desc()
-                )
+        if not selection:
+            return self
+
+        relationships = inspect(self.qs_class).relationships.keys()
+        skipped = tuple(r for r in relationships if r not in selection)
+        return self.noload(*skipped) if skipped else self
+
+    def _add_order_by(self, filters: list[Filter]) -> Self:
+        """Apply order by clauses found in filters, id breaks ties"""
+
+        qs = self
+        for field, asc in get_sort_keys(filters):
+            qs = qs._order_by_column(field, asc)
+        return qs
+
+    def _get_cursor(self, filters: list[Filter]) -> Filter | None:
+        """Cursors are ignored if they don't match the current sort keys"""
+
+        sort_keys = get_sort_keys(filters)
+        for f in filters:
+            if f.operation in CURSOR_OPERATIONS and isinstance(f.value, Cursor):
+                if f.value.sort_keys == sort_keys:
+                    return f
+        return None
+
+    def _add_cursor(self, filters: list[Filter]) -> Self:
+        """
+        Keyset pagination: start right after (or before) the cursor row,
+        using the sort keys instead of an offset, so deep pages are as fast
+        as the first one and stable when rows are inserted meanwhile.
+        """
+
+        cursor_filter = self._get_cursor(filters)
+        if cursor_filter is None:
+            return self
+
+        cursor = cursor_filter.value
+        forward = cursor_filter.operation == Operations.AFTER
+        sort_keys = tuple(cursor.sort_keys)
+        cursor_values = [
+            self._cast_cursor_value(field, value)
+            for (field, _), value in zip(sort_keys, cursor.values)
+        ]
+        nulls = tuple(value is None for value in cursor_values)
+        values = {
+            f"key{i}": value
+            for i, value in enumerate(cursor_values)
+            if value is not None
+        }
+
+        qs = self._chain(
+            ("keyset", forward, sort_keys, nulls),
+            lambda query, **keys: query.where(
+                self._keyset_clause(sort_keys, nulls, keys, forward)
+            ),
+            **values,
+        )
+
+        if forward:
+            return qs
+
+        # Rows before the cursor are selected in reverse order (nearest first)
+        # and sorted back in a wrapping query.
+        return qs._chain_last(
+            ("backward", sort_keys),
+            lambda query: self._reverse_sort(query, sort_keys),
+        )
+
+    def _cast_cursor_value(self, field: str, value: Any) -> Any:
+        """
+        Cursor values are bound to their column, they must have its type
+        (eg: a list would be expanded to many values).
+        """
+
+        columns = inspect(self.qs_class).columns
+        if field not in columns:
+            raise InvalidCursorError(f"Invalid cursor: unknown field {field}")
+
+        if value is None:
+            return None
+
+        try:
+            python_type = columns[field].type.python_type
+        except NotImplementedError:
+            python_type = (str, int, float, date, time, timedelta)
+
+        is_enum = isinstance(python_type, type) and issubclass(python_type, Enum)
+        if is_enum and isinstance(value, str):
+            value = python_type.__members__.get(value, value)
+        elif python_type is float and type(value) is int:
+            value = float(value)
+
+        if not isinstance(value, python_type) or (
+            isinstance(value, bool) and python_type is not bool
+        ):
+            raise InvalidCursorError(f"Invalid cursor: bad value for {field}")
+
+        return value
+
+    def _keyset_clause(
+        self,
+        sort_keys: tuple[tuple[str, bool], ...],
+        nulls: tuple[bool, ...],
+        keys: dict,
+        forward: bool,
+    ):
+        """
+        Rows following (forward) or preceding the cursor in the sort order,
+        NULL values being sorted as the largest ones (as PostgreSQL does).
+        (a, b) > (x, y) is expanded to a > x OR (a = x AND b > y).
+        """
+
+        clauses = []
+        equals = []
+        for i, (field, asc) in enumerate(sort_keys):
+            column = getattr(self.qs_class, field)
+            value = None if nulls[i] else keys[f"key{i}"]
+
+            if asc == forward:
+                if value is None:
+                    clause = false()
+                else:
+                    clause = or_(column > value, column == None)  # noqa E711
             else:
-                self._query = self._query.order_by(
-                    getattr(self.qs_class, order.field).asc()
-                )
+                if value is None:
+                    clause = column != None  # noqa E711
+                else:
+                    clause = column < value
+
+            clauses.append(and_(*equals, clause))
+            equals.append(column == value)
+
+        return or_(*clauses)
+
+    def _reverse_sort(self, query, sort_keys: tuple[tuple[str, bool], ...]):
+        reversed_order = []
+        for field, asc in sort_keys:
+            column = getattr(self.qs_class, field)
+            reversed_order.append(column.desc() if asc else column.asc())
+
+        subquery = query.order_by(None).order_by(*reversed_order).subquery()
+        alias = aliased(self.qs_class, subquery)
+
+        order = []
+        for field, asc in sort_keys:
+            column = getattr(alias, field)
+            order.append(column.asc() if asc else column.desc())
+
+        return select(alias).order_by(*order)
+
+    def _add_offset_limit(self, offset: int, limit: int) -> Self:
+        return self._chain(
+            "offset_limit",
+            lambda query, param, offset: query.offset(offset).limit(param),
+            param=limit,
+            offset=offset,
+        )
 
-    def _add_page(self, filters: list[Filter]) -> None:
+    def _add_page(self, filters: list[Filter]) -> Self:
         """
         Apply pagination constraints
         offset and page cannot be used together
         page has the precedence over offset
+        a cursor has the precedence over both
         """
         limit = DEFAULT_PAGE_SIZE
         limit_filter = [f for f in filters if f.operation == Operations.LIMIT]
@@ -202,4 +633,8 @@ class Queryset:
         if len(page_filter) > 0:
             offset = (int(page_filter[0].value) - 1) * limit
 
-        self._query = self._query.offset(offset).limit(limit)
+        # A cursor already positions the page
+        if self._get_cursor(filters) is not None:
+            offset = 0
+
+        return self._add_offset_limit(offset, limit)
@@ -10,3 +10,26 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 DB_TEST = os.getenv("DB_TEST")
+
+# Read replicas, comma separated database urls
+DB_REPLICAS = os.getenv("DB_REPLICAS", "")
+DB_TEST_REPLICAS = os.getenv("DB_TEST_REPLICAS", "")
+DB_REPLICA_STRATEGY = os.getenv(
+    "DB_REPLICA_STRATEGY", "round_robin"
+)  # or least_connections
+
+# Connection pool, shared by all sessions of a process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 60 * 30))  # seconds
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true") == "true"
+
+# Statements built by querysets, kept by shape (per process)
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", 500))
+
+# Core bulk inserts (no ORM unit of work)
+DB_BULK_CHUNK_SIZE = int(os.getenv("DB_BULK_CHUNK_SIZE", 1000))
+DB_BULK_COPY_THRESHOLD = int(
+    os.getenv("DB_BULK_COPY_THRESHOLD", 5000)
+)  # 0 disables COPY
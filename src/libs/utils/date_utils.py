@@ -1,4 +1,4 @@
-from datetime import time, timedelta
+from datetime import date, time, timedelta
 
 from .exceptions import DateUtilConvertionError
 
@@ -56,3 +56,9 @@ def seconds_to_time(to_convert: int) -> time:
 
     hours, minutes, seconds = split_parts(to_convert)
     return time(hour=hours, minute=minutes, second=seconds)
+
+
+def next_month(month: date) -> date:
+    """First day of the month after the given date"""
+
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
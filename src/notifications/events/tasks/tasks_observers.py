@@ -8,6 +8,7 @@ logger = getLogger(__name__)
 
 class TasksNotificationsObserver(ObserverPort):
     subscribe_to: list[str] = ["tasks:todo_today:tasks"]
+    sync_required = False
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
@@ -19,3 +20,14 @@ class TasksNotificationsObserver(ObserverPort):
             service.notify_all()
         except Exception as e:
             logger.error(f"{e}")
+
+    @classmethod
+    def run_batch(cls, app_ctx, event_name: str, events: list[dict]):
+        service = NotificationService(services=app_ctx.dependencies)
+
+        try:
+            messages = service.build_batch_messages(name=event_name, contexts=events)
+            service.add_messages(messages=messages)
+            service.notify_all()
+        except Exception as e:
+            logger.error(f"{e}")
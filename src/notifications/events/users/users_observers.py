@@ -10,6 +10,7 @@ logger = getLogger(__name__)
 
 class UsersRegisterUserObserver(ObserverPort):
     subscribe_to: list[str] = ["users:register:user"]
+    sync_required = False
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
@@ -27,9 +28,26 @@ class UsersRegisterUserObserver(ObserverPort):
         except Exception as e:
             logger.error(f"{e}")
 
+    @classmethod
+    def run_batch(cls, app_ctx, event_name: str, events: list[dict]):
+        service = NotificationService(services=app_ctx.dependencies)
+
+        for event_data in events:
+            filtered_data = filter_fields(ContactDTO, event_data)
+            contact = ContactMapperDTO.dto_to_model(ContactDTO(**filtered_data))
+            service.add_new_contact(contact=contact, contact_id=event_data["user_id"])
+
+        try:
+            messages = service.build_batch_messages(name=event_name, contexts=events)
+            service.add_messages(messages=messages)
+            service.notify_all()
+        except Exception as e:
+            logger.error(f"{e}")
+
 
 class UsersUpdateUserObserver(ObserverPort):
     subscribe_to: list[str] = ["users:update:user"]
+    sync_required = False
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
@@ -43,6 +61,7 @@ class UsersUpdateUserObserver(ObserverPort):
 
 class UsersDeleteUserObserver(ObserverPort):
     subscribe_to: list[str] = ["users:delete:user"]
+    sync_required = False
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
@@ -52,6 +71,7 @@ class UsersDeleteUserObserver(ObserverPort):
 
 class UsersChangeEmailObserver(ObserverPort):
     subscribe_to: list[str] = ["users:change_email:user"]
+    sync_required = False
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
@@ -109,6 +129,7 @@ class UsersNotificationsObserver(ObserverPort):
         "users:accepted:invitation",
         "users:delete:tenant",
     ]
+    sync_required = False
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
@@ -121,9 +142,21 @@ class UsersNotificationsObserver(ObserverPort):
         except Exception as e:
             logger.error(f"{e}")
 
+    @classmethod
+    def run_batch(cls, app_ctx, event_name: str, events: list[dict]):
+        service = NotificationService(services=app_ctx.dependencies)
+
+        try:
+            messages = service.build_batch_messages(name=event_name, contexts=events)
+            service.add_messages(messages=messages)
+            service.notify_all()
+        except Exception as e:
+            logger.error(f"{e}")
+
 
 class UsersInviteUserObserver(ObserverPort):
     subscribe_to = ["users:invite:user", "users:cancelled:invitation"]
+    sync_required = False
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
@@ -15,18 +15,22 @@ class ContactDB(ContactDBPort, DefaultDB):
         self.qs = ContactQueryset()
 
     def update(self, session: Session, contact: Contact) -> bool:
-        self.qs.update().id(contact.id).values(
-            email=contact.email,
-            first_name=contact.first_name,
-            last_name=contact.last_name,
-            timezone=contact.timezone,
-            locale=contact.locale,
-            telegram=contact.telegram,
-            phone_number=contact.phone_number,
-            updated_at=datetime.now(tz=ZoneInfo("UTC")),
+        qs = (
+            self.qs.update()
+            .id(contact.id)
+            .values(
+                email=contact.email,
+                first_name=contact.first_name,
+                last_name=contact.last_name,
+                timezone=contact.timezone,
+                locale=contact.locale,
+                telegram=contact.telegram,
+                phone_number=contact.phone_number,
+                updated_at=datetime.now(tz=ZoneInfo("UTC")),
+            )
         )
-        session.execute(self.qs.statement)
+        session.execute(qs.statement, qs.params)
 
     def load_by_email(self, session, email: str) -> Contact | None:
-        self.qs.select().where(Contact.email == email)
-        return session.scalars(self.qs.statement).one_or_none()
+        qs = self.qs.select().filter_by(email=email)
+        return session.scalars(qs.statement, qs.params).one_or_none()
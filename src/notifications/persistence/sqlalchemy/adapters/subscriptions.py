@@ -14,18 +14,22 @@ class SubscriptionDB(SubscriptionDBPort, DefaultDB):
         self.qs = SubscriptionQueryset()
 
     def update(self, session: Session, subscription: Subscription) -> bool:
-        self.qs.update().id(subscription.id).values(
-            name=subscription.name,
-            type=subscription.type,
+        qs = (
+            self.qs.update()
+            .id(subscription.id)
+            .values(
+                name=subscription.name,
+                type=subscription.type,
+            )
         )
-        session.execute(self.qs.statement)
+        session.execute(qs.statement, qs.params)
 
     def get_subscriptions_for_event(
         self, session: Session, name: str, targets: list[str]
     ) -> list[Subscription]:
-        self.qs.select().all_events_subscriptions(names=[name], targets=targets)
+        qs = self.qs.select().all_events_subscriptions(names=[name], targets=targets)
 
-        return session.scalars(self.qs.statement).all()
+        return session.scalars(qs.statement, qs.params).all()
 
     def get_contact_subscriptions_for_event(
         self,
@@ -34,22 +38,20 @@ class SubscriptionDB(SubscriptionDBPort, DefaultDB):
         public_events: list[str],
         filters: list[Filter],
     ) -> list[Subscription]:
-        self.qs.select().from_filters(filters).all_events_subscriptions(
-            names=public_events, targets=[user_id]
+        qs = (
+            self.qs.select()
+            .from_filters(filters)
+            .all_events_subscriptions(names=public_events, targets=[user_id])
         )
 
-        return session.scalars(self.qs.statement).all()
+        return session.scalars(qs.statement, qs.params).all()
 
     def delete_with_contact(
         self, session: Session, name: str, type: MessageType, contact_id: str
     ) -> None:
-        self.qs.delete().where(
-            Subscription.contact_id == contact_id,
-            Subscription.name == name,
-            Subscription.type == type,
-        )
-        session.execute(self.qs.statement)
+        qs = self.qs.delete().filter_by(contact_id=contact_id, name=name, type=type)
+        session.execute(qs.statement, qs.params)
 
     def delete_all_with_contact(self, session: Session, contact_id: str) -> None:
-        self.qs.delete().where(Subscription.contact_id == contact_id)
-        session.execute(self.qs.statement)
+        qs = self.qs.delete().filter_by(contact_id=contact_id)
+        session.execute(qs.statement, qs.params)
@@ -9,8 +9,11 @@ class SubscriptionQueryset(Queryset):
         super().__init__(Subscription)
 
     def all_events_subscriptions(self, names: list[str], targets: list[str]) -> Self:
-        self._query = self._query.where(
-            self.qs_class.name.in_(names), self.qs_class.contact_id.in_(targets)
+        return self._chain(
+            "all_events_subscriptions",
+            lambda query, names, targets: query.where(
+                self.qs_class.name.in_(names), self.qs_class.contact_id.in_(targets)
+            ),
+            names=names,
+            targets=targets,
         )
-
-        return self
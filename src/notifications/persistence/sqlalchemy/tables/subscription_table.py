@@ -49,6 +49,7 @@ subscription_table = Table(
         "contact_id",
         unique=True,
     ),
+    Index("subscriptions_contact_name_index", "contact_id", "name"),
 )
 
 
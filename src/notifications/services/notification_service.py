@@ -140,19 +140,77 @@ class NotificationService:
             )
             self.contact_manager.delete_by_id(session=session, contact_id=contact_id)
 
+    def _get_subscriptions(self, name: str, targets: list[str]) -> list[Subscription]:
+        with self.services.persistence.get_session() as session:
+            return self.subscription_manager.get_subscriptions_for_event(
+                session=session, name=name, targets=targets
+            )
+
     def build_messages(self, name: str, context: dict) -> list[AbstractMessage]:
         """Load messages, translate and interpolate them"""
 
         targets = context["targets"]
-        with self.services.persistence.get_session() as session:
-            subscriptions = self.subscription_manager.get_subscriptions_for_event(
-                session=session, name=name, targets=targets
-            )
+        subscriptions = self._get_subscriptions(name=name, targets=targets)
 
         if len(subscriptions) == 0:
             logger.error(f"No subscription found for event {name} and targets {targets}")
             return []
 
+        return self._build_messages(
+            name=name, context=context, subscriptions=subscriptions
+        )
+
+    def build_batch_messages(
+        self, name: str, contexts: list[dict]
+    ) -> list[AbstractMessage]:
+        """
+        Messages of many events with the same name,
+        subscriptions of all targets are loaded at once.
+        """
+
+        targets = list(dict.fromkeys(t for c in contexts for t in c["targets"]))
+        subscriptions = self._get_subscriptions(name=name, targets=targets)
+
+        target_subscriptions: dict[str, list[Subscription]] = {}
+        for sub in subscriptions:
+            target_subscriptions.setdefault(sub.contact_id, []).append(sub)
+
+        messages = []
+        templates = {}
+        for context in contexts:
+            context_subscriptions = [
+                sub
+                for target in dict.fromkeys(context["targets"])
+                for sub in target_subscriptions.get(target, [])
+            ]
+            if len(context_subscriptions) == 0:
+                logger.error(
+                    f"No subscription found for event {name} "
+                    f"and targets {context['targets']}"
+                )
+                continue
+
+            messages.extend(
+                self._build_messages(
+                    name=name,
+                    context=context,
+                    subscriptions=context_subscriptions,
+                    templates=templates,
+                )
+            )
+
+        return messages
+
+    def _build_messages(
+        self,
+        name: str,
+        context: dict,
+        subscriptions: list[Subscription],
+        templates: dict | None = None,
+    ) -> list[AbstractMessage]:
+        """Templates can be shared by many calls for the same event name"""
+
+        templates = {} if templates is None else templates
         indexed_subscriptions = (
             self.subscription_manager.get_subscriptions_indexed_by_message_type(
                 subscriptions=subscriptions
@@ -165,7 +223,9 @@ class NotificationService:
         fab = TemplateFabric()
         for sub_type_name, subs in indexed_subscriptions.items():
             sub_type = [m for m in MessageType if m.name == sub_type_name][0]
-            template = fab.get_template(template_type=sub_type, name=name)
+            if sub_type not in templates:
+                templates[sub_type] = fab.get_template(template_type=sub_type, name=name)
+            template = templates[sub_type]
 
             for sub in subs:
                 with self.services.translation.get_translation_session(
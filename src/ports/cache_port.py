@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, ContextManager
+from typing import Any, Callable, ContextManager
 
 from .base_port import InjectablePort
 
@@ -16,3 +16,74 @@ class CachePort(InjectablePort, ABC):
     @abstractmethod
     def get_session(self) -> ContextManager:
         raise NotImplementedError
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Return a cached value, None if missing or expired"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: int, local_ttl: int = 0) -> None:
+        """
+        Cache a JSON serializable value for ttl seconds,
+        and in the process memory for local_ttl seconds (0 to disable).
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_max_score(self, key: str, member: str, score: float) -> None:
+        """Score a member of a sorted set, a lower score never replaces a greater"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_score(self, key: str, member: str) -> float | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_scores(self, key: str) -> dict[str, float]:
+        """All scores of a sorted set"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove_scores(self, key: str, scores: dict[str, float]) -> None:
+        """
+        Atomically remove members of a sorted set still scored as given,
+        greater scores set meanwhile are kept.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_or_load(
+        self,
+        namespace: str,
+        scopes: list[str],
+        params: Any,
+        loader: Callable[[], Any],
+        ttl: int,
+        local_ttl: int = 0,
+        dump: Callable[[Any], Any] | None = None,
+        load: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        """
+        Cache-aside read: return the cached value or load and cache it,
+        also in the process memory for local_ttl seconds (0 to disable).
+        Entries are keyed by namespace, params and current versions of scopes
+        (eg: tenants), so bumping a scope version invalidates all its entries.
+        Values must be JSON serializable, or converted with dump and load
+        (eg: models to dicts and back).
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def bump_versions(self, *scopes: str) -> None:
+        raise NotImplementedError
@@ -6,7 +6,13 @@ from .base_port import InjectablePort
 
 class EventBusPort(InjectablePort, ABC):
     @abstractmethod
-    def emit(self, tenant_id: str, event_name: str, event_data: dict) -> None:
+    def emit(
+        self,
+        tenant_id: str,
+        event_name: str,
+        event_data: dict,
+        idempotency_key: str | None = None,
+    ) -> None:
         raise NotImplementedError
 
     @abstractmethod
@@ -28,11 +34,20 @@ class EventBusPort(InjectablePort, ABC):
 
 class ObserverPort:
     subscribe_to: list[str]
+    # Run in the emitting process, else in a worker if async observers are enabled
+    sync_required: bool = True
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
         raise NotImplementedError
 
+    @classmethod
+    def run_batch(cls, app_ctx, event_name: str, events: list[dict]):
+        """Many events of the same name, to override to share work between them"""
+
+        for event_data in events:
+            cls.run(app_ctx, event_name, event_data)
+
     @classmethod
     def self_subscribe(cls) -> list[tuple[str, Callable]]:
-        return [(event_name, cls.run) for event_name in cls.subscribe_to]
+        return [(event_name, cls.run_batch) for event_name in cls.subscribe_to]
@@ -22,6 +22,17 @@ class IdentityAccessManagementPort(InjectablePort, ABC):
     ) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    def can_many(
+        self,
+        session: ContextManager,
+        user_id: str,
+        checks: list[tuple[Enum, str, str]],
+        exception: bool = True,
+    ) -> list[bool]:
+        """Checks are (permission, group_id_resource, resource) tuples"""
+        raise NotImplementedError
+
     @abstractmethod
     def all_tenants_with_access(
         session: ContextManager,
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, TypeVar
+from contextlib import contextmanager
+from typing import Any, Callable, TypeVar
 
 from .base_port import InjectablePort
 
@@ -19,6 +20,10 @@ class AbstractDBPort(ABC):
     def bulk_save(self, session, objs) -> list[object]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def bulk_insert(self, session, objs) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     def delete(self, session, obj) -> None:
         raise NotImplementedError()
@@ -31,6 +36,12 @@ class AbstractDBPort(ABC):
     def exists(self, session, id: str) -> bool:
         raise NotImplementedError()
 
+    @abstractmethod
+    def restore(self, obj) -> object:
+        """Mark an object rebuilt out of persistence (eg: from cache) as persisted"""
+
+        raise NotImplementedError()
+
 
 class SessionPort(ABC):
     def __enter__(self) -> TSessionPort:
@@ -56,9 +67,68 @@ class PersistencePort(InjectablePort, ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_session(self) -> SessionPort:
+    def get_session(self, readonly: bool = False) -> SessionPort:
+        raise NotImplementedError
+
+    @abstractmethod
+    def begin_unit_of_work(self) -> None:
+        """Share one session between all get_session calls of the current context"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def end_unit_of_work(self, commit: bool = False) -> None:
+        """Commit or rollback the shared session, then release it"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset_written(self) -> None:
+        """
+        Serve reads of the current context by replicas again,
+        without a unit of work it must be called for each request or task.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def after_commit(self, session, callback: Callable, *args) -> None:
+        """Call callback(*args) once the session is committed, never on rollback"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def can_cache(self, session) -> bool:
+        """
+        False while changes with after_commit callbacks (eg: cache invalidations)
+        are not committed: reads of this session must not be cached.
+        """
+
         raise NotImplementedError
 
+    @abstractmethod
+    def begin_query_stats(self) -> None:
+        """Start counting statements sent in the current context"""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def end_query_stats(self) -> Any:
+        """Stop counting and return statistics, None if nothing was started"""
+
+        raise NotImplementedError
+
+    @contextmanager
+    def unit_of_work(self):
+        self.begin_unit_of_work()
+        try:
+            yield
+        except Exception:
+            self.end_unit_of_work(commit=False)
+            raise
+        else:
+            self.end_unit_of_work(commit=True)
+
     def _compose_index(self, app_name: str, class_name: str) -> str:
         return f"{app_name}:{class_name}"
 
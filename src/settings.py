@@ -16,6 +16,21 @@ UNUSED_ACCOUNT_DELAY = 7  # 7 days
 # Auth token validity
 TOKEN_VALIDITY = 60 * 60 * 8  # 8 heures !
 TOKEN_TEMP_VALIDITY = 60 * 3  # 3 minutes
+# Users authenticated by token are cached (seconds), in Redis and in process memory
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 60))
+AUTH_CACHE_LOCAL_TTL = int(os.getenv("AUTH_CACHE_LOCAL_TTL", 5))
+# Token activity is saved only if older than this (seconds), by a periodic job
+TOKEN_ACTIVITY_GRANULARITY = int(os.getenv("TOKEN_ACTIVITY_GRANULARITY", 60))
+TOKEN_ACTIVITY_FLUSH_INTERVAL = int(os.getenv("TOKEN_ACTIVITY_FLUSH_INTERVAL", 60))
+# Short lived access tokens, signed and checked without database (seconds),
+# the token given at login is then only used to refresh them
+ACCESS_TOKENS = os.getenv("ACCESS_TOKENS", "false") == "true"
+ACCESS_TOKEN_VALIDITY = int(os.getenv("ACCESS_TOKEN_VALIDITY", 300))
+# Frequent reads (eg: tags, groups) are cached until a change in a tenant (seconds)
+READ_CACHE_TTL = int(os.getenv("READ_CACHE_TTL", 300))
+# Permissions map of a user, cached until a change of its roles (seconds)
+PERMISSIONS_CACHE_TTL = int(os.getenv("PERMISSIONS_CACHE_TTL", 600))
+PERMISSIONS_CACHE_LOCAL_TTL = int(os.getenv("PERMISSIONS_CACHE_LOCAL_TTL", 60))
 
 # Validity of a request change (email or password)
 REQUEST_VALIDITY = 60 * 5
@@ -24,6 +39,33 @@ REQUEST_DAYS_HISTORY = 90
 # Validity of group invitation
 INVITE_VALIDITY = 60 * 60 * 24 * 30  # almost 1 month
 
+# One database session per request or task, committed once at the end
+UNIT_OF_WORK = os.getenv("UNIT_OF_WORK", "true") == "true"
+
+# Max events emitted by a request or a task before they are executed
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", 1000))
+# Observers not marked sync_required run in celery workers, out of requests
+ASYNC_OBSERVERS = os.getenv("ASYNC_OBSERVERS", "false") == "true"
+# Or saved in an outbox with the emitting transaction, then run by relay workers
+EVENTS_OUTBOX = os.getenv("EVENTS_OUTBOX", "false") == "true"
+EVENTS_OUTBOX_BATCH_SIZE = int(os.getenv("EVENTS_OUTBOX_BATCH_SIZE", 100))
+EVENTS_OUTBOX_RELAY_INTERVAL = int(os.getenv("EVENTS_OUTBOX_RELAY_INTERVAL", 5))
+# A failing event is retried later (attempts x delay, in seconds), then dropped
+EVENTS_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EVENTS_OUTBOX_MAX_ATTEMPTS", 5))
+EVENTS_OUTBOX_RETRY_DELAY = int(os.getenv("EVENTS_OUTBOX_RETRY_DELAY", 30))
+# Dispatched events are kept this long (seconds): idempotency keys are unique meanwhile
+EVENTS_OUTBOX_RETENTION = int(os.getenv("EVENTS_OUTBOX_RETENTION", 60 * 60 * 24))
+# Events table is partitioned by month, partitions are created some months ahead
+EVENTS_PARTITIONS_AHEAD = int(os.getenv("EVENTS_PARTITIONS_AHEAD", 3))
+# Events are kept this long (days), or by event name, eg: "users:login_2fa:user=30"
+EVENTS_RETENTION_DAYS = int(os.getenv("EVENTS_RETENTION_DAYS", 365))
+EVENTS_RETENTION_BY_NAME = os.getenv("EVENTS_RETENTION_BY_NAME", "")
+
+# Count SQL statements and database time per request or task
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "true") == "true"
+# Warn when a statement is sent this many times (likely N+1 queries)
+SQL_REPEAT_WARNING = int(os.getenv("SQL_REPEAT_WARNING", 5))
+
 # i18n/l10n
 AVAILABLE_LANGUAGES = {
     "fr": "Français",
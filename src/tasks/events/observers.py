@@ -8,6 +8,7 @@ logger = getLogger(__name__)
 
 class UsersDeleteTenantObserver(ObserverPort):
     subscribe_to: list[str] = ["users:delete:tenant"]
+    sync_required = False
 
     @classmethod
     def run(cls, app_ctx, event_name: str, event_data: dict):
@@ -79,7 +79,9 @@ def tags():
 
         if tags:
             tags_dto = list_models_to_list_dto(TagMapperDTO, tags)
-            return ResponseAPI.get_response(list_dto_to_dict(tags_dto), 200)
+            return ResponseAPI.get_list_response(
+                list_dto_to_dict(tags_dto, qsf.get_fields()), qsf.get_next_cursor(tags)
+            )
         else:
             return ResponseAPI.get_response([], 200)
 
@@ -291,15 +293,16 @@ def tag_tasks(tag_id: str):
             user_id=g.user.id, tag_id=tag_id
         )
         if tag_exists:
-            tasks_dto = list_models_to_list_dto(
-                TaskMapperDTO,
-                tasks_service.get_all_tag_tasks(
-                    user_id=g.user.id, tag_id=tag_id, qs_filters=qsf.get_filters()
-                ),
+            tasks = tasks_service.get_all_tag_tasks(
+                user_id=g.user.id, tag_id=tag_id, qs_filters=qsf.get_filters()
             )
+            tasks_dto = list_models_to_list_dto(TaskMapperDTO, tasks)
 
             if tasks_dto:
-                return ResponseAPI.get_response(list_dto_to_dict(tasks_dto), 200)
+                return ResponseAPI.get_list_response(
+                    list_dto_to_dict(tasks_dto, qsf.get_fields()),
+                    qsf.get_next_cursor(tasks),
+                )
             return ResponseAPI.get_response([], 200)
         else:
             return ResponseAPI.get_404_response("Tag not found")
@@ -76,7 +76,9 @@ def tasks():
         tasks = tasks_service.get_user_all_tasks(g.user.id, qsf.get_filters())
         if tasks:
             tasks_dto = list_models_to_list_dto(TaskMapperDTO, tasks)
-            return ResponseAPI.get_response(list_dto_to_dict(tasks_dto), 200)
+            return ResponseAPI.get_list_response(
+                list_dto_to_dict(tasks_dto, qsf.get_fields()), qsf.get_next_cursor(tasks)
+            )
         else:
             return ResponseAPI.get_response([], 200)
 
@@ -1,11 +1,40 @@
+from datetime import datetime
+
 from src.libs.dependencies import DependencyInjector
-from src.libs.hmi.querystring import Filter
+from src.libs.hmi.querystring import Filter, normalize_filters
 from src.libs.iam.constants import Permissions
-from src.tasks.models import Tag
+from src.settings import READ_CACHE_TTL
+from src.tasks.models import Color, Tag
 from src.tasks.persistence import TagDBPort
 from src.tasks.settings import APP_NAME
 
 
+def _dump_tags(tags: list[Tag]) -> list[dict]:
+    return [
+        {
+            "id": tag.id,
+            "created_at": tag.created_at.isoformat(),
+            "tenant_id": tag.tenant_id,
+            "title": tag.title,
+            "color": str(tag.color),
+        }
+        for tag in tags
+    ]
+
+
+def _load_tags(data: list[dict]) -> list[Tag]:
+    return [
+        Tag(
+            id=item["id"],
+            created_at=datetime.fromisoformat(item["created_at"]),
+            tenant_id=item["tenant_id"],
+            title=item["title"],
+            color=Color.from_string(item["color"]),
+        )
+        for item in data
+    ]
+
+
 class TagManager:
     def __init__(self, services: DependencyInjector) -> None:
         self.services = services
@@ -13,6 +42,13 @@ class TagManager:
             APP_NAME, "Tag"
         )
 
+    def _invalidate(self, session, tenant_id: str) -> None:
+        """Invalidate cached tags of a tenant, once changes are committed"""
+
+        self.services.persistence.after_commit(
+            session, self.services.cache.bump_versions, tenant_id
+        )
+
     def create_tag(self, session, user_id: str, tag: Tag) -> bool:
         """Create a new tag"""
 
@@ -24,6 +60,7 @@ class TagManager:
             resource="Task",
         ):
             self.tag_db.save(session, tag)
+            self._invalidate(session, tag.tenant_id)
 
             return True
 
@@ -75,7 +112,20 @@ class TagManager:
             resource="Tag",
         )
 
-        return self.tag_db.tags(session, tenant_ids, qs_filters)
+        # Tags changed in this session are not committed yet
+        if not self.services.persistence.can_cache(session):
+            return self.tag_db.tags(session, tenant_ids, qs_filters)
+
+        # Cached until a tag of these tenants changes
+        return self.services.cache.get_or_load(
+            f"{APP_NAME}:tags",
+            scopes=tenant_ids,
+            params=normalize_filters(qs_filters),
+            loader=lambda: self.tag_db.tags(session, tenant_ids, qs_filters),
+            ttl=READ_CACHE_TTL,
+            dump=_dump_tags,
+            load=_load_tags,
+        )
 
     def get_tags_from_ids(self, session, user_id: str, tag_ids: list[str]) -> list[Tag]:
         """Get a list of authorized tags from the list"""
@@ -114,6 +164,7 @@ class TagManager:
             resource="Tag",
         ):
             self.tag_db.save(session, tag)
+            self._invalidate(session, tag.tenant_id)
 
             return True
 
@@ -130,6 +181,7 @@ class TagManager:
             resource="Tag",
         ):
             self.tag_db.delete(session, tag)
+            self._invalidate(session, tag.tenant_id)
 
             return True
 
@@ -137,3 +189,4 @@ class TagManager:
 
     def delete_all_tenant_tags(self, session, tenant_id: str) -> None:
         self.tag_db.delete_all_by_tenant(session=session, tenant_id=tenant_id)
+        self._invalidate(session, tenant_id)
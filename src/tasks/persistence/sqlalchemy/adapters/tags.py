@@ -20,16 +20,16 @@ class TagDB(TagDBPort, DefaultDB):
     ) -> list[Tag]:
         """Retrieve all tenant's tags"""
 
-        self.qs.select().from_filters(filters).tenants(tenant_ids)
+        qs = self.qs.select().lazyload("tasks").from_filters(filters).tenants(tenant_ids)
 
-        return session.execute(self.qs.statement).scalars().all()
+        return session.execute(qs.statement, qs.params).scalars().all()
 
     def all_exists(self, session, tenant_ids: list[str], tag_ids: list[str]) -> bool:
         """Check if all tags exists for tenants"""
 
-        self.qs.select().where(Tag.id.in_(tag_ids)).tenants(tenant_ids)
+        qs = self.qs.select().ids(tag_ids).tenants(tenant_ids).exists()
 
-        return session.execute(self.qs.statement.exists()).scalars()
+        return session.execute(qs.statement, qs.params).scalars()
 
     def tags_from_ids(
         self,
@@ -39,9 +39,9 @@ class TagDB(TagDBPort, DefaultDB):
     ) -> list[Tag]:
         """Retrieve all tenant's tags in tag_ids"""
 
-        self.qs.select().where(Tag.id.in_(tag_ids)).tenants(tenant_ids)
+        qs = self.qs.select().ids(tag_ids).tenants(tenant_ids)
 
-        return session.execute(self.qs.statement).scalars().all()
+        return session.execute(qs.statement, qs.params).scalars().all()
 
     def task_tags(
         self,
@@ -52,12 +52,18 @@ class TagDB(TagDBPort, DefaultDB):
     ) -> list[Tag]:
         """Retrieve all tenant's tags for this task"""
 
-        self.qs.select().from_filters(filters).tenants(tenant_ids).task(task_id)
+        qs = (
+            self.qs.select()
+            .lazyload("tasks")
+            .from_filters(filters)
+            .tenants(tenant_ids)
+            .task(task_id)
+        )
 
-        return session.execute(self.qs.statement).scalars().all()
+        return session.execute(qs.statement, qs.params).scalars().all()
 
     def delete_all_by_tenant(self, session, tenant_id: str) -> None:
         """Clean all tenant's tags"""
 
-        self.qs.delete().tenants(tenant_ids=[tenant_id])
-        session.execute(self.qs.statement)
+        qs = self.qs.delete().tenants(tenant_ids=[tenant_id])
+        session.execute(qs.statement, qs.params)
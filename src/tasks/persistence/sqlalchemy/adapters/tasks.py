@@ -1,7 +1,6 @@
 from datetime import datetime
 from logging import Logger
 
-from sqlalchemy import distinct
 from sqlalchemy.orm import Session
 
 from src.libs.hmi.querystring import Filter
@@ -26,8 +25,8 @@ class TaskDB(TaskDBPort, DefaultDB):
     ) -> list[Task]:
         """Retrieve all tenant's tasks"""
 
-        self.qs.select().from_filters(filters).tenants(tenant_ids)
-        return session.execute(self.qs.statement).scalars().all()
+        qs = self.qs.select().lazyload("tags").from_filters(filters).tenants(tenant_ids)
+        return session.execute(qs.statement, qs.params).scalars().all()
 
     def tag_tasks(
         self,
@@ -38,8 +37,14 @@ class TaskDB(TaskDBPort, DefaultDB):
     ) -> list[Task]:
         """Retrieve all tenant's tasks with this tag"""
 
-        self.qs.select().from_filters(filters).tenants(tenant_ids).tag(tag_id)
-        return session.execute(self.qs.statement).scalars().all()
+        qs = (
+            self.qs.select()
+            .lazyload("tags")
+            .from_filters(filters)
+            .tenants(tenant_ids)
+            .tag(tag_id)
+        )
+        return session.execute(qs.statement, qs.params).scalars().all()
 
     def add_tags(
         self,
@@ -53,7 +58,7 @@ class TaskDB(TaskDBPort, DefaultDB):
         task = self.load(session=session, id=task.id)
         tag_qs = TagQueryset()
         tag_qs = tag_qs.select().tenants(tenant_ids).ids(tag_ids)
-        tags = session.execute(tag_qs.statement).scalars().all()
+        tags = session.execute(tag_qs.statement, tag_qs.params).scalars().all()
 
         task.tags = tags
 
@@ -66,23 +71,30 @@ class TaskDB(TaskDBPort, DefaultDB):
     def delete_all_by_tenant(self, session, tenant_id: str) -> None:
         """Clean all tenant's tasks"""
 
-        self.qs.delete().tenants(tenant_ids=[tenant_id])
-        session.execute(self.qs.statement)
+        qs = self.qs.delete().tenants(tenant_ids=[tenant_id])
+        session.execute(qs.statement, qs.params)
 
     def all_assigned_to_for_scheduled_between(
         self, session, start: datetime, end: datetime
     ) -> list[str]:
         """Return all distinct assigned_to ids in tasks list"""
 
-        self.qs.select(distinct(Task.assigned_to)).scheduled_in(start=start, end=end)
-        return session.execute(self.qs.statement).scalars().all()
+        qs = (
+            self.qs.select(Task.assigned_to)
+            .distinct()
+            .scheduled_in(start=start, end=end)
+        )
+        return session.execute(qs.statement, qs.params).scalars().all()
 
     def get_tasks_assigned_to_and_scheduled_between(
         self, session, ids: list[str], start: datetime, end: datetime
     ) -> list[Task]:
         """Return all tasks assigned_to ids and scheduled between start and end"""
 
-        self.qs.select().scheduled_in(start=start, end=end).where(
-            Task.assigned_to.in_(ids)
-        ).order_by(scheduled_at="ASC")
-        return session.execute(self.qs.statement).scalars().all()
+        qs = (
+            self.qs.select()
+            .scheduled_in(start=start, end=end)
+            .assigned_to(ids)
+            .order_by(scheduled_at="ASC")
+        )
+        return session.execute(qs.statement, qs.params).scalars().all()
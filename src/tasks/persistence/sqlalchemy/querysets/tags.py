@@ -10,5 +10,10 @@ class TagQueryset(TenantQueryset):
         super().__init__(Tag)
 
     def task(self, task_id: str) -> Self:
-        self._query = self._query.where(self.qs_class.tasks.any(Task.id == task_id))
-        return self
+        return self._chain(
+            "task",
+            lambda query, task_id: query.where(
+                self.qs_class.tasks.any(Task.id == task_id)
+            ),
+            task_id=task_id,
+        )
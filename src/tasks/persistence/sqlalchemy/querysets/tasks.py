@@ -11,15 +11,27 @@ class TaskQueryset(TenantQueryset):
         super().__init__(Task)
 
     def tag(self, tag_id: str) -> Self:
-        self._query = self._query.where(self.qs_class.tags.any(Tag.id == tag_id))
-
-        return self
+        return self._chain(
+            "tag",
+            lambda query, tag_id: query.where(self.qs_class.tags.any(Tag.id == tag_id)),
+            tag_id=tag_id,
+        )
 
     def scheduled_in(self, start: datetime, end: datetime) -> Self:
-        self._query = self._query.where(
-            self.qs_class.scheduled_at != None,  # noqa: E711
-            self.qs_class.scheduled_at >= start,
-            self.qs_class.scheduled_at < end,
+        return self._chain(
+            "scheduled_in",
+            lambda query, start, end: query.where(
+                self.qs_class.scheduled_at != None,  # noqa: E711
+                self.qs_class.scheduled_at >= start,
+                self.qs_class.scheduled_at < end,
+            ),
+            start=start,
+            end=end,
         )
 
-        return self
+    def assigned_to(self, ids: list[str]) -> Self:
+        return self._chain(
+            "assigned_to",
+            lambda query, ids: query.where(self.qs_class.assigned_to.in_(ids)),
+            ids=ids,
+        )
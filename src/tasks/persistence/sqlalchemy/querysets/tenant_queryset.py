@@ -8,5 +8,10 @@ class TenantQueryset(Queryset):
         super().__init__(qs_class)
 
     def tenants(self, tenant_ids: list[str]) -> Self:
-        self._query = self._query.where(self.qs_class.tenant_id.in_(tenant_ids))
-        return self
+        return self._chain(
+            "tenants",
+            lambda query, tenant_ids: query.where(
+                self.qs_class.tenant_id.in_(tenant_ids)
+            ),
+            tenant_ids=tenant_ids,
+        )
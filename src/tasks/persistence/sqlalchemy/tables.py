@@ -1,7 +1,17 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Interval, String, Table
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Interval,
+    String,
+    Table,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from src.colors.persistence.sqlalchemy.color import ColorType
@@ -23,6 +33,7 @@ tasktag_table = Table(
         ForeignKey("tasks.id", name="fk_taskstags_task_id"),
         primary_key=True,
     ),
+    Index("taskstags_task_index", "task_id"),
 )
 
 
@@ -39,6 +50,7 @@ tag_table = Table(
     Column("tenant_id", String, nullable=False),
     Column("title", String(50), nullable=False),
     Column("color", ColorType),
+    Index("tags_tenant_index", "tenant_id", "id"),
 )
 
 
@@ -76,6 +88,19 @@ tasks_table = Table(
     Column("duration", Interval, nullable=True, default=None),
     Column("done", DateTime(timezone=True), nullable=True, default=None),
     Column("assigned_to", String, nullable=False),
+    Index("tasks_tenant_index", "tenant_id", "id"),
+    Index(
+        "tasks_assigned_scheduled_index",
+        "assigned_to",
+        "scheduled_at",
+        postgresql_where=text("scheduled_at IS NOT NULL"),
+    ),
+    Index(
+        "tasks_scheduled_assigned_index",
+        "scheduled_at",
+        "assigned_to",
+        postgresql_where=text("scheduled_at IS NOT NULL"),
+    ),
 )
 
 
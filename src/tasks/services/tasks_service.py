@@ -44,7 +44,7 @@ class TasksService:
     def get_user_all_tasks(self, user_id: str, qs_filters: list[Filter] | None = None):
         """Return all user's tasks"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             tasks = self.task_manager.get_tasks(
                 session=session, user_id=user_id, qs_filters=qs_filters
             )
@@ -56,7 +56,7 @@ class TasksService:
     ) -> list[Tag]:
         """Return all tasks with this at least this tag"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.task_manager.get_tag_tasks(
                 session=session, user_id=user_id, tag_id=tag_id, qs_filters=qs_filters
             )
@@ -100,7 +100,7 @@ class TasksService:
             )
 
     def get_all_task_tags(self, user_id: str, task_id: str) -> list[Tag]:
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.tag_manager.get_task_tags(
                 session=session, user_id=user_id, task_id=task_id
             )
@@ -116,7 +116,7 @@ class TasksService:
     ) -> list[Tag]:
         """Return all user's tags"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             tags = self.tag_manager.get_tags(
                 session=session, user_id=user_id, qs_filters=qs_filters
             )
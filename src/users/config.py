@@ -9,6 +9,7 @@ from src.users.persistence.sqlalchemy import (
     RoleTypeDB,
     TokenDB,
     UserDB,
+    UserPermissionDB,
 )
 
 from .settings import APP_NAME
@@ -30,6 +31,7 @@ def common_data(project_dir: str) -> dict:
             (APP_NAME, "RequestChange", RequestChangeDB()),
             (APP_NAME, "Token", TokenDB()),
             (APP_NAME, "Invitation", InvitationDB()),
+            (APP_NAME, "UserPermission", UserPermissionDB()),
         ],
         "permissions_resources": ["Group", "Role", "RoleType"],
     }
@@ -38,6 +40,10 @@ def common_data(project_dir: str) -> dict:
 def setup_celery(app, project_dir: str) -> dict:
     """Must be called only if a Celery app is needed"""
 
+    from src.users.jobs import schedule_tasks
+
+    schedule_tasks(app=app)
+
     return common_data(project_dir=project_dir)
 
 
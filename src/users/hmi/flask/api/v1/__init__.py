@@ -5,6 +5,7 @@ from .group import *
 from .invitation import *
 from .login import *
 from .logout import *
+from .refresh import *
 from .register import *
 from .right import *
 from .role import *
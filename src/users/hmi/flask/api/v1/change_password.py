@@ -3,6 +3,7 @@ from datetime import timedelta
 from flask import current_app, request
 from src.libs.flask.utils import ResponseAPI
 from src.libs.redis import rate_limited
+from src.libs.security.utils import HashingOverloadError
 from src.libs.security.validators import PasswordComplexityError
 from src.users.services import UsersService
 
@@ -102,6 +103,14 @@ api_item = {
                     }
                 },
             },
+            "503": {
+                "description": "Too many password changes in progress, retry later",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/APIError"}
+                    }
+                },
+            },
         },
         "requestBody": {
             "description": "To set the new password",
@@ -178,6 +187,10 @@ def new_password():
             logger.warning(f"400 Error: {e}")
             return ResponseAPI.get_400_response(str(e))
 
+    except HashingOverloadError as e:
+        logger.warning(f"503 Error: {e}")
+        return ResponseAPI.get_503_response(headers={"Retry-After": "1"})
+
     except Exception as e:
         logger.error(f"500 Error: {e}")
         return ResponseAPI.get_500_response()
@@ -2,7 +2,8 @@ from datetime import timedelta
 
 from flask import current_app, request
 from src.libs.flask.utils import ResponseAPI, get_auth_token
-from src.libs.redis import rate_limited
+from src.libs.redis import RateLimitAlgorithm, rate_limited
+from src.settings import ACCESS_TOKEN_VALIDITY, ACCESS_TOKENS
 from src.users.services import UsersService
 
 from .. import V1, logger, openapi, users_bp
@@ -14,8 +15,18 @@ api_item = {
         "operationId": "postConfirm2FA",
         "responses": {
             "200": {
-                "description": "no response content",
-                "content": {},
+                "description": "Return an access token, if enabled",
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "object",
+                            "properties": {
+                                "access_token": {"type": "string"},
+                                "expires_in": {"type": "integer"},
+                            },
+                        }
+                    }
+                },
             },
             "400": {
                 "description": "Bad request format",
@@ -52,7 +63,12 @@ openapi.register_path(f"{V1}/users/2fa", api_item)
 
 
 @users_bp.route(f"{V1}/users/2fa", methods=["POST"])
-@rate_limited(logger=logger, hit=6, period=timedelta(seconds=60))
+@rate_limited(
+    logger=logger,
+    hit=6,
+    period=timedelta(seconds=60),
+    algorithm=RateLimitAlgorithm.SLIDING_LOG,
+)
 def confirm_2fa():
     """
     URL to confirm 2FA auth - Token required
@@ -79,6 +95,11 @@ def confirm_2fa():
 
         if token:
             data = {}
+            if ACCESS_TOKENS:
+                data = {
+                    "access_token": users_service.refresh_access_token(sha_token),
+                    "expires_in": ACCESS_TOKEN_VALIDITY,
+                }
             return ResponseAPI.get_response(data, 200)
         else:
             logger.warning("401 Error: Attempt with bad 2FA")
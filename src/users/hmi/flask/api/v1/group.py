@@ -81,7 +81,9 @@ def groups():
         )
 
         groups_dto = list_models_to_list_dto(GroupMapperDTO, groups)
-        return ResponseAPI.get_response(list_dto_to_dict(groups_dto), 200)
+        return ResponseAPI.get_list_response(
+            list_dto_to_dict(groups_dto, qsf.get_fields()), qsf.get_next_cursor(groups)
+        )
 
     if request.method == "POST":
         group_dto = GroupDTO(**request.get_json())
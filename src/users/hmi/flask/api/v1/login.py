@@ -2,7 +2,8 @@ from datetime import timedelta
 
 from flask import current_app, request
 from src.libs.flask.utils import ResponseAPI
-from src.libs.redis import rate_limited
+from src.libs.redis import RateLimitAlgorithm, rate_limited
+from src.libs.security.utils import HashingOverloadError
 from src.users.services import UsersService
 
 from .. import V1, logger, openapi, users_bp
@@ -42,6 +43,14 @@ api_item = {
                     }
                 },
             },
+            "503": {
+                "description": "Too many logins in progress, retry later",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/APIError"}
+                    }
+                },
+            },
         },
         "requestBody": {
             "description": "Credentials to login user",
@@ -74,7 +83,12 @@ openapi.register_path(f"{V1}/users/login", api_item)
 
 
 @users_bp.route(f"{V1}/users/login", methods=["POST"])
-@rate_limited(logger=logger, hit=5, period=timedelta(seconds=60))
+@rate_limited(
+    logger=logger,
+    hit=5,
+    period=timedelta(seconds=60),
+    algorithm=RateLimitAlgorithm.SLIDING_LOG,
+)
 def login():
     """
     URL to login as an authorized user
@@ -102,6 +116,9 @@ def login():
         else:
             logger.warning("401 Error: Request token with invalid credentials")
             return ResponseAPI.get_401_response("Invalid credentials")
+    except HashingOverloadError as e:
+        logger.warning(f"503 Error: {e}")
+        return ResponseAPI.get_503_response(headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"500 Error: {e}")
         return ResponseAPI.get_500_response()
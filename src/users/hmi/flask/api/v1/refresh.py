@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from flask import current_app, request
+from src.libs.flask.utils import ResponseAPI, get_auth_token
+from src.libs.redis import rate_limited
+from src.settings import ACCESS_TOKEN_VALIDITY
+from src.users.services import UsersService
+
+from .. import V1, logger, openapi, users_bp
+
+api_item = {
+    "post": {
+        "description": "Give a new short lived access token, with the login token",
+        "summary": "To refresh an access token",
+        "operationId": "postRefresh",
+        "responses": {
+            "200": {
+                "description": "Return a signed access token",
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "object",
+                            "properties": {
+                                "access_token": {"type": "string"},
+                                "expires_in": {"type": "integer"},
+                            },
+                        }
+                    }
+                },
+            },
+            "401": {
+                "description": "Login required",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/APIError"}
+                    }
+                },
+            },
+        },
+    }
+}
+openapi.register_path(f"{V1}/users/refresh", api_item)
+
+
+@users_bp.route(f"{V1}/users/refresh", methods=["POST"])
+@rate_limited(logger=logger, hit=6, period=timedelta(seconds=60))
+def refresh():
+    """
+    URL to get a new access token - Token required
+
+    Need a valid token (the one given at login, not an access token)
+    Return a 200
+    """
+
+    sha_token = get_auth_token(request)
+    if not sha_token:
+        return ResponseAPI.get_401_response("Invalid token")
+
+    try:
+        users_service = UsersService(current_app.dependencies)
+        access_token = users_service.refresh_access_token(sha_token)
+
+        if access_token:
+            data = {"access_token": access_token, "expires_in": ACCESS_TOKEN_VALIDITY}
+            return ResponseAPI.get_response(data, 200)
+        else:
+            return ResponseAPI.get_401_response("Invalid token")
+    except Exception as e:
+        logger.error(f"500 Error: {e}")
+        return ResponseAPI.get_500_response()
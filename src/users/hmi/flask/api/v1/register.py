@@ -4,6 +4,7 @@ from flask import current_app, request
 from src.libs.flask.utils import ResponseAPI
 from src.libs.hmi import dto_to_dict
 from src.libs.redis import rate_limited
+from src.libs.security.utils import HashingOverloadError
 from src.libs.security.validators import EmailSyntaxError, PasswordComplexityError
 from src.users.hmi.dto.user import UserDTO, UserMapperDTO
 from src.users.services import UsersService
@@ -38,6 +39,14 @@ api_item = {
                     }
                 },
             },
+            "503": {
+                "description": "Too many registrations in progress, retry later",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/APIError"}
+                    }
+                },
+            },
         },
         "requestBody": {
             "description": "User to register",
@@ -92,6 +101,10 @@ def register():
         logger.warning(f"400 Error: {e}")
         return ResponseAPI.get_400_response(f"{e}")
 
+    except HashingOverloadError as e:
+        logger.warning(f"503 Error: {e}")
+        return ResponseAPI.get_503_response(headers={"Retry-After": "1"})
+
     except Exception as e:
         logger.error(f"500 Error: {e}")
         return ResponseAPI.get_500_response("Internal error")
@@ -72,7 +72,9 @@ def rights():
 
         rights = users_service.get_all_user_rights(g.user.id, qsf.get_filters())
         rights_dto = list_models_to_list_dto(RightMapperDTO, rights)
-        return ResponseAPI.get_response(list_dto_to_dict(rights_dto), 200)
+        return ResponseAPI.get_list_response(
+            list_dto_to_dict(rights_dto, qsf.get_fields()), qsf.get_next_cursor(rights)
+        )
 
     if request.method == "POST":
         right_dto = RightDTO(**request.get_json())
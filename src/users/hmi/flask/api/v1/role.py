@@ -74,7 +74,9 @@ def roles():
         roles = users_service.get_all_user_roles(g.user.id, qsf.get_filters())
 
         roles_dto = list_models_to_list_dto(RoleMapperDTO, roles)
-        return ResponseAPI.get_response(list_dto_to_dict(roles_dto), 200)
+        return ResponseAPI.get_list_response(
+            list_dto_to_dict(roles_dto, qsf.get_fields()), qsf.get_next_cursor(roles)
+        )
 
     if request.method == "POST":
         role_dto = RoleDTO(**request.get_json())
@@ -80,7 +80,10 @@ def roletypes():
         roletypes = users_service.get_all_user_roletypes(g.user.id, qsf.get_filters())
 
         roletypes_dto = list_models_to_list_dto(RoleTypeMapperDTO, roletypes)
-        return ResponseAPI.get_response(list_dto_to_dict(roletypes_dto), 200)
+        return ResponseAPI.get_list_response(
+            list_dto_to_dict(roletypes_dto, qsf.get_fields()),
+            qsf.get_next_cursor(roletypes),
+        )
 
     if request.method == "POST":
         roletype_dto = RoleTypeDTO(**request.get_json())
@@ -10,5 +10,6 @@ users_cli_bp = Blueprint(
 )
 
 
+from .check_user_permissions import *
 from .create_super_user import *
 from .refresh_admin_rights import *
@@ -0,0 +1,29 @@
+import click
+
+from flask import current_app
+from flask.cli import with_appcontext
+from src.users.services import UsersService
+
+from . import users_cli_bp
+
+
+@users_cli_bp.cli.command("check_user_permissions")
+@click.option("--fix", is_flag=True, help="Rebuild permissions of drifted users")
+@with_appcontext
+def check_user_permissions(fix: bool):
+    """Compare user permissions with roles and rights, exit 1 on drift"""
+
+    user_service = UsersService(services=current_app.dependencies)
+    user_ids = user_service.check_user_permissions(fix=fix)
+
+    if not user_ids:
+        click.echo("User permissions are consistent.")
+        return
+
+    status = "fixed" if fix else "drifted"
+    click.echo(f"{len(user_ids)} users with {status} permissions:")
+    for user_id in user_ids:
+        click.echo(user_id)
+
+    if not fix:
+        raise SystemExit(1)
@@ -9,6 +9,16 @@ from src.users.models import User
 from src.users.services import UsersService
 
 
+def get_users_service() -> UsersService:
+    """UsersService is stateless, one instance is shared by all requests"""
+
+    if "users_service" not in current_app.extensions:
+        current_app.extensions["users_service"] = UsersService(
+            services=current_app.dependencies
+        )
+    return current_app.extensions["users_service"]
+
+
 def login_required(logger: Logger):
     def decorator(func: Callable):
         @wraps(func)
@@ -23,8 +33,7 @@ def login_required(logger: Logger):
                     if not sha_token:
                         return ResponseAPI.get_401_response("Invalid token")
 
-                    users_service = UsersService(services=current_app.dependencies)
-                    user = users_service.user_from_token(sha_token)
+                    user = get_users_service().user_from_token(sha_token)
 
                     if user:
                         g.token = sha_token
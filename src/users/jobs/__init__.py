@@ -0,0 +1,2 @@
+from .scheduled import *
+from .tasks import *
@@ -0,0 +1,9 @@
+from celery import Celery
+from src.settings import TOKEN_ACTIVITY_FLUSH_INTERVAL
+
+
+def schedule_tasks(app: Celery):
+    app.conf.beat_schedule["save-tokens-activity"] = {
+        "task": "src.users.jobs.tasks.save_tokens_activity",
+        "schedule": TOKEN_ACTIVITY_FLUSH_INTERVAL,
+    }
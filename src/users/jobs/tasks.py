@@ -0,0 +1,10 @@
+from celery import current_app, shared_task
+from src.users.services import UsersService
+
+
+@shared_task()
+def save_tokens_activity():
+    service = UsersService(services=current_app.dependencies)
+    nb_tokens = service.save_tokens_activity()
+
+    return nb_tokens
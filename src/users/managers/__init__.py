@@ -1,3 +1,5 @@
+from .access_token_manager import *
+from .auth_cache_manager import *
 from .group_manager import *
 from .invitation_manager import *
 from .request_change_manager import *
@@ -0,0 +1,46 @@
+from time import time
+
+from src.libs.dependencies import DependencyInjector
+from src.libs.security.utils import load_signed_payload, sign_payload
+from src.settings import ACCESS_TOKEN_VALIDITY, SECRET_KEY
+from src.users.models import Token, User
+from src.users.settings import APP_NAME
+
+
+class AccessTokenManager:
+    """
+    Short lived access tokens, signed with the secret key:
+    a user is authenticated by CPU only, without looking up its token.
+    They carry the id of the token they come from and their issue time,
+    to be revoked with it, and the user id only: the payload is readable.
+    """
+
+    prefix = "at."
+    secret = f"{SECRET_KEY}:{APP_NAME}:access_token"
+
+    def __init__(self, services: DependencyInjector) -> None:
+        self.services = services
+
+    def is_access_token(self, token: str) -> bool:
+        return token.startswith(self.prefix)
+
+    def create_access_token(self, token: Token, user: User) -> str:
+        payload = {
+            "tid": token.id,
+            "iat": time(),
+            "exp": int(time()) + ACCESS_TOKEN_VALIDITY,
+            "uid": user.id,
+        }
+        return self.prefix + sign_payload(payload, self.secret)
+
+    def get_claims(self, access_token: str) -> dict | None:
+        """Return claims of a well signed and not expired access token"""
+
+        if not self.is_access_token(access_token):
+            return None
+
+        claims = load_signed_payload(access_token.removeprefix(self.prefix), self.secret)
+        if not claims or claims["exp"] <= time():
+            return None
+
+        return claims
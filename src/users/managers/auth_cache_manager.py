@@ -0,0 +1,177 @@
+from datetime import datetime
+from hashlib import sha256
+from logging import getLogger
+from time import time
+
+from babel import Locale
+
+from src.libs.dependencies import DependencyInjector
+from src.settings import (
+    ACCESS_TOKEN_VALIDITY,
+    AUTH_CACHE_LOCAL_TTL,
+    AUTH_CACHE_TTL,
+    TOKEN_VALIDITY,
+)
+from src.users.models import Token, User
+from src.users.persistence import TokenDBPort, UserDBPort
+from src.users.settings import APP_NAME
+
+logger = getLogger(__name__)
+
+
+def user_to_data(user: User) -> dict:
+    """Public profile of a user, password hash excluded"""
+
+    return {
+        "id": user.id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "timezone": user.timezone,
+        "locale": str(user.locale),
+        "created_at": user.created_at.isoformat(),
+        "last_login_at": (
+            user.last_login_at.isoformat() if user.last_login_at else None
+        ),
+    }
+
+
+def user_from_data(data: dict) -> User:
+    return User(
+        id=data["id"],
+        first_name=data["first_name"],
+        last_name=data["last_name"],
+        email=data["email"],
+        timezone=data["timezone"],
+        locale=Locale.parse(data["locale"]),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        last_login_at=(
+            datetime.fromisoformat(data["last_login_at"])
+            if data["last_login_at"]
+            else None
+        ),
+    )
+
+
+class AuthCacheManager:
+    """
+    Cache users authenticated by a token, to skip database on each request.
+    Tokens are hashed in keys, password hashes are never cached.
+    Users of access tokens are cached by id, access tokens only carry it.
+    Signed access tokens can't be invalidated, they are revoked until they expire.
+    Reads fail open: if the cache is down, users are loaded from database.
+    """
+
+    def __init__(self, services: DependencyInjector) -> None:
+        self.services = services
+        self.user_db: UserDBPort = self.services.persistence.get_repository(
+            APP_NAME, "User"
+        )
+        self.token_db: TokenDBPort = self.services.persistence.get_repository(
+            APP_NAME, "Token"
+        )
+
+    def _get_key(self, sha_token: str) -> str:
+        return f"{APP_NAME}:auth:{sha256(sha_token.encode()).hexdigest()}"
+
+    def _get_user_key(self, user_id: str) -> str:
+        return f"{APP_NAME}:auth:user:{user_id}"
+
+    def _load_user(self, key: str) -> User | None:
+        try:
+            data = self.services.cache.get(key)
+        except Exception as e:
+            logger.warning(f"Auth cache unavailable: {e}")
+            return None
+
+        if data is None:
+            return None
+
+        user = user_from_data(data)
+        # Not cached: loaded from database only if it's needed
+        del user.hash_password
+        self.user_db.restore(user)
+
+        return user
+
+    def _save_user(self, key: str, user: User, ttl: int) -> None:
+        try:
+            self.services.cache.set(
+                key, user_to_data(user), ttl, local_ttl=AUTH_CACHE_LOCAL_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Auth cache unavailable: {e}")
+
+    def get_user(self, sha_token: str) -> User | None:
+        """Return a cached user for this token, None if not cached"""
+
+        return self._load_user(self._get_key(sha_token))
+
+    def set_user(self, sha_token: str, user: User) -> None:
+        """Cache a user just authenticated by an active token"""
+
+        # The token activity is refreshed on each cache miss,
+        # so it can't expire while cached
+        self._save_user(
+            self._get_key(sha_token), user, min(AUTH_CACHE_TTL, TOKEN_VALIDITY)
+        )
+
+    def get_user_by_id(self, user_id: str) -> User | None:
+        """Return a cached user of an access token, None if not cached"""
+
+        return self._load_user(self._get_user_key(user_id))
+
+    def set_user_by_id(self, user: User) -> None:
+        self._save_user(self._get_user_key(user.id), user, AUTH_CACHE_TTL)
+
+    def _get_revoked_key(self, token_id: str) -> str:
+        return f"{APP_NAME}:revoked:{token_id}"
+
+    def invalidate_tokens(self, *sha_tokens: str) -> None:
+        self.services.cache.delete(*[self._get_key(t) for t in sha_tokens])
+
+    def revoke_access_tokens(self, *token_ids: str) -> None:
+        """
+        Reject access tokens issued until now for these tokens,
+        the ones refreshed later are accepted.
+        """
+
+        revoked_at = time()
+        for token_id in token_ids:
+            self.services.cache.set(
+                self._get_revoked_key(token_id), revoked_at, ACCESS_TOKEN_VALIDITY
+            )
+
+    def is_access_token_revoked(self, token_id: str, issued_at: float) -> bool | None:
+        """None if it can't be known, the cache being unavailable"""
+
+        # Never cached in process memory: a revocation applies at once
+        try:
+            revoked_at = self.services.cache.get(self._get_revoked_key(token_id))
+        except Exception as e:
+            logger.warning(f"Auth cache unavailable: {e}")
+            return None
+
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def invalidate_tokens_after_commit(self, session, *tokens: Token) -> None:
+        """
+        Invalidate tokens and their access tokens once changes are committed,
+        a concurrent request could cache them again otherwise.
+        """
+
+        self.services.persistence.after_commit(
+            session, self.invalidate_tokens, *[token.sha_token for token in tokens]
+        )
+        self.services.persistence.after_commit(
+            session, self.revoke_access_tokens, *[token.id for token in tokens]
+        )
+
+    def invalidate_user(self, session, user_id: str) -> None:
+        """Invalidate all tokens of a user (eg: profile updated or deleted)"""
+
+        tokens = self.token_db.get_user_tokens(session, user_id)
+        self.invalidate_tokens_after_commit(session, *tokens)
+        self.services.persistence.after_commit(
+            session, self.services.cache.delete, self._get_user_key(user_id)
+        )
@@ -1,11 +1,28 @@
+from dataclasses import asdict
+from datetime import datetime
+
 from src.libs.dependencies import DependencyInjector
-from src.libs.hmi.querystring import Filter
+from src.libs.hmi.querystring import Filter, normalize_filters
 from src.libs.iam.constants import Permissions
+from src.settings import READ_CACHE_TTL
 from src.users.models import Group, Role
 from src.users.persistence import GroupDBPort, RoleDBPort
 from src.users.settings import APP_NAME
 
 
+def _dump_groups(groups: list[Group]) -> list[dict]:
+    return [
+        {**asdict(group), "created_at": group.created_at.isoformat()} for group in groups
+    ]
+
+
+def _load_groups(data: list[dict]) -> list[Group]:
+    return [
+        Group(**{**item, "created_at": datetime.fromisoformat(item["created_at"])})
+        for item in data
+    ]
+
+
 class GroupManager:
     def __init__(self, services: DependencyInjector) -> None:
         self.services = services
@@ -16,6 +33,16 @@ class GroupManager:
             APP_NAME, "Role"
         )
 
+    def _invalidate_members(self, session, group_id: str) -> None:
+        """Invalidate cached groups of all members, once changes are committed"""
+
+        roles = self.role_db.get_group_roles(session, group_id=group_id)
+        self.services.persistence.after_commit(
+            session,
+            self.services.cache.bump_versions,
+            *[role.user_id for role in roles],
+        )
+
     def get_group(self, session, user_id: str, group_id: str) -> Group | None:
         """Retrieve just a group if permission was given"""
 
@@ -42,6 +69,7 @@ class GroupManager:
             session, Permissions.UPDATE, user_id, group.id, resource="Group"
         ):
             self.group_db.save(session, group)
+            self._invalidate_members(session, group.id)
 
             return True
 
@@ -53,6 +81,7 @@ class GroupManager:
         if self.services.identity.can(
             session, Permissions.DELETE, user_id, group.id, resource="Group"
         ):
+            self._invalidate_members(session, group.id)
             self.group_db.delete(session, group)
 
             return True
@@ -77,8 +106,23 @@ class GroupManager:
     ) -> list[Group] | None:
         """Return all user associated groups"""
 
-        return self.group_db.get_all_user_groups(
-            session, user_id=user_id, filters=qs_filters
+        # Groups or roles changed in this session are not committed yet
+        if not self.services.persistence.can_cache(session):
+            return self.group_db.get_all_user_groups(
+                session, user_id=user_id, filters=qs_filters
+            )
+
+        # Cached until a role of the user or one of its groups changes
+        return self.services.cache.get_or_load(
+            f"{APP_NAME}:groups",
+            scopes=[user_id],
+            params=normalize_filters(qs_filters),
+            loader=lambda: self.group_db.get_all_user_groups(
+                session, user_id=user_id, filters=qs_filters
+            ),
+            ttl=READ_CACHE_TTL,
+            dump=_dump_groups,
+            load=_load_groups,
         )
 
     def create_group(self, session, group_name: str, is_private: bool = False) -> Group:
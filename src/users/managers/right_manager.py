@@ -1,9 +1,32 @@
+from dataclasses import asdict
+from datetime import datetime
+
 from src.libs.dependencies import DependencyInjector
-from src.libs.hmi.querystring import Filter
+from src.libs.hmi.querystring import Filter, normalize_filters
 from src.libs.iam.constants import Permissions
+from src.settings import READ_CACHE_TTL
 from src.users.models import Right, RoleType
-from src.users.persistence import RightDBPort
-from src.users.settings import APP_NAME
+from src.users.persistence import RightDBPort, RoleDBPort, UserPermissionDBPort
+from src.users.settings import APP_NAME, GLOBAL_CACHE_SCOPE
+
+
+def _dump_rights(rights: list[Right]) -> list[dict]:
+    return [
+        {**asdict(right), "created_at": right.created_at.isoformat()} for right in rights
+    ]
+
+
+def _load_rights(data: list[dict]) -> list[Right]:
+    return [
+        Right(
+            **{
+                **item,
+                "permissions": [Permissions(p) for p in item["permissions"]],
+                "created_at": datetime.fromisoformat(item["created_at"]),
+            }
+        )
+        for item in data
+    ]
 
 
 class RightManager:
@@ -12,6 +35,27 @@ class RightManager:
         self.right_db: RightDBPort = self.services.persistence.get_repository(
             APP_NAME, "Right"
         )
+        self.role_db: RoleDBPort = self.services.persistence.get_repository(
+            APP_NAME, "Role"
+        )
+        self.permission_db: UserPermissionDBPort = (
+            self.services.persistence.get_repository(APP_NAME, "UserPermission")
+        )
+
+    def _invalidate(self, session, group_id: str | None) -> None:
+        """
+        Invalidate cached roletypes, rights and permissions of the group members
+        (of everyone for global roletypes), once changes are committed.
+        """
+
+        scopes = [GLOBAL_CACHE_SCOPE]
+        if group_id:
+            roles = self.role_db.get_group_roles(session, group_id=group_id)
+            scopes = [group_id, *[role.user_id for role in roles]]
+
+        self.services.persistence.after_commit(
+            session, self.services.cache.bump_versions, *scopes
+        )
 
     def create_observer_rights(self, session, roletype_id: str) -> int:
         """Give reader rights on all resources for the given roletype (Admin)"""
@@ -31,6 +75,9 @@ class RightManager:
                 for res in self.services.identity.get_resources()
             ]
         )
+        self.permission_db.sync_roletype(session, roletype_id)
+        # Default roletypes are global
+        self._invalidate(session, None)
 
         return num_rights
 
@@ -38,6 +85,8 @@ class RightManager:
         """Remove all rights to a roletype"""
 
         self.right_db.delete_roletype_rights(session=session, roletype_id=roletype_id)
+        self.permission_db.sync_roletype(session, roletype_id)
+        self._invalidate(session, None)
 
     def create_admin_rights(self, session, roletype_id: str) -> int:
         """Give all rights on all resources for the given roletype (Admin)"""
@@ -55,6 +104,9 @@ class RightManager:
                 for res in self.services.identity.get_resources()
             ]
         )
+        self.permission_db.sync_roletype(session, roletype_id)
+        # Default roletypes are global
+        self._invalidate(session, None)
 
         return num_rights
 
@@ -82,6 +134,9 @@ class RightManager:
         )
 
         self.right_db.save(session, right)
+        self.permission_db.sync_roletype(session, roletype_id)
+        # The roletype group is unknown here
+        self._invalidate(session, None)
 
         return right
 
@@ -99,6 +154,8 @@ class RightManager:
             exception=True,
         ):
             self.right_db.save(session, right)
+            self.permission_db.sync_roletype(session, right.roletype_id)
+            self._invalidate(session, group_id)
 
             return right
 
@@ -122,8 +179,24 @@ class RightManager:
         group_ids = self.services.identity.all_tenants_with_access(
             session, Permissions.READ, user_id=user_id, resource="RoleType"
         )
-        return self.right_db.get_all_user_rights(
-            session, group_ids=group_ids, filters=qs_filters
+
+        # Rights changed in this session are not committed yet
+        if not self.services.persistence.can_cache(session):
+            return self.right_db.get_all_user_rights(
+                session, group_ids=group_ids, filters=qs_filters
+            )
+
+        # Cached until a right of these groups (or a global one) changes
+        return self.services.cache.get_or_load(
+            f"{APP_NAME}:rights",
+            scopes=[*group_ids, GLOBAL_CACHE_SCOPE],
+            params=normalize_filters(qs_filters),
+            loader=lambda: self.right_db.get_all_user_rights(
+                session, group_ids=group_ids, filters=qs_filters
+            ),
+            ttl=READ_CACHE_TTL,
+            dump=_dump_rights,
+            load=_load_rights,
         )
 
     def update_right(
@@ -144,6 +217,8 @@ class RightManager:
             )
         ):
             self.right_db.save(session, right)
+            self.permission_db.sync_roletype(session, roletype.id)
+            self._invalidate(session, roletype.group_id)
 
             return True
 
@@ -167,6 +242,8 @@ class RightManager:
             )
         ):
             self.right_db.delete(session, right)
+            self.permission_db.sync_roletype(session, roletype.id)
+            self._invalidate(session, roletype.group_id)
 
             return True
 
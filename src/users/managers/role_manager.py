@@ -2,7 +2,7 @@ from src.libs.dependencies import DependencyInjector
 from src.libs.hmi.querystring import Filter
 from src.libs.iam.constants import Permissions
 from src.users.models import Role
-from src.users.persistence import RoleDBPort
+from src.users.persistence import RoleDBPort, UserPermissionDBPort
 from src.users.settings import APP_NAME
 
 # TODO:
@@ -21,6 +21,16 @@ class RoleManager:
         self.role_db: RoleDBPort = self.services.persistence.get_repository(
             APP_NAME, "Role"
         )
+        self.permission_db: UserPermissionDBPort = (
+            self.services.persistence.get_repository(APP_NAME, "UserPermission")
+        )
+
+    def _invalidate(self, session, role: Role) -> None:
+        """Invalidate cached groups of the role user, once changes are committed"""
+
+        self.services.persistence.after_commit(
+            session, self.services.cache.bump_versions, role.user_id
+        )
 
     def create_role(self, session, user_id: str, role: Role) -> Role | None:
         """Add a role with permission controls"""
@@ -34,6 +44,8 @@ class RoleManager:
             exception=True,
         ):
             self.role_db.save(session, role)
+            self.permission_db.sync_users(session, [role.user_id])
+            self._invalidate(session, role)
 
             return role
 
@@ -54,6 +66,8 @@ class RoleManager:
         )
 
         self.role_db.save(session, role)
+        self.permission_db.sync_users(session, [role.user_id])
+        self._invalidate(session, role)
 
         return role
 
@@ -106,6 +120,8 @@ class RoleManager:
             resource="Role",
         ):
             self.role_db.save(session, role)
+            self.permission_db.sync_users(session, [role.user_id])
+            self._invalidate(session, role)
 
             return True
 
@@ -123,7 +139,25 @@ class RoleManager:
             resource="Role",
         ):
             self.role_db.delete(session, role)
+            self.permission_db.sync_users(session, [role.user_id])
+            self._invalidate(session, role)
 
             return True
 
         return False
+
+    def check_permissions(self, session, fix: bool = False) -> list[str]:
+        """
+        Return users whose denormalized permissions drifted from their roles,
+        rebuild them if fix.
+        """
+
+        user_ids = self.permission_db.get_drifted_users(session)
+
+        if fix and user_ids:
+            self.permission_db.sync_users(session, user_ids)
+            self.services.persistence.after_commit(
+                session, self.services.cache.bump_versions, *user_ids
+            )
+
+        return user_ids
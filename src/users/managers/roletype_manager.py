@@ -1,9 +1,27 @@
+from dataclasses import asdict
+from datetime import datetime
+
 from src.libs.dependencies import DependencyInjector
-from src.libs.hmi.querystring import Filter
+from src.libs.hmi.querystring import Filter, normalize_filters
 from src.libs.iam.constants import Permissions
+from src.settings import READ_CACHE_TTL
 from src.users.models import RoleType
-from src.users.persistence import RoleTypeDBPort
-from src.users.settings import APP_NAME
+from src.users.persistence import RoleDBPort, RoleTypeDBPort, UserPermissionDBPort
+from src.users.settings import APP_NAME, GLOBAL_CACHE_SCOPE
+
+
+def _dump_roletypes(roletypes: list[RoleType]) -> list[dict]:
+    return [
+        {**asdict(roletype), "created_at": roletype.created_at.isoformat()}
+        for roletype in roletypes
+    ]
+
+
+def _load_roletypes(data: list[dict]) -> list[RoleType]:
+    return [
+        RoleType(**{**item, "created_at": datetime.fromisoformat(item["created_at"])})
+        for item in data
+    ]
 
 
 class RoleTypeManager:
@@ -12,6 +30,27 @@ class RoleTypeManager:
         self.roletype_db: RoleTypeDBPort = self.services.persistence.get_repository(
             APP_NAME, "RoleType"
         )
+        self.role_db: RoleDBPort = self.services.persistence.get_repository(
+            APP_NAME, "Role"
+        )
+        self.permission_db: UserPermissionDBPort = (
+            self.services.persistence.get_repository(APP_NAME, "UserPermission")
+        )
+
+    def _invalidate(self, session, group_id: str | None) -> None:
+        """
+        Invalidate cached roletypes, rights and permissions of the group members
+        (of everyone for global roletypes), once changes are committed.
+        """
+
+        scopes = [GLOBAL_CACHE_SCOPE]
+        if group_id:
+            roles = self.role_db.get_group_roles(session, group_id=group_id)
+            scopes = [group_id, *[role.user_id for role in roles]]
+
+        self.services.persistence.after_commit(
+            session, self.services.cache.bump_versions, *scopes
+        )
 
     def get_default_observer(self, session) -> tuple[RoleType, bool]:
         """Looking for a default roletype named: Observer"""
@@ -20,6 +59,8 @@ class RoleTypeManager:
         roletype, created = self.roletype_db.get_or_create(
             session=session, roletype=observer_roletype
         )
+        if created:
+            self._invalidate(session, roletype.group_id)
 
         return roletype, created
 
@@ -31,6 +72,8 @@ class RoleTypeManager:
         roletype, created = self.roletype_db.get_or_create(
             session=session, roletype=admin_roletype
         )
+        if created:
+            self._invalidate(session, roletype.group_id)
 
         return roletype, created
 
@@ -44,6 +87,8 @@ class RoleTypeManager:
         roletype, created = self.roletype_db.get_or_create(
             session=session, roletype=roletype
         )
+        if created:
+            self._invalidate(session, roletype.group_id)
 
         return roletype, created
 
@@ -69,12 +114,25 @@ class RoleTypeManager:
             session, Permissions.READ, user_id=user_id, resource="RoleType"
         )
 
-        roletypes = self.roletype_db.get_all_user_roletypes(
-            session, group_ids=group_ids, filters=qs_filters
+        # Roletypes changed in this session are not committed yet
+        if not self.services.persistence.can_cache(session):
+            return self.roletype_db.get_all_user_roletypes(
+                session, group_ids=group_ids, filters=qs_filters
+            )
+
+        # Cached until a roletype of these groups (or a global one) changes
+        return self.services.cache.get_or_load(
+            f"{APP_NAME}:roletypes",
+            scopes=[*group_ids, GLOBAL_CACHE_SCOPE],
+            params=normalize_filters(qs_filters),
+            loader=lambda: self.roletype_db.get_all_user_roletypes(
+                session, group_ids=group_ids, filters=qs_filters
+            ),
+            ttl=READ_CACHE_TTL,
+            dump=_dump_roletypes,
+            load=_load_roletypes,
         )
 
-        return roletypes
-
     def update_roletype(self, session, user_id: str, roletype: RoleType) -> bool:
         """Update a roletype if update permission was given"""
 
@@ -87,6 +145,7 @@ class RoleTypeManager:
             resource="RoleType",
         ):
             self.roletype_db.save(session, roletype)
+            self._invalidate(session, roletype.group_id)
 
             return True
 
@@ -103,7 +162,17 @@ class RoleTypeManager:
             roletype.group_id,
             resource="RoleType",
         ):
+            # Before roles of this roletype are deleted (cascade)
+            self._invalidate(session, roletype.group_id)
+            user_ids = [
+                role.user_id
+                for role in self.role_db.get_group_roles(
+                    session, group_id=roletype.group_id
+                )
+                if role.roletype_id == roletype.id
+            ]
             self.roletype_db.delete(session, roletype)
+            self.permission_db.sync_users(session, user_ids)
 
             return True
 
@@ -1,10 +1,19 @@
+from datetime import datetime
+from logging import getLogger
+from zoneinfo import ZoneInfo
+
 from src.libs.dependencies import DependencyInjector
+from src.settings import TOKEN_ACTIVITY_GRANULARITY
 from src.users.models import Token
 from src.users.persistence import TokenDBPort
 from src.users.settings import APP_NAME
 
+logger = getLogger(__name__)
+
 
 class TokenManager:
+    activity_key = f"{APP_NAME}:tokens_activity"
+
     def __init__(self, services: DependencyInjector) -> None:
         self.services = services
         self.token_db: TokenDBPort = self.services.persistence.get_repository(
@@ -24,9 +33,78 @@ class TokenManager:
 
         return self.token_db.get_token(session=session, sha_token=sha_token)
 
+    def load_token(self, session, token_id: str) -> Token | None:
+        """Retrieve a token from its id"""
+
+        return self.token_db.load(session=session, id=token_id)
+
+    def get_pending_activity(self, token: Token) -> datetime | None:
+        """Return the last activity not yet saved in persistence"""
+
+        try:
+            timestamp = self.services.cache.get_score(self.activity_key, token.id)
+        except Exception as e:
+            logger.warning(f"Tokens activity cache unavailable: {e}")
+            return None
+
+        if timestamp is None:
+            return None
+
+        return datetime.fromtimestamp(timestamp, tz=ZoneInfo("UTC"))
+
+    def touch_token(
+        self, token: Token, last_activity_at: datetime, session=None
+    ) -> bool:
+        """
+        Record an activity to be saved later by save_pending_activities,
+        only if the last one is older than TOKEN_ACTIVITY_GRANULARITY.
+        If the cache is unavailable, it's saved at once with the session (if any).
+        """
+
+        now = datetime.now(tz=ZoneInfo("UTC"))
+        if (now - last_activity_at).total_seconds() < TOKEN_ACTIVITY_GRANULARITY:
+            return False
+
+        try:
+            self.services.cache.set_max_score(
+                self.activity_key, token.id, now.timestamp()
+            )
+        except Exception as e:
+            logger.warning(f"Tokens activity cache unavailable: {e}")
+            if session is None:
+                return False
+            self.token_db.activity_update(session=session, token=token)
+
+        return True
+
+    def save_pending_activities(self, session) -> int:
+        """
+        Save all recorded activities at once, they are removed from the cache
+        once committed: activities of a failed save are saved by the next one.
+        """
+
+        scores = self.services.cache.get_scores(self.activity_key)
+        if not scores:
+            return 0
+
+        activities = {
+            token_id: datetime.fromtimestamp(timestamp, tz=ZoneInfo("UTC"))
+            for token_id, timestamp in scores.items()
+        }
+        self.token_db.bulk_activity_update(session=session, activities=activities)
+        self.services.persistence.after_commit(
+            session, self.services.cache.remove_scores, self.activity_key, scores
+        )
+
+        return len(activities)
+
     def clean_expired(self, session) -> None:
-        """Clean all expired tokens from persistence"""
+        """
+        Clean all expired tokens from persistence,
+        pending activities are saved first to keep tokens still in use.
+        """
 
+        self.save_pending_activities(session)
         return self.token_db.clean_expired(session=session)
 
     def update_token(self, session, token: Token) -> bool:
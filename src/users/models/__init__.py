@@ -8,3 +8,4 @@ from .user import User
 from .role_type import RoleType
 from .invitation import Invitation
 from .role import Role
+from .user_permission import UserPermission
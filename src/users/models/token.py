@@ -35,12 +35,20 @@ class Token:
         delta: timedelta = datetime.now(tz=ZoneInfo("UTC")) - self.created_at
         return self.temp and 0 <= delta.total_seconds() < TOKEN_TEMP_VALIDITY
 
-    def is_valid(self) -> bool:
+    def get_last_activity(self, pending_activity_at: datetime | None = None) -> datetime:
+        """Last activity, including an activity not yet saved"""
+
+        if pending_activity_at and pending_activity_at > self.last_activity_at:
+            return pending_activity_at
+        return self.last_activity_at
+
+    def is_valid(self, pending_activity_at: datetime | None = None) -> bool:
         """
         A Token is valid only if it's last activity is under TOKEN_VALIDITY from now
         and if is not temp
         """
-        delta: timedelta = datetime.now(tz=ZoneInfo("UTC")) - self.last_activity_at
+        last_activity_at = self.get_last_activity(pending_activity_at)
+        delta: timedelta = datetime.now(tz=ZoneInfo("UTC")) - last_activity_at
         return not self.temp and 0 <= delta.total_seconds() < TOKEN_VALIDITY
 
     def get_validity_limit(self) -> datetime:
@@ -4,7 +4,12 @@ from zoneinfo import ZoneInfo
 
 from babel import Locale
 
-from src.libs.security.utils import check_password, get_id, hash_from_password
+from src.libs.security.utils import (
+    check_password,
+    get_id,
+    hash_from_password,
+    password_needs_rehash,
+)
 from src.libs.security.validators import PasswordChecker, get_valid_email
 from src.settings import LOCALE, TIMEZONE, UNUSED_ACCOUNT_DELAY
 
@@ -46,6 +51,14 @@ class User:
             return check_password(self.hash_password, password)
         return False
 
+    def rehash_password(self, password: str) -> bool:
+        """Hash again a checked password if hashing parameters have changed"""
+
+        if self.hash_password and password_needs_rehash(self.hash_password):
+            self.hash_password = hash_from_password(password)
+            return True
+        return False
+
     def _check_password_complexity(self, password: str) -> bool:
         password_checker = PasswordChecker()
         password_checker.check_complexity(password)
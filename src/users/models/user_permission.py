@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class UserPermission:
+    """
+    Permissions (bitmask) of a user on a resource of a group,
+    derived from roles and rights: never edited directly.
+    """
+
+    user_id: str
+    tenant_id: str
+    resource: str
+    permissions: int = 0
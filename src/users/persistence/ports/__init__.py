@@ -5,4 +5,5 @@ from .right_port import RightDBPort
 from .role_port import RoleDBPort
 from .roletype_port import RoleTypeDBPort
 from .token_port import TokenDBPort
+from .user_permission_port import UserPermissionDBPort
 from .user_port import UserDBPort
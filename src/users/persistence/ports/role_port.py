@@ -29,3 +29,9 @@ class RoleDBPort(AbstractDBPort, ABC):
     @abstractmethod
     def get_group_roles(self, session, group_id: str) -> list[Role]:
         raise NotImplementedError()
+
+    @abstractmethod
+    def get_user_permissions(self, session, user_id: str) -> dict[str, dict[str, int]]:
+        """All permissions of a user, as resource -> group id -> permissions bitmask"""
+
+        raise NotImplementedError()
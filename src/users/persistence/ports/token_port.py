@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from src.ports import AbstractDBPort
 from src.users.models import Token
@@ -9,10 +10,18 @@ class TokenDBPort(AbstractDBPort, ABC):
     def get_token(self, session, sha_token: str) -> Token:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_user_tokens(self, session, user_id: str) -> list[Token]:
+        raise NotImplementedError()
+
     @abstractmethod
     def activity_update(self, session, token: str) -> Token:
         raise NotImplementedError()
 
+    @abstractmethod
+    def bulk_activity_update(self, session, activities: dict[str, datetime]) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     def clean_expired(self, session) -> None:
         raise NotImplementedError()
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+
+from src.ports import AbstractDBPort
+
+
+class UserPermissionDBPort(AbstractDBPort, ABC):
+    @abstractmethod
+    def sync_users(self, session, user_ids: list[str]) -> None:
+        """Rebuild all permissions of these users from their roles"""
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    def sync_roletype(self, session, roletype_id: str) -> None:
+        """Rebuild permissions given by a roletype, after a change of its rights"""
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_drifted_users(self, session) -> list[str]:
+        """Ids of users whose permissions differ from their roles and rights"""
+
+        raise NotImplementedError()
@@ -5,4 +5,5 @@ from .rights import RightDB
 from .role import RoleDB
 from .roletypes import RoleTypeDB
 from .tokens import TokenDB
+from .user_permissions import UserPermissionDB
 from .users import UserDB
@@ -3,9 +3,12 @@ from sqlalchemy.orm import Session
 from src.libs.hmi.querystring import Filter
 from src.libs.iam.constants import Permissions
 from src.libs.sqlalchemy.default_adapter import DefaultDB
-from src.users.models import Group, Right, Role, RoleType
+from src.users.models import Group, UserPermission
 from src.users.persistence.ports import GroupDBPort
-from src.users.persistence.sqlalchemy.querysets import GroupQueryset
+from src.users.persistence.sqlalchemy.querysets import (
+    GroupQueryset,
+    UserPermissionQueryset,
+)
 
 
 class GroupDB(GroupDBPort, DefaultDB):
@@ -14,10 +17,12 @@ class GroupDB(GroupDBPort, DefaultDB):
         self.qs = GroupQueryset()
 
     def update(self, session: Session, group: Group) -> bool:
-        self.qs.update().id(group.id).values(
-            name=group.name, description=group.description
+        qs = (
+            self.qs.update()
+            .id(group.id)
+            .values(name=group.name, description=group.description)
         )
-        session.execute(self.qs.statement)
+        session.execute(qs.statement, qs.params)
 
     def accessibles_by_user_with_permission(
         self,
@@ -26,28 +31,27 @@ class GroupDB(GroupDBPort, DefaultDB):
         user_id: str,
         resource: str,
     ) -> list[str] | None:
-        self.qs.select(Group.id).join(Group.roles).join(Role.roletype).join(
-            RoleType.rights
-        ).where(
-            Role.user_id == user_id,
-            Right.resource == resource,
-            Right.permissions.bitwise_and(permission) > 0,
+        qs = (
+            UserPermissionQueryset()
+            .select(UserPermission.tenant_id)
+            .granted(user_id=user_id, resource=resource, permission=permission)
         )
 
-        return [r[0] for r in session.execute(self.qs.statement)]
+        return [r[0] for r in session.execute(qs.statement, qs.params)]
 
     def get_initial_user_group(
         self,
         session: Session,
         user_id: str,
     ) -> Group | None:
-        self.qs.select().join(Group.roles).join(Role.roletype).where(
-            Role.user_id == user_id,
-            RoleType.name == "Admin",
-            Group.is_private == True,  # noqa: E712
-        ).order_by(created_at="ASC").limit(1)
+        qs = (
+            self.qs.select()
+            .initial_user_group(user_id)
+            .order_by(created_at="ASC")
+            .limit(1)
+        )
 
-        group = session.scalars(self.qs.statement).one_or_none()
+        group = session.scalars(qs.statement, qs.params).one_or_none()
         return group
 
     def get_all_user_groups(
@@ -56,9 +60,7 @@ class GroupDB(GroupDBPort, DefaultDB):
         user_id: str,
         filters: list[Filter] | None = None,
     ) -> list[Group] | None:
-        self.qs.select().from_filters(filters).join(Group.roles).where(
-            Role.user_id == user_id,
-        )
+        qs = self.qs.select().from_filters(filters).user_groups(user_id)
 
-        groups = session.scalars(self.qs.statement).all()
+        groups = session.scalars(qs.statement, qs.params).all()
         return groups
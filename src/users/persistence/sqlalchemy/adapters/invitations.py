@@ -12,15 +12,15 @@ class InvitationDB(InvitationDBPort, DefaultDB):
         self.qs = InvitationQueryset()
 
     def clean_expired(self, session: Session):
-        self.qs.delete().expired()
-        session.execute(self.qs.statement)
+        qs = self.qs.delete().expired()
+        session.execute(qs.statement, qs.params)
 
     def get_from_hash(self, session, hash: str) -> Invitation | None:
-        self.qs.select().where(Invitation.hash == hash)
-        invitation = session.scalars(self.qs.statement).one_or_none()
+        qs = self.qs.select().filter_by(hash=hash)
+        invitation = session.scalars(qs.statement, qs.params).one_or_none()
         return invitation
 
     def get_from_group(self, session, group_id: str) -> list[Invitation]:
-        self.qs.select().where(Invitation.in_group_id == group_id)
-        invitations = session.scalars(self.qs.statement).all()
+        qs = self.qs.select().filter_by(in_group_id=group_id)
+        invitations = session.scalars(qs.statement, qs.params).all()
         return invitations
@@ -12,18 +12,22 @@ class RequestChangeDB(RequestChangeDBPort, DefaultDB):
         self.qs = RequestChangeQueryset()
 
     def update(self, session, request_change: RequestChange) -> None:
-        self.qs.update().id(request_change.id).values(
-            code=request_change.code,
+        qs = (
+            self.qs.update()
+            .id(request_change.id)
+            .values(
+                code=request_change.code,
+            )
         )
-        session.execute(self.qs.statement)
+        session.execute(qs.statement, qs.params)
 
     def find_request(
         self, session: Session, email: str, request_type: RequestType
     ) -> RequestChange | None:
-        self.qs.select().valid_for(email, request_type).last()
-        result = session.scalars(self.qs.statement).one_or_none()
+        qs = self.qs.select().valid_for(email, request_type).last()
+        result = session.scalars(qs.statement, qs.params).one_or_none()
         return result
 
     def clean_history(self, session: Session):
-        self.qs.delete().expired()
-        session.execute(self.qs.statement)
+        qs = self.qs.delete().expired()
+        session.execute(qs.statement, qs.params)
@@ -18,22 +18,26 @@ class RightDB(RightDBPort, DefaultDB):
         group_ids: list[str],
         filters: list[Filter] | None = None,
     ) -> list[Right]:
-        self.qs.select().from_filters(filters).both_user_have_and_user_can_use(
-            group_ids=group_ids
+        qs = (
+            self.qs.select()
+            .from_filters(filters)
+            .both_user_have_and_user_can_use(group_ids=group_ids)
         )
 
-        return session.scalars(self.qs.statement).all()
+        return session.scalars(qs.statement, qs.params).all()
 
     def get_a_user_right(
         self, session: Session, user_id: str, right_id: str, group_ids: list[str]
     ) -> Right | None:
-        self.qs.select().both_user_have_and_user_can_use(group_ids=group_ids).id(
-            right_id
+        qs = (
+            self.qs.select()
+            .both_user_have_and_user_can_use(group_ids=group_ids)
+            .id(right_id)
         )
 
-        return session.scalars(self.qs.statement).one_or_none()
+        return session.scalars(qs.statement, qs.params).one_or_none()
 
     def delete_roletype_rights(self, session: Session, roletype_id: str) -> None:
-        self.qs.delete().all_roletype_rights(roletype_id)
+        qs = self.qs.delete().all_roletype_rights(roletype_id)
 
-        session.execute(self.qs.statement)
+        session.execute(qs.statement, qs.params)
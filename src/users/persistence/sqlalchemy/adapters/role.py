@@ -2,28 +2,43 @@ from sqlalchemy.orm import Session
 
 from src.libs.hmi.querystring import Filter
 from src.libs.sqlalchemy.default_adapter import DefaultDB
-from src.users.models import Role
+from src.users.models import Role, UserPermission
 from src.users.persistence.ports import RoleDBPort
-from src.users.persistence.sqlalchemy.querysets import RoleQueryset
+from src.users.persistence.sqlalchemy.querysets import (
+    RoleQueryset,
+    UserPermissionQueryset,
+)
 
 
 class RoleDB(RoleDBPort, DefaultDB):
     def __init__(self) -> None:
         super().__init__()
         self.qs = RoleQueryset()
+        # Built once: run on each permissions map (re)load
+        self._user_permissions_qs = (
+            UserPermissionQueryset()
+            .select(
+                UserPermission.tenant_id,
+                UserPermission.resource,
+                UserPermission.permissions,
+            )
+            .user(user_id="")
+        )
 
     def update(self, session: Session, role: Role) -> bool:
-        self.qs.update().id(role.id).values(roletype_id=role.roletype_id)
-        session.execute(self.qs.statement)
+        qs = self.qs.update().id(role.id).values(roletype_id=role.roletype_id)
+        session.execute(qs.statement, qs.params)
 
     def get_a_user_role(
         self, session: Session, user_id: str, role_id: str, group_ids: list[str]
     ) -> Role | None:
-        self.qs.select().both_is_mine_and_is_under_my_control(
-            user_id=user_id, group_ids=group_ids
-        ).id(role_id)
+        qs = (
+            self.qs.select()
+            .both_is_mine_and_is_under_my_control(user_id=user_id, group_ids=group_ids)
+            .id(role_id)
+        )
 
-        return session.scalars(self.qs.statement).one_or_none()
+        return session.scalars(qs.statement, qs.params).one_or_none()
 
     def get_all_user_roles(
         self,
@@ -32,17 +47,29 @@ class RoleDB(RoleDBPort, DefaultDB):
         group_ids: list[str],
         filters: list[Filter] | None = None,
     ) -> list[Role]:
-        (
+        qs = (
             self.qs.select()
             .from_filters(filters)
             .both_is_mine_and_is_under_my_control(user_id=user_id, group_ids=group_ids)
         )
 
-        roles = session.scalars(self.qs.statement).all()
+        roles = session.scalars(qs.statement, qs.params).all()
         return roles
 
     def get_group_roles(self, session: Session, group_id: str) -> list[Role]:
-        self.qs.select().group_roles(group_id)
+        qs = self.qs.select().group_roles(group_id)
 
-        roles = session.scalars(self.qs.statement).all()
+        roles = session.scalars(qs.statement, qs.params).all()
         return roles
+
+    def get_user_permissions(
+        self, session: Session, user_id: str
+    ) -> dict[str, dict[str, int]]:
+        qs = self._user_permissions_qs
+        params = qs.bind(user_id=user_id)
+
+        permissions_map = {}
+        for tenant_id, resource, permissions in session.execute(qs.statement, params):
+            permissions_map.setdefault(resource, {})[tenant_id] = permissions
+
+        return permissions_map
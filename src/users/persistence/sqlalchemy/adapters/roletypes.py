@@ -15,10 +15,8 @@ class RoleTypeDB(RoleTypeDBPort, DefaultDB):
     def get_or_create(
         self, session: Session, roletype: RoleType
     ) -> tuple[RoleType, bool]:
-        self.qs.select().where(
-            RoleType.name == roletype.name, RoleType.group_id == roletype.group_id
-        )
-        roletype_from_db = session.scalars(self.qs.statement).one_or_none()
+        qs = self.qs.select().filter_by(name=roletype.name, group_id=roletype.group_id)
+        roletype_from_db = session.scalars(qs.statement, qs.params).one_or_none()
 
         created = False
         if not roletype_from_db:
@@ -31,9 +29,9 @@ class RoleTypeDB(RoleTypeDBPort, DefaultDB):
     def get_a_user_roletype(
         self, session: Session, roletype_id: str, group_ids: list[str]
     ) -> RoleType:
-        self.qs.select().user_can_use(group_ids=group_ids).id(roletype_id)
+        qs = self.qs.select().user_can_use(group_ids=group_ids).id(roletype_id)
 
-        return session.scalars(self.qs.statement).one_or_none()
+        return session.scalars(qs.statement, qs.params).one_or_none()
 
     def get_all_user_roletypes(
         self,
@@ -41,6 +39,6 @@ class RoleTypeDB(RoleTypeDBPort, DefaultDB):
         group_ids: list[str],
         filters: list[Filter] | None = None,
     ) -> list[RoleType]:
-        self.qs.select().from_filters(filters).user_can_use(group_ids=group_ids)
+        qs = self.qs.select().from_filters(filters).user_can_use(group_ids=group_ids)
 
-        return session.scalars(self.qs.statement).all()
+        return session.scalars(qs.statement, qs.params).all()
@@ -1,27 +1,70 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, column, update, values
 from sqlalchemy.orm import Session
 
 from src.libs.sqlalchemy.default_adapter import DefaultDB
+from src.libs.sqlalchemy.settings import DB_BULK_CHUNK_SIZE
 from src.users.models import Token
 from src.users.persistence.ports import TokenDBPort
 from src.users.persistence.sqlalchemy.querysets import TokenQueryset
+from src.users.persistence.sqlalchemy.tables import token_table
 
 
 class TokenDB(TokenDBPort, DefaultDB):
     def __init__(self) -> None:
         super().__init__()
         self.qs = TokenQueryset()
+        # Built once: run on each authenticated request
+        self._by_sha_qs = self.qs.select().by_sha("")
 
     def get_token(self, session: Session, sha_token: str) -> Token | None:
-        self.qs.select().by_sha(sha_token)
-        result = session.scalars(self.qs.statement).one_or_none()
+        qs = self._by_sha_qs
+        result = session.scalars(qs.statement, qs.bind(sha_token=sha_token))
+        result = result.one_or_none()
         return result
 
+    def get_user_tokens(self, session: Session, user_id: str) -> list[Token]:
+        qs = self.qs.select().by_user(user_id)
+        return session.scalars(qs.statement, qs.params).all()
+
     def activity_update(self, session: Session, token: Token):
-        self.qs.update().id(token.id).values(
-            last_activity_at=token.update_last_activity()
+        qs = (
+            self.qs.update()
+            .id(token.id)
+            .values(last_activity_at=token.update_last_activity())
         )
-        session.execute(self.qs.statement)
+        session.execute(qs.statement, qs.params)
+
+    def bulk_activity_update(
+        self,
+        session: Session,
+        activities: dict[str, datetime],
+        chunk_size: int = DB_BULK_CHUNK_SIZE,
+    ) -> None:
+        """
+        Save many tokens activity with one UPDATE ... FROM (VALUES ...) per chunk,
+        an activity never replaces a more recent one.
+        """
+
+        rows = list(activities.items())
+        for start in range(0, len(rows), chunk_size):
+            end = start + chunk_size
+            activity_values = values(
+                column("id", String),
+                column("last_activity_at", DateTime(timezone=True)),
+                name="activities",
+            ).data(rows[start:end])
+
+            session.execute(
+                update(token_table)
+                .where(
+                    token_table.c.id == activity_values.c.id,
+                    token_table.c.last_activity_at < activity_values.c.last_activity_at,
+                )
+                .values(last_activity_at=activity_values.c.last_activity_at)
+            )
 
     def clean_expired(self, session: Session):
-        self.qs.delete().expired()
-        session.execute(self.qs.statement)
+        qs = self.qs.delete().expired()
+        session.execute(qs.statement, qs.params)
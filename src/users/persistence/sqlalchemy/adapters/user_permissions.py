@@ -0,0 +1,96 @@
+from sqlalchemy import ColumnElement, delete, except_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.libs.sqlalchemy.default_adapter import DefaultDB
+from src.users.persistence.ports import UserPermissionDBPort
+from src.users.persistence.sqlalchemy.querysets import UserPermissionQueryset
+from src.users.persistence.sqlalchemy.tables import (
+    right_table,
+    role_table,
+    user_permission_table,
+)
+
+
+class UserPermissionDB(UserPermissionDBPort, DefaultDB):
+    """
+    Rows are derived from roles and rights, managers resync them in the
+    transaction changing a role or a right. Rows of deleted users or groups
+    are deleted by foreign keys.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.qs = UserPermissionQueryset()
+
+    def _granted(self, roles_clause: ColumnElement | None = None):
+        """Permissions given by rights to the roles matching roles_clause"""
+
+        statement = select(
+            role_table.c.user_id,
+            role_table.c.group_id,
+            right_table.c.resource,
+            right_table.c.permissions,
+        ).join(right_table, right_table.c.roletype_id == role_table.c.roletype_id)
+        if roles_clause is not None:
+            statement = statement.where(roles_clause)
+
+        return statement
+
+    def _rebuild(
+        self, session: Session, rows_clause: ColumnElement, roles_clause: ColumnElement
+    ) -> None:
+        # Pending roles and rights must be in database before reading them
+        session.flush()
+        session.execute(delete(user_permission_table).where(rows_clause))
+
+        statement = insert(user_permission_table).from_select(
+            ["user_id", "tenant_id", "resource", "permissions"],
+            self._granted(roles_clause),
+        )
+        # Concurrent rebuilds of the same rows keep the last permissions
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id", "resource", "tenant_id"],
+                set_={"permissions": statement.excluded.permissions},
+            )
+        )
+
+    def sync_users(self, session: Session, user_ids: list[str]) -> None:
+        if not user_ids:
+            return
+
+        self._rebuild(
+            session,
+            user_permission_table.c.user_id.in_(user_ids),
+            role_table.c.user_id.in_(user_ids),
+        )
+
+    def sync_roletype(self, session: Session, roletype_id: str) -> None:
+        # A user has one role by group: (user, group) pairs of a roletype
+        # only get their permissions from this roletype
+        pairs = select(role_table.c.user_id, role_table.c.group_id).where(
+            role_table.c.roletype_id == roletype_id
+        )
+
+        self._rebuild(
+            session,
+            tuple_(
+                user_permission_table.c.user_id, user_permission_table.c.tenant_id
+            ).in_(pairs),
+            role_table.c.roletype_id == roletype_id,
+        )
+
+    def get_drifted_users(self, session: Session) -> list[str]:
+        expected = self._granted()
+        actual = select(
+            user_permission_table.c.user_id,
+            user_permission_table.c.tenant_id,
+            user_permission_table.c.resource,
+            user_permission_table.c.permissions,
+        )
+        missing = except_(expected, actual).subquery()
+        unexpected = except_(actual, expected).subquery()
+
+        statement = select(missing.c.user_id).union(select(unexpected.c.user_id))
+        return sorted(session.scalars(statement).all())
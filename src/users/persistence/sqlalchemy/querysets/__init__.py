@@ -5,4 +5,5 @@ from .rights import *
 from .roles import *
 from .roletypes import *
 from .tokens import *
+from .user_permissions import *
 from .users import *
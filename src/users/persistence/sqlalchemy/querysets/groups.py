@@ -1,7 +1,31 @@
+from typing import Self
+
 from src.libs.sqlalchemy.queryset import Queryset
-from src.users.models import Group
+from src.users.models import Group, Role, RoleType
 
 
 class GroupQueryset(Queryset):
     def __init__(self):
         super().__init__(Group)
+
+    def user_groups(self, user_id: str) -> Self:
+        return self._chain(
+            "user_groups",
+            lambda query, user_id: query.join(Group.roles).where(
+                Role.user_id == user_id
+            ),
+            user_id=user_id,
+        )
+
+    def initial_user_group(self, user_id: str) -> Self:
+        return self._chain(
+            "initial_user_group",
+            lambda query, user_id: query.join(Group.roles)
+            .join(Role.roletype)
+            .where(
+                Role.user_id == user_id,
+                RoleType.name == "Admin",
+                Group.is_private == True,  # noqa: E712
+            ),
+            user_id=user_id,
+        )
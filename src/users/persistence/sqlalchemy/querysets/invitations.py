@@ -9,7 +9,10 @@ class InvitationQueryset(Queryset):
         super().__init__(Invitation)
 
     def expired(self) -> Self:
-        self._query = self._query.where(
-            self.qs_class.created_at < self.qs_class.expired_before()
+        return self._chain(
+            "expired",
+            lambda query, expired_before: query.where(
+                self.qs_class.created_at < expired_before
+            ),
+            expired_before=self.qs_class.expired_before(),
         )
-        return self
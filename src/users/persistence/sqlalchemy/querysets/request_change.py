@@ -9,19 +9,26 @@ class RequestChangeQueryset(Queryset):
         super().__init__(RequestChange)
 
     def valid_for(self, email: str, request_type: RequestType) -> Self:
-        self._query = self._query.where(
-            self.qs_class.email == email,
-            self.qs_class.request_type == request_type,
-            self.qs_class.created_at > self.qs_class.valid_after(),
+        return self._chain(
+            "valid_for",
+            lambda query, email, request_type, valid_after: query.where(
+                self.qs_class.email == email,
+                self.qs_class.request_type == request_type,
+                self.qs_class.created_at > valid_after,
+            ),
+            email=email,
+            request_type=request_type,
+            valid_after=self.qs_class.valid_after(),
         )
-        return self
 
     def last(self) -> Self:
-        self._query = self._query.order_by(self.qs_class.created_at.desc()).limit(1)
-        return self
+        return self.order_by(created_at="DESC").limit(1)
 
     def expired(self) -> Self:
-        self._query = self._query.where(
-            self.qs_class.created_at < self.qs_class.history_expired_before()
+        return self._chain(
+            "expired",
+            lambda query, history_expired_before: query.where(
+                self.qs_class.created_at < history_expired_before
+            ),
+            history_expired_before=self.qs_class.history_expired_before(),
         )
-        return self
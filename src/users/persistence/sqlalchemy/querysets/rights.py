@@ -11,32 +11,43 @@ class RightQueryset(Queryset):
         super().__init__(Right)
 
     def user_have(self, user_id: str) -> Self:
-        self._query = (
-            self._query.join(Right.roletype).join(Role).where(Role.user_id == user_id)
+        return self._chain(
+            "user_have",
+            lambda query, user_id: query.join(Right.roletype)
+            .join(Role)
+            .where(Role.user_id == user_id),
+            user_id=user_id,
         )
-        return self
 
     def user_can_use(self, group_ids: list[str]) -> Self:
-        self._query = self._query.join(Right.roletype).where(
-            or_(
-                RoleType.group_id.in_(group_ids),
-                RoleType.group_id == None,  # noqa E711
-                RoleType.group_id == "",
-            )
+        return self._chain(
+            "user_can_use",
+            lambda query, group_ids: query.join(Right.roletype).where(
+                or_(
+                    RoleType.group_id.in_(group_ids),
+                    RoleType.group_id == None,  # noqa E711
+                    RoleType.group_id == "",
+                )
+            ),
+            group_ids=group_ids,
         )
-        return self
 
     def both_user_have_and_user_can_use(self, group_ids: list[str]) -> Self:
-        self._query = self._query.join(Right.roletype).where(
-            or_(
-                RoleType.group_id.in_(group_ids),
-                RoleType.group_id == None,  # noqa E711
-                RoleType.group_id == "",
-            )
+        return self._chain(
+            "both_user_have_and_user_can_use",
+            lambda query, group_ids: query.join(Right.roletype).where(
+                or_(
+                    RoleType.group_id.in_(group_ids),
+                    RoleType.group_id == None,  # noqa E711
+                    RoleType.group_id == "",
+                )
+            ),
+            group_ids=group_ids,
         )
-        return self
 
     def all_roletype_rights(self, roletype_id: str) -> Self:
-        self._query = self._query.where(Role.roletype_id == roletype_id)
-
-        return self
+        return self._chain(
+            "all_roletype_rights",
+            lambda query, roletype_id: query.where(Role.roletype_id == roletype_id),
+            roletype_id=roletype_id,
+        )
@@ -11,21 +11,29 @@ class RoleQueryset(Queryset):
         super().__init__(Role)
 
     def is_mine(self, user_id: str) -> Self:
-        self._query = self._query.where(self.qs_class.user_id == user_id)
-        return self
+        return self.filter_by(user_id=user_id)
 
     def is_under_my_control(self, group_ids: list[str]) -> Self:
-        self._query = self._query.where(self.qs_class.group_id.in_(group_ids))
-        return self
+        return self._chain(
+            "is_under_my_control",
+            lambda query, group_ids: query.where(self.qs_class.group_id.in_(group_ids)),
+            group_ids=group_ids,
+        )
 
     def both_is_mine_and_is_under_my_control(
         self, user_id: str, group_ids: list[str]
     ) -> Self:
-        self._query = self._query.where(
-            or_(self.qs_class.user_id == user_id, self.qs_class.group_id.in_(group_ids))
+        return self._chain(
+            "both_is_mine_and_is_under_my_control",
+            lambda query, user_id, group_ids: query.where(
+                or_(
+                    self.qs_class.user_id == user_id,
+                    self.qs_class.group_id.in_(group_ids),
+                )
+            ),
+            user_id=user_id,
+            group_ids=group_ids,
         )
-        return self
 
     def group_roles(self, group_id: str) -> Self:
-        self._query = self._query.where(self.qs_class.group_id == group_id)
-        return self
+        return self.filter_by(group_id=group_id)
@@ -11,19 +11,28 @@ class RoleTypeQueryset(Queryset):
         super().__init__(RoleType)
 
     def user_have(self, user_id: str) -> Self:
-        self._query = self._query.join(Role).where(Role.user_id == user_id)
-        return self
+        return self._chain(
+            "user_have",
+            lambda query, user_id: query.join(Role).where(Role.user_id == user_id),
+            user_id=user_id,
+        )
 
     def user_can_use(self, group_ids: list[str]) -> Self:
-        self._query = self._query.where(
-            or_(
-                RoleType.group_id.in_(group_ids),
-                RoleType.group_id == None,  # noqa E711
-                RoleType.group_id == "",
-            )
+        return self._chain(
+            "user_can_use",
+            lambda query, group_ids: query.where(
+                or_(
+                    RoleType.group_id.in_(group_ids),
+                    RoleType.group_id == None,  # noqa E711
+                    RoleType.group_id == "",
+                )
+            ),
+            group_ids=group_ids,
         )
-        return self
 
     def user_can_modify(self, group_ids: list[str]) -> Self:
-        self._query = self._query.where(RoleType.group_id.in_(group_ids))
-        return self
+        return self._chain(
+            "user_can_modify",
+            lambda query, group_ids: query.where(RoleType.group_id.in_(group_ids)),
+            group_ids=group_ids,
+        )
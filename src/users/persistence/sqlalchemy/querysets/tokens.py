@@ -11,17 +11,23 @@ class TokenQueryset(Queryset):
         super().__init__(Token)
 
     def by_sha(self, sha_token: str) -> Self:
-        self._query = self._query.where(self.qs_class.sha_token == sha_token)
-        return self
+        return self.filter_by(sha_token=sha_token)
+
+    def by_user(self, user_id: str) -> Self:
+        return self.filter_by(user_id=user_id)
 
     def expired(self) -> Self:
-        self._query = self._query.where(
-            or_(
-                self.qs_class.last_activity_at < self.qs_class.expired_before(),
-                and_(
-                    self.qs_class.created_at < self.qs_class.expired_temp_before(),
-                    self.qs_class.temp == True,  # noqa: E712
-                ),
-            )
+        return self._chain(
+            "expired",
+            lambda query, expired_before, expired_temp_before: query.where(
+                or_(
+                    self.qs_class.last_activity_at < expired_before,
+                    and_(
+                        self.qs_class.created_at < expired_temp_before,
+                        self.qs_class.temp == True,  # noqa: E712
+                    ),
+                )
+            ),
+            expired_before=self.qs_class.expired_before(),
+            expired_temp_before=self.qs_class.expired_temp_before(),
         )
-        return self
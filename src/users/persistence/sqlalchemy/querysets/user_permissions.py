@@ -0,0 +1,29 @@
+from typing import Self
+
+from src.libs.iam.constants import Permissions
+from src.libs.sqlalchemy.queryset import Queryset
+from src.users.models import UserPermission
+
+
+class UserPermissionQueryset(Queryset):
+    def __init__(self):
+        super().__init__(UserPermission)
+
+    def user(self, user_id: str) -> Self:
+        return self.filter_by(user_id=user_id)
+
+    def tenant(self, tenant_id: str) -> Self:
+        return self.filter_by(tenant_id=tenant_id)
+
+    def granted(self, user_id: str, resource: str, permission: Permissions) -> Self:
+        return self._chain(
+            "granted",
+            lambda query, user_id, resource, permission: query.where(
+                UserPermission.user_id == user_id,
+                UserPermission.resource == resource,
+                UserPermission.permissions.bitwise_and(permission) > 0,
+            ),
+            user_id=user_id,
+            resource=resource,
+            permission=permission,
+        )
@@ -9,12 +9,14 @@ class UserQueryset(Queryset):
         super().__init__(User)
 
     def by_email(self, email: str) -> Self:
-        self._query = self._query.where(self.qs_class.email == email)
-        return self
+        return self.filter_by(email=email)
 
     def unused(self) -> Self:
-        self._query = self._query.where(
-            self.qs_class.last_login_at == None,  # noqa E711
-            self.qs_class.created_at < self.qs_class.unused_before(),
+        return self._chain(
+            "unused",
+            lambda query, unused_before: query.where(
+                self.qs_class.last_login_at == None,  # noqa E711
+                self.qs_class.created_at < unused_before,
+            ),
+            unused_before=self.qs_class.unused_before(),
         )
-        return self
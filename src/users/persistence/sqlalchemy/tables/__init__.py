@@ -5,4 +5,5 @@ from .right_table import *
 from .role_table import *
 from .role_type_table import *
 from .token_table import *
+from .user_permission_table import *
 from .user_table import *
@@ -1,7 +1,7 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Table
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Table, text
 from sqlalchemy.orm import relationship
 
 from src.libs.sqlalchemy.base import mapper_registry
@@ -32,6 +32,8 @@ token_table = Table(
         ForeignKey("users.id", ondelete="CASCADE", name="fk_tokens_user_id"),
         nullable=False,
     ),
+    Index("tokens_last_activity_index", "last_activity_at"),
+    Index("tokens_temp_created_index", "created_at", postgresql_where=text("temp")),
 )
 
 
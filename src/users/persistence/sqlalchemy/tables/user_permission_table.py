@@ -0,0 +1,37 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table
+
+from src.libs.sqlalchemy.base import mapper_registry
+from src.users.models import UserPermission
+
+# Denormalized from roles, roletypes and rights (see UserPermissionDB)
+user_permission_table = Table(
+    "user_permissions",
+    mapper_registry.metadata,
+    Column(
+        "user_id",
+        String,
+        ForeignKey("users.id", ondelete="CASCADE", name="fk_user_permissions_user_id"),
+        primary_key=True,
+    ),
+    Column("resource", String(80), primary_key=True),
+    Column(
+        "tenant_id",
+        String,
+        ForeignKey(
+            "groups.id", ondelete="CASCADE", name="fk_user_permissions_tenant_id"
+        ),
+        primary_key=True,
+    ),
+    Column("permissions", Integer, nullable=False),
+    # Permission checks are index only scans
+    Index(
+        "user_permissions_covering_index",
+        "user_id",
+        "resource",
+        "tenant_id",
+        postgresql_include=["permissions"],
+    ),
+)
+
+
+mapper_registry.map_imperatively(UserPermission, user_permission_table)
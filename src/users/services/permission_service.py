@@ -3,8 +3,9 @@ from typing import ContextManager
 from src.libs.dependencies import DependencyInjector
 from src.libs.iam.constants import Permissions
 from src.ports import IdentityAccessManagementPort
-from src.users.persistence import GroupDBPort, UserDBPort
-from src.users.settings import APP_NAME
+from src.settings import PERMISSIONS_CACHE_LOCAL_TTL, PERMISSIONS_CACHE_TTL
+from src.users.persistence import RoleDBPort
+from src.users.settings import APP_NAME, GLOBAL_CACHE_SCOPE
 
 
 class PermissionError(Exception):
@@ -25,6 +26,29 @@ class PermissionControl(IdentityAccessManagementPort):
     def get_resources(self) -> list[str]:
         return self.resources
 
+    def get_permissions_map(
+        self, session: ContextManager, user_id: str
+    ) -> dict[str, dict[str, int]]:
+        """
+        All permissions of a user (resource -> group id -> permissions bitmask),
+        loaded in one query and cached until its roles, roletypes or rights change.
+        """
+
+        role_db: RoleDBPort = self.services.persistence.get_repository(APP_NAME, "Role")
+
+        # Roles changed in this session are not committed yet
+        if not self.services.persistence.can_cache(session):
+            return role_db.get_user_permissions(session, user_id)
+
+        return self.services.cache.get_or_load(
+            f"{APP_NAME}:permissions",
+            scopes=[user_id, GLOBAL_CACHE_SCOPE],
+            params=None,
+            loader=lambda: role_db.get_user_permissions(session, user_id),
+            ttl=PERMISSIONS_CACHE_TTL,
+            local_ttl=PERMISSIONS_CACHE_LOCAL_TTL,
+        )
+
     def can(
         self,
         session: ContextManager,
@@ -34,19 +58,40 @@ class PermissionControl(IdentityAccessManagementPort):
         resource: str,
         exception: bool = True,
     ) -> bool:
-        user_db: UserDBPort = self.services.persistence.get_repository(APP_NAME, "User")
+        return self.can_many(
+            session, user_id, [(permission, group_id_resource, resource)], exception
+        )[0]
 
-        permitted = user_db.has_permissions(
-            session, user_id, resource, permission, group_id_resource
-        )
+    def can_many(
+        self,
+        session: ContextManager,
+        user_id: str,
+        checks: list[tuple[Permissions, str, str]],
+        exception: bool = True,
+    ) -> list[bool]:
+        """
+        Resolve all checks (permission, group_id_resource, resource) with one
+        permissions map: a single query, or none if cached, whatever their number.
+        """
 
-        if not permitted and exception:
+        permissions_map = self.get_permissions_map(session, user_id)
+        results = [
+            bool(
+                permissions_map.get(resource, {}).get(group_id_resource, 0) & permission
+            )
+            for permission, group_id_resource, resource in checks
+        ]
+
+        if exception and not all(results):
+            denied = results.count(False)
+            permission, group_id_resource, resource = checks[results.index(False)]
             raise PermissionError(
                 f"User {user_id} has no permission {permission.name}"
                 f" on {resource} in group {group_id_resource}"
+                + (f" (and {denied - 1} more)" if denied > 1 else "")
             )
 
-        return permitted
+        return results
 
     def all_tenants_with_access(
         self,
@@ -55,13 +100,10 @@ class PermissionControl(IdentityAccessManagementPort):
         user_id: str,
         resource: str,
     ) -> list[str]:
-        group_db: GroupDBPort = self.services.persistence.get_repository(
-            APP_NAME, "Group"
-        )
+        permissions_map = self.get_permissions_map(session, user_id)
 
-        return group_db.accessibles_by_user_with_permission(
-            session=session,
-            permission=permission,
-            user_id=user_id,
-            resource=resource,
-        )
+        return [
+            group_id
+            for group_id, permissions in permissions_map.get(resource, {}).items()
+            if permissions & permission
+        ]
@@ -1,9 +1,12 @@
 from src.libs.dependencies import DependencyInjector
 from src.libs.hmi.querystring import Filter
 from src.libs.iam.constants import Permissions
+from src.settings import ACCESS_TOKENS
 from src.users.events import UsersEventManager
 from src.users.hmi.dto import UserDTO
 from src.users.managers import (
+    AccessTokenManager,
+    AuthCacheManager,
     GroupManager,
     InvitationManager,
     RequestChangeManager,
@@ -46,6 +49,8 @@ class UsersService:
         self.user_manager = UserManager(services=self.services)
         self.token_manager = TokenManager(services=self.services)
         self.invitation_manager = InvitationManager(services=self.services)
+        self.auth_cache_manager = AuthCacheManager(services=self.services)
+        self.access_token_manager = AccessTokenManager(services=self.services)
 
     def _prepare_observer_roletype(self, session):
         """Prepare observer role to add people with minimum rights"""
@@ -55,7 +60,7 @@ class UsersService:
                 observer_roletype,
                 observer_created,
             ) = self.roletype_manager.get_default_observer(session=session)
-            session.commit()
+            session.flush()
 
             if observer_created:
                 self.right_manager.create_observer_rights(
@@ -75,7 +80,7 @@ class UsersService:
             )
 
             if admin_created:
-                session.commit()
+                session.flush()
                 self.right_manager.create_admin_rights(session, admin_roletype.id)
 
             group = self.group_manager.create_group(
@@ -99,10 +104,7 @@ class UsersService:
             admin_roletype, _ = self.roletype_manager.get_default_admin(session=session)
 
             self.right_manager.clean_all_rights(session, admin_roletype.id)
-            session.commit()
-
             self.right_manager.create_admin_rights(session, admin_roletype.id)
-            session.commit()
 
     def get_group(self, user_id: str, group_id: str) -> Group:
         """Return a user's group"""
@@ -131,7 +133,7 @@ class UsersService:
     ) -> list[Group]:
         """Return a filtered list of user's groups"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.group_manager.get_all_groups(
                 session=session, user_id=user_id, qs_filters=qs_filters
             )
@@ -162,7 +164,7 @@ class UsersService:
     def get_group_members(self, user_id: str, group_id: str) -> list[Role]:
         """Return all group's members"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.role_manager.get_members(
                 session=session, user_id=user_id, group_id=group_id
             )
@@ -189,7 +191,6 @@ class UsersService:
                 locale=user_dto.locale,
                 timezone=user_dto.timezone,
             )
-            session.commit()
 
         group = self.create_new_group(
             user_id=user.id, group_name="Private", is_private=True
@@ -211,25 +212,25 @@ class UsersService:
 
         with self.services.persistence.get_session() as session:
             self.token_manager.clean_expired(session=session)
-            session.commit()
 
             user = self.user_manager.find_user_by_email(session, email)
 
-            if isinstance(user, User) and user.check_password(password):
-                # Many tokens can be active for a unique user (it's assumed)
-                user.update_last_login()
+            if not isinstance(user, User) or not user.check_password(password):
+                return None
 
-                token = self.token_manager.create_token(session=session, user_id=user.id)
-                session.commit()
+            # Roll out changes of hashing parameters transparently
+            user.rehash_password(password)
+            # Many tokens can be active for a unique user (it's assumed)
+            user.update_last_login()
 
-                with self.services.eventbus as event_session:
-                    self.event_manager.send_login_2fa_event(
-                        session=event_session, user=user, token=token
-                    )
+            token = self.token_manager.create_token(session=session, user_id=user.id)
 
-                return token
+        with self.services.eventbus as event_session:
+            self.event_manager.send_login_2fa_event(
+                session=event_session, user=user, token=token
+            )
 
-        return None
+        return token
 
     def get_temp_token(self, sha_token: str, code: str) -> Token | None:
         """Return a temporary token"""
@@ -244,40 +245,117 @@ class UsersService:
                 and token.validate_token(code=code)
             ):
                 self.token_manager.update_token(session=session, token=token)
-                session.commit()
 
                 return token
 
         return None
 
     def logout(self, sha_token: str) -> bool:
-        """Delete active token for this user only"""
+        """Delete active token for this user only, with its access tokens"""
 
         with self.services.persistence.get_session() as session:
-            token = self.token_manager.get_token(session, sha_token)
-            if token:
-                self.token_manager.delete_token(session, token)
-                session.commit()
+            if self.access_token_manager.is_access_token(sha_token):
+                claims = self.access_token_manager.get_claims(sha_token)
+                token = (
+                    self.token_manager.load_token(session, claims["tid"])
+                    if claims
+                    else None
+                )
+            else:
+                token = self.token_manager.get_token(session, sha_token)
 
-                return True
+            if not token:
+                return False
 
-        return False
+            self.token_manager.delete_token(session, token)
+            self.auth_cache_manager.invalidate_tokens_after_commit(session, token)
+
+        return True
+
+    def _get_active_token_user(
+        self, session, sha_token: str
+    ) -> tuple[Token | None, User | None]:
+        """Return a valid token and its user, (None, None) otherwise"""
+
+        token = self.token_manager.get_token(session, sha_token)
+        if not token:
+            return None, None
+
+        # Activity is saved later and in bulk, a request doesn't write it
+        pending_activity_at = self.token_manager.get_pending_activity(token)
+        if not token.is_valid(pending_activity_at):
+            return None, None
+
+        self.token_manager.touch_token(
+            token, token.get_last_activity(pending_activity_at), session=session
+        )
+        return token, self.user_manager.get_user(session, user_id=token.user_id)
 
     def user_from_token(self, sha_token: str) -> User | None:
-        """Load a user from a given token"""
+        """Load a user from a given token, cached a short time after a hit"""
+
+        if self.access_token_manager.is_access_token(sha_token):
+            return self.user_from_access_token(sha_token)
+
+        user = self.auth_cache_manager.get_user(sha_token)
+        if user:
+            return user
 
         with self.services.persistence.get_session() as session:
-            token = self.token_manager.get_token(session, sha_token)
+            _token, user = self._get_active_token_user(session, sha_token)
+            if user:
+                self.auth_cache_manager.set_user(sha_token, user)
+
+            return user
+
+    def user_from_access_token(self, access_token: str) -> User | None:
+        """Read a user from a signed access token, only revocations are looked up"""
+
+        if not ACCESS_TOKENS:
+            return None
+
+        claims = self.access_token_manager.get_claims(access_token)
+        if not claims:
+            return None
+
+        revoked = self.auth_cache_manager.is_access_token_revoked(
+            claims["tid"], claims["iat"]
+        )
+        if revoked is None:
+            # Revocations are unknown: the token must still exist
+            with self.services.persistence.get_session(readonly=True) as session:
+                revoked = self.token_manager.load_token(session, claims["tid"]) is None
+        if revoked:
+            return None
 
-            if token and token.is_valid():
-                token.update_last_activity()
+        user = self.auth_cache_manager.get_user_by_id(claims["uid"])
+        if user is None:
+            with self.services.persistence.get_session(readonly=True) as session:
+                user = self.user_manager.get_user(session, user_id=claims["uid"])
+            if user:
+                self.auth_cache_manager.set_user_by_id(user)
 
-                user = self.user_manager.get_user(session, user_id=token.user_id)
+        return user
 
-                return user
+    def refresh_access_token(self, sha_token: str) -> str | None:
+        """Give a new access token for a valid token"""
+
+        if not ACCESS_TOKENS:
+            return None
+
+        with self.services.persistence.get_session() as session:
+            token, user = self._get_active_token_user(session, sha_token)
+            if user:
+                return self.access_token_manager.create_access_token(token, user)
 
         return None
 
+    def save_tokens_activity(self) -> int:
+        """Save tokens activity recorded by authenticated requests"""
+
+        with self.services.persistence.get_session() as session:
+            return self.token_manager.save_pending_activities(session=session)
+
     def request_password_change(self, user: User) -> None:
         """Create a request to change the user password"""
 
@@ -317,6 +395,7 @@ class UsersService:
 
         with self.services.persistence.get_session() as session:
             self.user_manager.update_user(session, user)
+            self.auth_cache_manager.invalidate_user(session, user.id)
 
         with self.services.eventbus as event_session:
             self.event_manager.send_update_user_event(session=event_session, user=user)
@@ -333,7 +412,7 @@ class UsersService:
                 user = self.user_manager.find_user_by_email(session, email)
                 user.set_password(password=password)
                 self.user_manager.update_user(session, user)
-                session.commit()
+                self.auth_cache_manager.invalidate_user(session, user.id)
 
                 return True
 
@@ -349,24 +428,22 @@ class UsersService:
                 session, old_email, RequestType.EMAIL
             )
 
-            if (
+            if not (
                 request_change
                 and request_change.check_hash(hash=hash)
                 and request_change.check_code(code)
             ):
-                user = self.user_manager.find_user_by_email(session, old_email)
-                user.set_email(new_email)
-                self.user_manager.update_user(session, user)
-                session.commit()
+                return False
 
-                with self.services.eventbus as event_session:
-                    self.event_manager.send_update_user_event(
-                        session=event_session, user=user
-                    )
+            user = self.user_manager.find_user_by_email(session, old_email)
+            user.set_email(new_email)
+            self.user_manager.update_user(session, user)
+            self.auth_cache_manager.invalidate_user(session, user.id)
 
-                return True
+        with self.services.eventbus as event_session:
+            self.event_manager.send_update_user_event(session=event_session, user=user)
 
-        return False
+        return True
 
     def delete_user(self, user: User) -> bool:
         """
@@ -378,23 +455,22 @@ class UsersService:
             group_ids = self.services.identity.all_tenants_with_access(
                 session, Permissions.CREATE, user.id, "RoleType"
             )
-            if len(group_ids) <= 1:
-                self.user_manager.delete_user(session, user)
-                session.commit()
+            if len(group_ids) > 1:
+                return False
 
-                with self.services.eventbus as event_session:
-                    self.event_manager.send_delete_user_event(
-                        session=event_session, user=user
-                    )
+            # Tokens are deleted with the user
+            self.auth_cache_manager.invalidate_user(session, user.id)
+            self.user_manager.delete_user(session, user)
 
-                return True
+        with self.services.eventbus as event_session:
+            self.event_manager.send_delete_user_event(session=event_session, user=user)
 
-        return False
+        return True
 
     def get_invitations(self, user_id: str, group_id: str) -> list[Invitation]:
         """Give all invitations associated with group"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             invitations = self.invitation_manager.get_from_group(
                 session=session, user_id=user_id, group_id=group_id
             )
@@ -545,7 +621,7 @@ class UsersService:
     ) -> list[Right]:
         """Return all rights of one user"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.right_manager.get_all_rights(
                 session=session, user_id=user_id, qs_filters=qs_filter
             )
@@ -587,7 +663,7 @@ class UsersService:
     ) -> list[Role]:
         """Return all roles of one user"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.role_manager.get_all_roles(
                 session=session, user_id=user_id, qs_filters=qs_filter
             )
@@ -609,6 +685,12 @@ class UsersService:
                 session=session, user_id=user_id, role=role
             )
 
+    def check_user_permissions(self, fix: bool = False) -> list[str]:
+        """Users with permissions out of sync with their roles (fixed if fix)"""
+
+        with self.services.persistence.get_session() as session:
+            return self.role_manager.check_permissions(session=session, fix=fix)
+
     def create_new_roletype(self, name: str, group_id: str) -> RoleType | None:
         """Create a new roletype"""
 
@@ -630,7 +712,7 @@ class UsersService:
     ) -> list[RoleType]:
         """Return all roletypes of one user"""
 
-        with self.services.persistence.get_session() as session:
+        with self.services.persistence.get_session(readonly=True) as session:
             return self.roletype_manager.get_all_roletypes(
                 session=session, user_id=user_id, qs_filters=qs_filter
             )
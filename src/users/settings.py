@@ -1 +1,4 @@
 APP_NAME = "users"
+
+# Cache scope of global roletypes and rights, shared by all tenants
+GLOBAL_CACHE_SCOPE = f"{APP_NAME}:global"
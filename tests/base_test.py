@@ -11,7 +11,12 @@ from src.settings import LOCALE, TIMEZONE
 from src.users.hmi.dto import UserDTO
 from src.users.models import Group, User
 from src.users.services import UsersService
-from tests.utils.db_utils import text_query_column_exists, text_query_table_exists
+from tests.utils.db_utils import (
+    get_seq_scans,
+    text_query_column_exists,
+    text_query_disable_seqscan,
+    text_query_table_exists,
+)
 
 from . import APP, CELERY_APP, DUMMY_APP
 
@@ -146,6 +151,44 @@ class BaseTestCase(MixinTestCase, AbstractBase):
                     result, f"Column {column_name} doesn't exists in {table_name} Table"
                 )
 
+    @contextmanager
+    def assertQueryBudget(self, max_queries: int, max_repeat: int = 3):
+        """
+        Fail if the block sends more SQL statements than its budget,
+        or sends the same statement more than max_repeat times (N+1 queries).
+        """
+
+        persistence = self.app.dependencies.persistence
+        persistence.begin_query_stats()
+        try:
+            yield
+        finally:
+            query_stats = persistence.end_query_stats()
+
+        self.assertLessEqual(
+            query_stats.count,
+            max_queries,
+            f"{query_stats.count} queries sent, budget is {max_queries}",
+        )
+        duplicates = query_stats.get_duplicates(min_repeat=max_repeat + 1)
+        self.assertFalse(duplicates, f"Statements repeated too many times: {duplicates}")
+
+    def assertNoSeqScan(self, session, statements: list[tuple], tables: list[str]):
+        """
+        Explain statements and fail if one of these tables is read sequentially.
+        Sequential scans are disabled so the planner takes any usable index,
+        whatever the size of the dataset.
+        """
+
+        session.execute(text_query_disable_seqscan())
+        for statement, parameters in statements:
+            result = session.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar()[0]["Plan"]
+            seq_scans = [table for table in get_seq_scans(plan) if table in tables]
+            self.assertFalse(seq_scans, f"Sequential scan on {seq_scans}: {statement}")
+
     def create_user(self):
         """Create a default test user and his group, role etc..."""
         self.password = self.generate_password()
@@ -1,4 +1,6 @@
-from unittest.mock import MagicMock
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock, call, patch
+from zoneinfo import ZoneInfo
 
 from src.events.managers import EventManager
 from src.events.models import Event
@@ -22,7 +24,7 @@ class TestEventManager(DummyBaseTestCase):
 
         self.manager.services.identity.all_tenants_with_access.assert_called_once()
         self.manager.event_db.get_all_from_tenant.assert_called_once_with(
-            session=None, tenant_id="tenant_123"
+            session=None, tenant_id="tenant_123", filters=None
         )
 
     def test_cannot_get_all_tenant_events(self):
@@ -51,8 +53,70 @@ class TestEventManager(DummyBaseTestCase):
         self.assertDictEqual(event.data, {"foo": "bar"})
 
     def test_bulk_add(self):
-        self.manager.event_db.bulk_save = MagicMock()
+        self.manager.event_db.bulk_insert = MagicMock()
 
         self.manager.bulk_add(session=None, events=[])
 
-        self.manager.event_db.bulk_save.assert_called_once()
+        self.manager.event_db.bulk_insert.assert_called_once()
+
+    @patch("src.events.managers.event_manager.EVENTS_PARTITIONS_AHEAD", 2)
+    @patch("src.events.managers.event_manager.EVENTS_RETENTION_DAYS", 30)
+    @patch("src.events.managers.event_manager.MAX_RETENTION_DAYS", 365)
+    @patch(
+        "src.events.managers.event_manager.RETENTION_BY_NAME",
+        {"users:register:user": 365},
+    )
+    def test_maintain_partitions(self):
+        session = MagicMock()
+        now = datetime(2026, 11, 15, tzinfo=ZoneInfo("UTC"))
+        self.manager.event_db.get_partitions = MagicMock(
+            return_value=[date(2025, 10, 1), date(2025, 11, 1), date(2026, 11, 1)]
+        )
+        self.manager.event_db.create_partition = MagicMock()
+        self.manager.event_db.drop_partition = MagicMock()
+        self.manager.event_db.delete_expired = MagicMock()
+
+        result = self.manager.maintain_partitions(session=session, now=now)
+
+        self.assertDictEqual(result, {"created": 2, "dropped": 1})
+        self.manager.event_db.create_partition.assert_has_calls(
+            [
+                call(session, month=date(2026, 12, 1)),
+                call(session, month=date(2027, 1, 1)),
+            ]
+        )
+        self.manager.event_db.drop_partition.assert_called_once_with(
+            session, month=date(2025, 10, 1)
+        )
+        self.manager.event_db.delete_expired.assert_has_calls(
+            [
+                call(
+                    session,
+                    before=now - timedelta(days=30),
+                    excluded_names=["users:register:user"],
+                ),
+                call(
+                    session,
+                    before=now - timedelta(days=365),
+                    name="users:register:user",
+                ),
+            ]
+        )
+
+    @patch("src.events.managers.event_manager.MAX_RETENTION_DAYS", 365)
+    def test_maintain_partitions_failing_creation(self):
+        now = datetime(2026, 11, 15, tzinfo=ZoneInfo("UTC"))
+        self.manager.event_db.get_partitions = MagicMock(
+            return_value=[date(2025, 10, 1)]
+        )
+        self.manager.event_db.create_partition = MagicMock(side_effect=ValueError)
+        self.manager.event_db.drop_partition = MagicMock()
+        self.manager.event_db.delete_expired = MagicMock()
+
+        with self.assertLogs("src.events.managers.event_manager", level="ERROR"):
+            result = self.manager.maintain_partitions(session=MagicMock(), now=now)
+
+        self.assertEqual(result["created"], 0)
+        self.assertEqual(result["dropped"], 1)
+        self.manager.event_db.drop_partition.assert_called_once()
+        self.manager.event_db.delete_expired.assert_called()
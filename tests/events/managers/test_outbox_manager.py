@@ -0,0 +1,38 @@
+from unittest.mock import ANY, MagicMock
+
+from src.events.managers import OutboxManager
+from src.events.models import Event, OutboxEvent
+from tests.base_test import DummyBaseTestCase
+
+
+class TestOutboxManager(DummyBaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.manager = OutboxManager(services=self.app.dependencies)
+
+    def test_add_events(self):
+        events = [
+            Event(tenant_id="tenant_123", name="test:outbox", data={"i": i})
+            for i in range(2)
+        ]
+        self.manager.outbox_db.add_events = MagicMock()
+
+        outbox_events = self.manager.add_events(None, events, [None, "key"])
+
+        self.manager.outbox_db.add_events.assert_called_once_with(
+            None, events=outbox_events
+        )
+        self.assertEqual([e.id for e in outbox_events], [e.id for e in events])
+        self.assertEqual(outbox_events[1].data, {"i": 1})
+        self.assertEqual(outbox_events[1].idempotency_key, "key")
+        self.assertEqual(outbox_events[0].available_at, events[0].created_at)
+
+    def test_mark_failed(self):
+        event = OutboxEvent(tenant_id="tenant_123", name="test:outbox")
+        self.manager.outbox_db.mark_failed = MagicMock()
+
+        self.manager.mark_failed(None, [event])
+
+        self.manager.outbox_db.mark_failed.assert_called_once_with(
+            None, ids=[event.id], max_attempts=ANY, retry_delay=ANY
+        )
@@ -1,5 +1,9 @@
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
 from src.events.models import Event
 from src.events.persistence.sqlalchemy import EventDB
+from src.libs.hmi.querystring import QueryStringFilter
 from tests.base_test import BaseTestCase
 
 
@@ -27,3 +31,128 @@ class TestEventAdapter(BaseTestCase):
             self.event_db.delete(session, self.event)
             session.commit()
             self.assertFalse(self.event_db.exists(session, self.event.id))
+
+    def test_bulk_insert(self):
+        events = [
+            Event(tenant_id="user_tenant_id", name="test:bulk", data={"i": i})
+            for i in range(5)
+        ]
+
+        with self.assertQueryBudget(max_queries=3):
+            with self.app.dependencies.persistence.get_session() as session:
+                self.event_db.bulk_insert(
+                    session, events, chunk_size=2, copy_threshold=0
+                )
+                self.assertFalse(session.new)
+
+        with self.app.dependencies.persistence.get_session() as session:
+            for event in events:
+                with self.subTest(event.data["i"]):
+                    event_from_db = self.event_db.load(session, event.id)
+                    self.assertEqual(event_from_db.data, event.data)
+
+    def test_bulk_insert_with_copy(self):
+        events = [
+            Event(
+                tenant_id="user_tenant_id",
+                name="test:bulk",
+                data={"i": i, "text": "tab\tand\\backslash"},
+            )
+            for i in range(5)
+        ]
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.event_db.bulk_insert(session, events, chunk_size=2, copy_threshold=1)
+
+        with self.app.dependencies.persistence.get_session() as session:
+            for event in events:
+                with self.subTest(event.data["i"]):
+                    event_from_db = self.event_db.load(session, event.id)
+                    self.assertEqual(event_from_db.data, event.data)
+                    self.assertEqual(event_from_db.created_at, event.created_at)
+
+    def test_get_all_from_tenant_skip_expired(self):
+        expired = Event(
+            tenant_id="user_tenant_id",
+            name="test:expired",
+            created_at=datetime.now(tz=ZoneInfo("UTC")) - timedelta(days=5000),
+        )
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.event_db.bulk_insert(session, [self.event, expired])
+
+        with self.app.dependencies.persistence.get_session() as session:
+            events = self.event_db.get_all_from_tenant(session, "user_tenant_id")
+            event_ids = [event.id for event in events]
+
+        self.assertIn(self.event.id, event_ids)
+        self.assertNotIn(expired.id, event_ids)
+
+    def test_partitions(self):
+        month = date(2000, 1, 1)
+        # Saved in the default partition, before the monthly one exists
+        old_event = Event(
+            tenant_id="user_tenant_id",
+            name="test:partition",
+            created_at=datetime(2000, 1, 15, tzinfo=ZoneInfo("UTC")),
+        )
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.event_db.save(session, old_event)
+            session.commit()
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.event_db.create_partition(session, month=month)
+            session.commit()
+
+            self.assertIn(month, self.event_db.get_partitions(session))
+            self.assertTrue(self.event_db.exists(session, old_event.id))
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.event_db.drop_partition(session, month=month)
+            session.commit()
+
+            self.assertNotIn(month, self.event_db.get_partitions(session))
+            self.assertFalse(self.event_db.exists(session, old_event.id))
+
+    def test_get_all_from_tenant_sorted(self):
+        now = datetime.now(tz=ZoneInfo("UTC"))
+        events = [
+            Event(
+                tenant_id="sorted_tenant_id",
+                name="test:sorted",
+                created_at=now - timedelta(minutes=i),
+            )
+            for i in [2, 0, 1]
+        ]
+        filters = QueryStringFilter("name_eq=test:sorted").get_filters()
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.event_db.bulk_insert(session, events)
+            result = self.event_db.get_all_from_tenant(
+                session, "sorted_tenant_id", filters
+            )
+
+        self.assertEqual(
+            [event.id for event in result], [events[1].id, events[2].id, events[0].id]
+        )
+
+    def test_delete_expired(self):
+        before = datetime.now(tz=ZoneInfo("UTC")) - timedelta(days=1)
+        events = [
+            Event(tenant_id="user_tenant_id", name=name, created_at=created_at)
+            for name, created_at in [
+                ("test:short", before - timedelta(days=1)),
+                ("test:long", before - timedelta(days=1)),
+                ("test:short", before + timedelta(hours=1)),
+            ]
+        ]
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.event_db.bulk_insert(session, events)
+            self.event_db.delete_expired(session, before=before, name="test:short")
+            session.commit()
+
+            self.assertFalse(self.event_db.exists(session, events[0].id))
+            self.assertTrue(self.event_db.exists(session, events[1].id))
+            self.assertTrue(self.event_db.exists(session, events[2].id))
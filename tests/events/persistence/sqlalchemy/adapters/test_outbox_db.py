@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from src.events.models import OutboxEvent
+from src.events.persistence.sqlalchemy import OutboxDB
+from tests.base_test import BaseTestCase
+
+
+class TestOutboxAdapter(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.outbox_db = OutboxDB()
+        self.events = [
+            OutboxEvent(tenant_id="user_tenant_id", name="test:outbox", data={"i": i})
+            for i in range(3)
+        ]
+        with self.app.dependencies.persistence.get_session() as session:
+            self.outbox_db.add_events(session, self.events)
+            session.commit()
+
+    def tearDown(self) -> None:
+        with self.app.dependencies.persistence.get_session() as session:
+            for event in self.events:
+                self.outbox_db.delete_by_id(session, event.id)
+            session.commit()
+
+    def test_add_events_with_idempotency_key(self):
+        events = [
+            OutboxEvent(
+                tenant_id="user_tenant_id", name="test:outbox", idempotency_key="key"
+            )
+            for _ in range(2)
+        ]
+        self.events.extend(events)
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.outbox_db.add_events(session, events[:1])
+            self.outbox_db.add_events(session, events[1:])
+            session.commit()
+
+            self.assertTrue(self.outbox_db.exists(session, events[0].id))
+            self.assertFalse(self.outbox_db.exists(session, events[1].id))
+
+    def test_claim_events_skip_locked(self):
+        persistence = self.app.dependencies.persistence
+
+        with persistence.get_session() as session, persistence.get_session() as other:
+            claimed = self.outbox_db.claim_events(session, limit=2)
+            other_claimed = self.outbox_db.claim_events(other, limit=10)
+
+            claimed_ids = {event.id for event in claimed}
+            other_ids = {event.id for event in other_claimed}
+            self.assertEqual(len(claimed_ids), 2)
+            self.assertFalse(claimed_ids & other_ids)
+            self.assertIn(self.events[2].id, other_ids)
+
+    def test_mark_processed(self):
+        with self.app.dependencies.persistence.get_session() as session:
+            self.outbox_db.mark_processed(session, [e.id for e in self.events])
+            session.commit()
+
+            ids = {e.id for e in self.outbox_db.claim_events(session, limit=10)}
+            self.assertFalse(ids & {e.id for e in self.events})
+
+    def test_mark_failed(self):
+        first, second = self.events[0].id, self.events[1].id
+        with self.app.dependencies.persistence.get_session() as session:
+            self.outbox_db.mark_failed(session, [first], max_attempts=5, retry_delay=60)
+            self.outbox_db.mark_failed(session, [second], max_attempts=1, retry_delay=0)
+            session.commit()
+
+            event = self.outbox_db.load(session, first)
+            self.assertEqual(event.attempts, 1)
+            self.assertIsNone(event.processed_at)
+            self.assertGreater(event.available_at, datetime.now(tz=ZoneInfo("UTC")))
+            self.assertIsNotNone(self.outbox_db.load(session, second).processed_at)
+
+    def test_clean_processed(self):
+        with self.app.dependencies.persistence.get_session() as session:
+            self.outbox_db.mark_processed(session, [self.events[0].id])
+            session.commit()
+
+            tomorrow = datetime.now(tz=ZoneInfo("UTC")) + timedelta(days=1)
+            self.outbox_db.clean_processed(session, before=tomorrow)
+            session.commit()
+
+            self.assertFalse(self.outbox_db.exists(session, self.events[0].id))
+            self.assertTrue(self.outbox_db.exists(session, self.events[1].id))
@@ -1,8 +1,11 @@
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock
 
-from src.events.models import Event
+from sqlalchemy import text
+
+from src.events.models import Event, OutboxEvent
+from src.events.persistence.sqlalchemy import OutboxDB
 from src.events.services import EventsService
-from tests.base_test import DummyBaseTestCase
+from tests.base_test import BaseTestCase, DummyBaseTestCase
 
 
 class TestEventsService(DummyBaseTestCase):
@@ -17,6 +20,16 @@ class TestEventsService(DummyBaseTestCase):
 
         self.event_service.event_manager.get_all_tenant_events.assert_called_once()
 
+    def test_maintain_partitions(self):
+        self.event_service.event_manager.maintain_partitions = MagicMock(
+            return_value={"created": 1, "dropped": 0}
+        )
+
+        result = self.event_service.maintain_partitions()
+
+        self.assertDictEqual(result, {"created": 1, "dropped": 0})
+        self.event_service.event_manager.maintain_partitions.assert_called_once()
+
     def test_add(self):
         self.event_service.event_manager.add = MagicMock()
 
@@ -37,3 +50,86 @@ class TestEventsService(DummyBaseTestCase):
         self.event_service.bulk_add_events(events)
 
         self.event_service.event_manager.bulk_add.assert_called_once()
+
+    def test_add_outbox_events(self):
+        self.event_service.event_manager.bulk_add = MagicMock()
+        self.event_service.outbox_manager.add_events = MagicMock()
+        after_commit = MagicMock()
+
+        events = [
+            Event(tenant_id="123abc", name="test:outbox", data={"_save": False}),
+        ]
+        self.event_service.add_outbox_events(events, ["key"], after_commit)
+
+        self.event_service.event_manager.bulk_add.assert_called_once_with(
+            session=ANY, events=[]
+        )
+        self.event_service.outbox_manager.add_events.assert_called_once_with(
+            ANY, events, ["key"]
+        )
+        after_commit.assert_called_once()
+
+    def test_after_commit(self):
+        callback = MagicMock()
+
+        self.event_service.after_commit(callback, "foo")
+
+        callback.assert_called_once_with("foo")
+
+    def test_relay_outbox_events(self):
+        names = ["test:outbox", "test:failing", "test:outbox", "test:outbox"]
+        events = [OutboxEvent(tenant_id="123abc", name=name) for name in names]
+        manager = self.event_service.outbox_manager
+        manager.claim_events = MagicMock(side_effect=[events[:3], events[3:], []])
+        manager.mark_processed = MagicMock()
+        manager.mark_failed = MagicMock()
+        manager.clean_processed = MagicMock()
+        dispatch = MagicMock(side_effect=[None, ValueError, None])
+
+        nb_events = self.event_service.relay_outbox_events(dispatch)
+
+        self.assertEqual(nb_events, 4)
+        dispatch.assert_any_call("test:outbox", [events[0], events[2]], ANY)
+        self.assertEqual(dispatch.call_count, 3)
+        self.assertEqual(manager.claim_events.call_count, 3)
+        manager.mark_processed.assert_any_call(ANY, [events[0], events[2]])
+        manager.mark_failed.assert_any_call(ANY, [events[1]])
+        manager.mark_processed.assert_called_with(ANY, [events[3]])
+        manager.clean_processed.assert_called_once()
+
+
+class TestOutboxRelay(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.event_service = EventsService(services=self.app.dependencies)
+        self.outbox_db = OutboxDB()
+        self.event = OutboxEvent(tenant_id="123abc", name="test:relay")
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.outbox_db.add_events(session, [self.event])
+            session.commit()
+
+    def tearDown(self) -> None:
+        with self.app.dependencies.persistence.get_session() as session:
+            self.outbox_db.delete_by_id(session, self.event.id)
+            session.commit()
+
+    def test_relay_observer_database_error(self):
+        persistence = self.app.dependencies.persistence
+
+        def dispatch(event_name, events, savepoint):
+            # The observer shares the session holding the claimed events
+            with savepoint():
+                with persistence.get_session() as session:
+                    session.execute(text("SELECT * FROM missing_table"))
+
+        persistence.begin_unit_of_work()
+        try:
+            self.event_service.relay_outbox_events(dispatch)
+        finally:
+            persistence.end_unit_of_work(commit=True)
+
+        with persistence.get_session() as session:
+            event = self.outbox_db.load(session, self.event.id)
+            self.assertEqual(event.attempts, 1)
+            self.assertIsNone(event.processed_at)
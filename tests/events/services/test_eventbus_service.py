@@ -1,5 +1,9 @@
-from unittest.mock import MagicMock, patch
+from threading import Thread
+from unittest.mock import ANY, MagicMock, patch
 
+from sqlalchemy.exc import OperationalError
+
+from src.events.models import OutboxEvent
 from src.events.services import EventBusService
 from tests.base_test import BaseTestCase
 
@@ -31,6 +35,31 @@ class TestEventBus(BaseTestCase):
         after = len(self.bus.events)
         self.assertEqual(before + 1, after)
 
+    def test_events_per_context(self):
+        self.bus.emit(tenant_id="abc123", event_name="event:main", event_data={})
+        thread_events = {}
+
+        def other_request():
+            self.bus.emit(tenant_id="abc123", event_name="event:other", event_data={})
+            thread_events.update(self.bus.events)
+
+        thread = Thread(target=other_request)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(list(thread_events), ["event:other"])
+        self.assertEqual(list(self.bus.events), ["event:main"])
+
+    @patch("src.events.services.eventbus_service.EVENTS_BUFFER_SIZE", 2)
+    def test_emit_bounded_buffer(self):
+        self.bus.execute = MagicMock()
+
+        self.bus.emit(tenant_id="abc123", event_name="event:name", event_data={})
+        self.bus.execute.assert_not_called()
+
+        self.bus.emit(tenant_id="abc123", event_name="event:name", event_data={})
+        self.bus.execute.assert_called_once()
+
     def test_subscribe(self):
         before = len(self.bus.index)
 
@@ -56,3 +85,158 @@ class TestEventBus(BaseTestCase):
             service.bulk_add_events.assert_called_once()
 
         self.assertEqual(len(self.bus.events), 0)
+
+    def test_execute_events_emitted_by_observers(self):
+        self.bus.app = self.app
+        self.bus.subscribe(
+            "event:name",
+            function=lambda *args: self.bus.emit("abc123", "event:other", {}),
+        )
+        self.bus.emit(tenant_id="abc123", event_name="event:name", event_data={})
+
+        with patch("src.events.services.eventbus_service.EventsService") as MockClass:
+            self.bus.execute()
+
+            MockClass.assert_called_once()
+            self.assertEqual(MockClass.return_value.bulk_add_events.call_count, 2)
+
+        self.assertFalse(hasattr(self.bus, "event_service"))
+
+    @patch("src.events.services.eventbus_service.ASYNC_OBSERVERS", True)
+    def test_subscribe_async(self):
+        self.bus.subscribe("event:name", function=str, sync_required=False)
+        self.bus.subscribe("event:name", function=repr)
+
+        self.assertEqual(self.bus.async_index["event:name"], [str])
+        self.assertEqual(self.bus.index["event:name"], [repr])
+
+    def test_subscribe_async_disabled(self):
+        self.bus.subscribe("event:name", function=str, sync_required=False)
+
+        self.assertEqual(self.bus.async_index, {})
+        self.assertEqual(self.bus.index["event:name"], [str])
+
+    @patch("src.events.services.eventbus_service.ASYNC_OBSERVERS", True)
+    def test_execute_dispatch_async_observers(self):
+        self.bus.app = self.app
+        sync_observer, async_observer = MagicMock(), MagicMock()
+        self.bus.subscribe("event:name", function=sync_observer)
+        self.bus.subscribe("event:name", function=async_observer, sync_required=False)
+        self.bus.emit(tenant_id="abc123", event_name="event:name", event_data={})
+        self.bus.emit(tenant_id="abc123", event_name="event:name", event_data={})
+        self.bus._producer = MagicMock()
+
+        with patch("src.events.services.eventbus_service.EventsService") as MockClass:
+            service = MockClass.return_value
+            service.after_commit.side_effect = lambda callback, *args: callback(*args)
+
+            self.bus.execute()
+
+            service.after_commit.assert_called_once_with(
+                self.bus.dispatch, [{"name": "event:name", "data": {}}] * 2
+            )
+
+        sync_observer.assert_called_once_with(self.app, "event:name", [{}, {}])
+        async_observer.assert_not_called()
+        self.bus._producer.send_task.assert_called_once_with(
+            "src.events.jobs.tasks.run_async_observers",
+            args=[[{"name": "event:name", "data": {}}] * 2],
+        )
+
+    @patch("src.events.services.eventbus_service.ASYNC_OBSERVERS", True)
+    def test_dispatch_without_broker(self):
+        self.bus.app = self.app
+        async_observer = MagicMock()
+        self.bus.subscribe("event:name", function=async_observer, sync_required=False)
+        self.bus._producer = MagicMock()
+        self.bus._producer.send_task.side_effect = ConnectionError
+
+        self.bus.dispatch([{"name": "event:name", "data": {"foo": "bar"}}])
+
+        async_observer.assert_called_once_with(self.app, "event:name", [{"foo": "bar"}])
+
+    @patch("src.events.services.eventbus_service.ASYNC_OBSERVERS", True)
+    def test_run_async_observers(self):
+        self.bus.app = self.app
+        failing_observer = MagicMock(side_effect=ValueError)
+        async_observer = MagicMock()
+        self.bus.subscribe("event:name", function=failing_observer, sync_required=False)
+        self.bus.subscribe("event:name", function=async_observer, sync_required=False)
+
+        self.bus.run_async_observers(
+            [
+                {"name": "event:name", "data": {"id": 1}},
+                {"name": "event:other", "data": {}},
+                {"name": "event:name", "data": {"id": 2}},
+            ]
+        )
+
+        failing_observer.assert_called_once()
+        async_observer.assert_called_once_with(
+            self.app, "event:name", [{"id": 1}, {"id": 2}]
+        )
+
+    def test_emit_idempotency_key(self):
+        self.bus.emit(
+            tenant_id="abc123",
+            event_name="event:name",
+            event_data={},
+            idempotency_key="key",
+        )
+
+        self.assertEqual(
+            self.bus.events["event:name"][0].data, {"_idempotency_key": "key"}
+        )
+
+    @patch("src.events.services.eventbus_service.EVENTS_OUTBOX", True)
+    def test_execute_outbox(self):
+        self.bus.app = self.app
+        sync_observer, async_observer = MagicMock(), MagicMock()
+        self.bus.subscribe("event:name", function=sync_observer)
+        self.bus.subscribe("event:name", function=async_observer, sync_required=False)
+        self.bus.emit("abc123", "event:name", {"foo": "bar"}, idempotency_key="key")
+        self.bus._producer = MagicMock()
+
+        with patch("src.events.services.eventbus_service.EventsService") as MockClass:
+            service = MockClass.return_value
+
+            self.bus.execute()
+
+            service.bulk_add_events.assert_not_called()
+            service.add_outbox_events.assert_called_once_with(
+                ANY, ["key"], after_commit=self.bus.wake_up_relay
+            )
+
+        sync_observer.assert_called_once_with(self.app, "event:name", [{"foo": "bar"}])
+        async_observer.assert_not_called()
+        self.bus._producer.send_task.assert_not_called()
+
+    @patch("src.events.services.eventbus_service.EVENTS_OUTBOX", True)
+    def test_run_outbox_events(self):
+        self.bus.app = self.app
+        failing_observer = MagicMock(
+            side_effect=OperationalError("SELECT", {}, ValueError()),
+            __qualname__="failing_observer",
+        )
+        async_observer = MagicMock(__qualname__="async_observer")
+        self.bus.subscribe("event:name", function=failing_observer, sync_required=False)
+        self.bus.subscribe("event:name", function=async_observer, sync_required=False)
+        events = [
+            OutboxEvent(tenant_id="abc123", name="event:name", data={}) for _ in range(2)
+        ]
+        savepoint = MagicMock()
+
+        with self.assertRaises(OperationalError):
+            self.bus._run_outbox_events("event:name", events, savepoint)
+
+        self.assertEqual(savepoint.call_count, 2)
+        async_observer.assert_called_once_with(self.app, "event:name", [{}, {}])
+        for event in events:
+            self.assertEqual(event.observers_done, ["unittest.mock.async_observer"])
+
+        # Retried events are not run again by observers which succeeded
+        failing_observer.side_effect = None
+        self.bus._run_outbox_events("event:name", events, savepoint)
+
+        async_observer.assert_called_once()
+        self.assertEqual(failing_observer.call_count, 2)
@@ -1,8 +1,15 @@
 from unittest import TestCase
+from unittest.mock import MagicMock, call
 
 from flask import Flask
 from src.libs.dependencies import DependencyInjector
-from src.libs.flask.main import create_flask_app
+from src.libs.flask.main import (
+    create_flask_app,
+    setup_error_handlers,
+    setup_read_your_writes,
+    setup_unit_of_work,
+)
+from src.libs.hmi.querystring import InvalidCursorError
 
 
 class TestCreateFlaskApp(TestCase):
@@ -13,3 +20,63 @@ class TestCreateFlaskApp(TestCase):
 
         self.assertIsInstance(app, Flask)
         self.assertIsInstance(app.dependencies, DependencyInjector)
+
+
+class TestErrorHandlers(TestCase):
+    def test_invalid_cursor_is_a_bad_request(self):
+        app = Flask(__name__)
+        setup_error_handlers(app)
+
+        @app.route("/list")
+        def list_items():
+            raise InvalidCursorError("Invalid cursor")
+
+        response = app.test_client().get("/list")
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TestUnitOfWork(TestCase):
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+        self.app.dependencies = MagicMock()
+        setup_unit_of_work(self.app)
+
+        @self.app.route("/ok")
+        def ok():
+            return "ok"
+
+        @self.app.route("/error")
+        def error():
+            raise ValueError
+
+        self.persistence = self.app.dependencies.persistence
+        self.client = self.app.test_client()
+
+    def test_unit_of_work_ended_once(self):
+        self.client.get("/ok")
+
+        self.persistence.begin_unit_of_work.assert_called_once()
+        self.assertEqual(
+            self.persistence.end_unit_of_work.mock_calls, [call(commit=True)]
+        )
+
+    def test_unit_of_work_rolled_back_once_on_error(self):
+        self.client.get("/error")
+
+        self.assertEqual(
+            self.persistence.end_unit_of_work.mock_calls, [call(commit=False)]
+        )
+
+
+class TestReadYourWrites(TestCase):
+    def test_written_reset_per_request(self):
+        app = Flask(__name__)
+        app.dependencies = MagicMock()
+        setup_read_your_writes(app)
+        app.route("/ok")(lambda: "ok")
+
+        for _ in range(2):
+            app.test_client().get("/ok")
+
+        self.assertEqual(app.dependencies.persistence.reset_written.call_count, 2)
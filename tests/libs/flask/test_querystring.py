@@ -2,7 +2,14 @@ from dataclasses import dataclass
 from datetime import date, datetime
 from unittest import TestCase
 
-from src.libs.hmi.querystring import Filter, Operations, QueryStringFilter
+from src.libs.hmi.querystring import (
+    DEFAULT_PAGE_SIZE,
+    Cursor,
+    Filter,
+    Operations,
+    QueryStringFilter,
+    normalize_filters,
+)
 
 
 class QSTestMixin(TestCase):
@@ -201,6 +208,17 @@ class TestQueryStringFilter(QSTestMixin):
         self.assertEqual(len(filters), 1)
         self.assertFilter(filters[0], "name", Operations.ISNULL, False)
 
+    def test_normalize_filters(self):
+        filters = QueryStringFilter("name_eq=val&limit=5&orderby=-name,id").get_filters()
+        same = QueryStringFilter("orderby=-name,id&limit=5&name_eq=val").get_filters()
+        other_order = QueryStringFilter("orderby=id,-name&name_eq=val&limit=5")
+
+        self.assertEqual(normalize_filters(filters), normalize_filters(same))
+        self.assertNotEqual(
+            normalize_filters(filters), normalize_filters(other_order.get_filters())
+        )
+        self.assertEqual(normalize_filters(None), [])
+
 
 @dataclass
 class TestDTO:
@@ -255,6 +273,21 @@ class TestQueryStringFilterLimited(QSTestMixin):
         )
         self.assertIsInstance(filters[0].value, datetime)
 
+    def test_fields_and_include(self):
+        qs = "fields=string,integer&include=opt_str"
+        qs_filter = QueryStringFilter(query_string=qs, dto=self.dto)
+        filters = qs_filter.get_filters()
+        self.assertEqual(len(filters), 3)
+        self.assertFilter(filters[0], "fields", Operations.FIELDS, "string")
+        self.assertFilter(filters[2], "include", Operations.INCLUDE, "opt_str")
+        self.assertEqual(qs_filter.get_fields(), ["string", "integer"])
+
+    def test_fields_out_of_dto_fields(self):
+        qs = "fields=name&include=foo"
+        qs_filter = QueryStringFilter(query_string=qs, dto=self.dto)
+        self.assertEqual(len(qs_filter.get_filters()), 0)
+        self.assertIsNone(qs_filter.get_fields())
+
     def test_cast_optional_date_from_dto(self):
         qs = "opt_datation_lt=2023-04-02"
         qs_filter = QueryStringFilter(query_string=qs, dto=self.dto)
@@ -264,3 +297,90 @@ class TestQueryStringFilterLimited(QSTestMixin):
             filters[0], "opt_datation", Operations.LT, date.fromisoformat("2023-04-02")
         )
         self.assertIsInstance(filters[0].value, date)
+
+
+class TestCursor(QSTestMixin):
+    def setUp(self) -> None:
+        super().setUp()
+        self.dto = TestDTO()
+        self.cursor = Cursor(
+            sort_keys=[("datation", False), ("id", True)],
+            values=[datetime.fromisoformat("2023-04-02T18:56:55+00:00"), "abc123"],
+        )
+
+    def test_encode_decode(self):
+        encoded = self.cursor.encode()
+        self.assertNotIn(",", encoded)
+        self.assertEqual(Cursor.decode(encoded), self.cursor)
+
+    def test_decode_invalid(self):
+        self.assertIsNone(Cursor.decode("not a cursor"))
+
+    def test_decode_not_signed(self):
+        body, _, signature = self.cursor.encode().partition(".")
+        forged = Cursor(sort_keys=self.cursor.sort_keys, values=[["a", "b"], "abc"])
+        forged_body, _, _ = forged.encode().partition(".")
+
+        self.assertIsNone(Cursor.decode(body))
+        self.assertIsNone(Cursor.decode(f"{forged_body}.{signature}"))
+
+    def test_after(self):
+        qs = f"orderby=-datation&after={self.cursor.encode()}"
+        qs_filter = QueryStringFilter(query_string=qs, dto=self.dto)
+        filters = qs_filter.get_filters()
+        self.assertEqual(len(filters), 2)
+        self.assertFilter(filters[1], "after", Operations.AFTER, self.cursor)
+
+    def test_before(self):
+        qs = f"before={self.cursor.encode()}"
+        qs_filter = QueryStringFilter(query_string=qs)
+        filters = qs_filter.get_filters()
+        self.assertEqual(len(filters), 1)
+        self.assertFilter(filters[0], "before", Operations.BEFORE, self.cursor)
+
+    def test_invalid_cursor_is_ignored(self):
+        qs = "after=foo"
+        qs_filter = QueryStringFilter(query_string=qs, dto=self.dto)
+        self.assertEqual(len(qs_filter.get_filters()), 0)
+
+    def test_get_next_cursor(self):
+        items = [
+            TestDTO(datation=datetime.fromisoformat("2023-04-02T18:56:55+00:00"))
+            for _ in range(2)
+        ]
+        for item in items:
+            item.id = "abc123"
+
+        qs_filter = QueryStringFilter(query_string="orderby=-datation&limit=2")
+        self.assertEqual(Cursor.decode(qs_filter.get_next_cursor(items)), self.cursor)
+
+    def test_get_next_cursor_without_filters(self):
+        items = [TestDTO() for _ in range(DEFAULT_PAGE_SIZE)]
+        for i, item in enumerate(items):
+            item.id = f"abc{i}"
+
+        qs_filter = QueryStringFilter(query_string="")
+        cursor = Cursor.decode(qs_filter.get_next_cursor(items))
+
+        self.assertEqual(cursor.sort_keys, [("id", True)])
+        self.assertEqual(cursor.values, [items[-1].id])
+
+    def test_no_next_cursor_on_last_page(self):
+        qs_filter = QueryStringFilter(query_string="orderby=-datation&limit=3")
+        self.assertIsNone(qs_filter.get_next_cursor([TestDTO()]))
+
+    def test_default_sort(self):
+        qs_filter = QueryStringFilter(query_string="", default_sort=("datation", False))
+        filters = qs_filter.get_filters()
+
+        self.assertEqual(len(filters), 1)
+        self.assertFilter(filters[0], "datation", Operations.DESC, "datation")
+
+    def test_default_sort_overridden(self):
+        qs_filter = QueryStringFilter(
+            query_string="orderby=id", default_sort=("datation", False)
+        )
+        filters = qs_filter.get_filters()
+
+        self.assertEqual(len(filters), 1)
+        self.assertFilter(filters[0], "id", Operations.ASC, "id")
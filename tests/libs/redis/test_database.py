@@ -1,4 +1,5 @@
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 
 from redis import Redis
 
@@ -21,6 +22,102 @@ class TestFakeCacheService(TestCase):
     def test_get_engine(self):
         self.assertIsInstance(self.cache_test.get_engine(), Redis)
 
+    def test_get_engine_shared(self):
+        engine = self.cache_test.get_engine()
+        self.assertIs(self.cache_test.get_engine(), engine)
+        self.assertIs(self.cache_test.get_session().redis, engine)
+        self.assertEqual(
+            engine.connection_pool.max_connections, self.cache_test.max_connections
+        )
+
+    def test_get_or_load(self):
+        loader = MagicMock(return_value=[{"id": 1}])
+
+        for _ in range(2):
+            value = self.cache_test.get_or_load(
+                "test:load", ["tenant_1", "tenant_2"], ["a eq 1"], loader, ttl=5
+            )
+            self.assertEqual(value, [{"id": 1}])
+        loader.assert_called_once()
+
+        # Other params or scopes are other entries
+        self.cache_test.get_or_load("test:load", ["tenant_1"], ["a eq 1"], loader, 5)
+        self.cache_test.get_or_load("test:load", ["tenant_1"], ["a eq 2"], loader, 5)
+        self.assertEqual(loader.call_count, 3)
+
+    def test_get_or_load_dump_and_load(self):
+        loader = MagicMock(return_value={1, 2})
+        self.cache_test.bump_versions("tenant_7")
+
+        for _ in range(2):
+            value = self.cache_test.get_or_load(
+                "test:dump", ["tenant_7"], None, loader, 5, dump=sorted, load=set
+            )
+            self.assertEqual(value, {1, 2})
+        loader.assert_called_once()
+
+    def test_bump_versions(self):
+        loader = MagicMock(return_value="value")
+        self.cache_test.get_or_load("test:bump", ["tenant_3"], None, loader, ttl=5)
+
+        versions = self.cache_test.get_versions(["tenant_3", "tenant_4"])
+        self.cache_test.bump_versions("tenant_3")
+        self.assertEqual(
+            self.cache_test.get_versions(["tenant_3", "tenant_4"]),
+            [versions[0] + 1, versions[1]],
+        )
+
+        self.cache_test.get_or_load("test:bump", ["tenant_3"], None, loader, ttl=5)
+        self.assertEqual(loader.call_count, 2)
+
+    @patch("src.libs.redis.database.CACHE_ENTRY_MAX_SIZE", 10)
+    def test_get_or_load_too_large(self):
+        loader = MagicMock(return_value="x" * 100)
+
+        for _ in range(2):
+            self.cache_test.get_or_load("test:large", ["tenant_5"], None, loader, 5)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_get_or_load_local_ttl(self):
+        loader = MagicMock(return_value={"a": 1})
+        self.cache_test.get_or_load(
+            "test:local", ["tenant_6"], None, loader, ttl=5, local_ttl=2
+        )
+
+        # Served from process memory while versions are the same
+        redis = self.cache_test.get_engine()
+        redis.delete(*redis.keys("cache:test:local:*"))
+        self.cache_test.get_or_load(
+            "test:local", ["tenant_6"], None, loader, ttl=5, local_ttl=2
+        )
+        loader.assert_called_once()
+
+        self.cache_test.bump_versions("tenant_6")
+        self.cache_test.get_or_load(
+            "test:local", ["tenant_6"], None, loader, ttl=5, local_ttl=2
+        )
+        self.assertEqual(loader.call_count, 2)
+
+    def test_get_engine_after_fork(self):
+        engine = self.cache_test.get_engine()
+
+        with patch("src.libs.redis.database.os.getpid", return_value=-1):
+            self.assertIsNot(self.cache_test.get_engine(), engine)
+
+    def test_get_pool_stats(self):
+        engine = self.cache_test.get_engine()
+        engine.ping()
+        engine.ping()
+
+        stats = self.cache_test.get_pool_stats()
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(stats["available"], 1)
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["checkouts"], 2)
+        for key in ["max_connections", "wait_time_total", "wait_time_max"]:
+            with self.subTest(key):
+                self.assertIn(key, stats)
+
     def test_get_session(self):
         self.assertIsInstance(self.cache_test.get_session(), CacheSession)
 
@@ -41,3 +138,41 @@ class TestFakeCacheService(TestCase):
         self.assertEqual(r.get("two"), b"2")
         self.assertEqual(r.get("three"), b"3")
         self.assertIsNone(r.get("four"))
+
+    def test_get_set_delete(self):
+        self.cache_test.set("test:key", {"foo": "bar"}, ttl=5)
+        self.assertIsNone(self.cache_test.local_cache.get("test:key"))
+        self.assertEqual(self.cache_test.get("test:key"), {"foo": "bar"})
+
+        self.cache_test.delete("test:key")
+        self.assertIsNone(self.cache_test.get("test:key"))
+
+    def test_local_ttl(self):
+        self.cache_test.set("test:local", [1, 2], ttl=5, local_ttl=2)
+        self.assertEqual(self.cache_test.local_cache.get("test:local"), [1, 2])
+
+        # Other processes fill their memory on first read
+        other_process = TestCacheService()
+        self.assertEqual(other_process.get("test:local"), [1, 2])
+        self.assertEqual(other_process.local_cache.get("test:local"), [1, 2])
+
+        self.cache_test.delete("test:local")
+        self.assertIsNone(self.cache_test.get("test:local"))
+
+    def test_scores(self):
+        self.cache_test.set_max_score("test:scores", "one", 10)
+        self.cache_test.set_max_score("test:scores", "one", 5)
+        self.cache_test.set_max_score("test:scores", "two", 20)
+
+        self.assertEqual(self.cache_test.get_score("test:scores", "one"), 10)
+        self.assertIsNone(self.cache_test.get_score("test:scores", "unknown"))
+        scores = self.cache_test.get_scores("test:scores")
+        self.assertEqual(scores, {"one": 10, "two": 20})
+
+        # A greater score set meanwhile is kept
+        self.cache_test.set_max_score("test:scores", "two", 30)
+        self.cache_test.remove_scores("test:scores", scores)
+        self.assertEqual(self.cache_test.get_scores("test:scores"), {"two": 30})
+
+        self.cache_test.remove_scores("test:scores", {"two": 30})
+        self.assertEqual(self.cache_test.get_scores("test:scores"), {})
@@ -0,0 +1,38 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.libs.redis.local_cache import LocalCache
+
+
+class TestLocalCache(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.local_cache = LocalCache(size=2)
+
+    def test_get_set(self):
+        self.assertIsNone(self.local_cache.get("key"))
+        self.local_cache.set("key", "value", ttl=10)
+        self.assertEqual(self.local_cache.get("key"), "value")
+
+    def test_expired(self):
+        with patch("src.libs.redis.local_cache.monotonic", return_value=100):
+            self.local_cache.set("key", "value", ttl=10)
+
+        with patch("src.libs.redis.local_cache.monotonic", return_value=110):
+            self.assertIsNone(self.local_cache.get("key"))
+        self.assertEqual(len(self.local_cache), 0)
+
+    def test_least_recently_used_is_dropped(self):
+        self.local_cache.set("one", 1, ttl=10)
+        self.local_cache.set("two", 2, ttl=10)
+        self.local_cache.get("one")
+        self.local_cache.set("three", 3, ttl=10)
+
+        self.assertEqual(self.local_cache.get("one"), 1)
+        self.assertIsNone(self.local_cache.get("two"))
+        self.assertEqual(self.local_cache.get("three"), 3)
+
+    def test_delete(self):
+        self.local_cache.set("one", 1, ttl=10)
+        self.local_cache.delete("one", "unknown")
+        self.assertIsNone(self.local_cache.get("one"))
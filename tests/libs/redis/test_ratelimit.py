@@ -1,8 +1,14 @@
 from datetime import timedelta
 from unittest import TestCase
+from unittest.mock import patch
 
 from src.libs.redis.database import TestCacheService
-from src.libs.redis.ratelimit import LimitExceededError, RateLimit
+from src.libs.redis.ratelimit import (
+    LimitExceededError,
+    RateLimit,
+    RateLimitAlgorithm,
+    RateLimitResult,
+)
 
 
 class TestRateLimit(TestCase):
@@ -30,3 +36,46 @@ class TestRateLimit(TestCase):
         rl()
         with self.assertRaises(LimitExceededError):
             rl()
+
+    def test_algorithms_over_limit(self):
+        for algorithm in RateLimitAlgorithm:
+            with self.subTest(algorithm):
+                rl = RateLimit(
+                    self.redis, "::2", "/algo", 3, timedelta(seconds=10), algorithm
+                )
+                results = [rl.check() for _ in range(4)]
+
+                self.assertEqual([r.allowed for r in results], [True] * 3 + [False])
+                self.assertEqual([r.remaining for r in results], [2, 1, 0, 0])
+                self.assertGreater(results[-1].retry_after, 0)
+                self.redis.delete(rl.key)
+
+    def test_result_on_call(self):
+        rl = RateLimit(self.redis, "::3", "/result", 1, timedelta(seconds=10))
+        rl()
+        self.assertTrue(rl.result.allowed)
+
+        with self.assertRaises(LimitExceededError):
+            rl()
+        self.assertFalse(rl.result.allowed)
+        self.redis.delete(rl.key)
+
+    def test_scripts_registered_once(self):
+        rl = RateLimit(self.redis, "::4", "/scripts", 5, timedelta(seconds=10))
+
+        with patch.object(self.redis, "register_script") as register_script:
+            rl.check()
+            rl.check()
+
+        register_script.assert_not_called()
+        self.redis.delete(rl.key)
+
+    def test_result_headers(self):
+        allowed = RateLimitResult(allowed=True, limit=5, remaining=4, retry_after=0)
+        self.assertEqual(
+            allowed.get_headers(),
+            {"X-RateLimit-Limit": "5", "X-RateLimit-Remaining": "4"},
+        )
+
+        denied = RateLimitResult(allowed=False, limit=5, remaining=0, retry_after=2.1)
+        self.assertEqual(denied.get_headers()["Retry-After"], "3")
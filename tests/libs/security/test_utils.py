@@ -1,6 +1,18 @@
+from threading import Event, Thread
 from unittest import TestCase
 
-from src.libs.security.utils import file_to_base64
+from argon2 import PasswordHasher
+
+from src.libs.security.utils import (
+    HashingExecutor,
+    HashingOverloadError,
+    check_password,
+    file_to_base64,
+    hash_from_password,
+    load_signed_payload,
+    password_needs_rehash,
+    sign_payload,
+)
 
 
 class TestFileBase64(TestCase):
@@ -12,3 +24,55 @@ class TestFileBase64(TestCase):
         result = file_to_base64(file_name)
         self.assertIn(expected, result)
         self.assertTrue(result.startswith(expected))
+
+
+class TestPasswordHashing(TestCase):
+    def test_hash_and_check(self):
+        hash = hash_from_password("aB#1234aB#1234")
+        self.assertTrue(check_password(hash, "aB#1234aB#1234"))
+        self.assertFalse(check_password(hash, "abc_123"))
+        self.assertFalse(password_needs_rehash(hash))
+
+    def test_needs_rehash_with_other_parameters(self):
+        hash = PasswordHasher(time_cost=1, memory_cost=8 * 1024).hash("abc_123")
+        self.assertTrue(password_needs_rehash(hash))
+
+    def test_executor_overload(self):
+        executor = HashingExecutor(max_workers=1, timeout=0.01)
+        started, release = Event(), Event()
+
+        def busy():
+            started.set()
+            release.wait()
+
+        thread = Thread(target=executor.run, args=(busy,))
+        thread.start()
+        started.wait()
+
+        with self.assertRaises(HashingOverloadError):
+            executor.run(sum, [1, 2])
+
+        release.set()
+        thread.join()
+        self.assertEqual(executor.run(sum, [1, 2]), 3)
+
+
+class TestSignedPayload(TestCase):
+    def test_sign_and_load(self):
+        payload = {"tid": "abc", "exp": 123}
+
+        signed = sign_payload(payload, "secret")
+
+        self.assertEqual(load_signed_payload(signed, "secret"), payload)
+
+    def test_load_with_other_secret(self):
+        signed = sign_payload({"tid": "abc"}, "secret")
+
+        self.assertIsNone(load_signed_payload(signed, "other_secret"))
+
+    def test_load_tampered_payload(self):
+        body, signature = sign_payload({"tid": "abc"}, "secret").split(".")
+        other_body = sign_payload({"tid": "xyz"}, "secret").split(".")[0]
+
+        self.assertIsNone(load_signed_payload(f"{other_body}.{signature}", "secret"))
+        self.assertIsNone(load_signed_payload(body, "secret"))
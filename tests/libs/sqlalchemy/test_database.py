@@ -1,14 +1,17 @@
 from unittest import TestCase
 from unittest.mock import patch
 
-from sqlalchemy import Engine
+from sqlalchemy import Engine, update
 from sqlalchemy.orm import Session
 
 from src.libs.sqlalchemy.database import (
     PersistenceService,
+    ReadOnlySQLSession,
+    SharedSQLSession,
     SQLSession,
     TestPersistenceService,
 )
+from src.users.models import User
 from tests.utils.db_utils import check_connection_query
 
 
@@ -32,12 +35,179 @@ class TestFakePersistenceService(TestCase):
     def test_get_engine(self):
         self.assertIsInstance(self.sql_test.get_engine(), Engine)
 
+    def test_get_engine_is_shared(self):
+        self.assertIs(self.sql_test.get_engine(), self.sql_test.get_engine())
+
+    def test_get_engine_after_fork(self):
+        engine = self.sql_test.get_engine()
+        pool = engine.pool
+
+        with patch("src.libs.sqlalchemy.database.os.getpid", return_value=-1):
+            self.assertIs(self.sql_test.get_engine(), engine)
+            self.assertIsNot(engine.pool, pool)
+
+    def test_get_pool_stats(self):
+        with self.sql_test.get_session() as session:
+            session.execute(check_connection_query())
+            stats = self.sql_test.get_pool_stats()
+            self.assertEqual(stats["checked_out"], 1)
+
+        stats = self.sql_test.get_pool_stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertGreaterEqual(stats["checkouts"], 1)
+        for key in ["size", "checked_in", "overflow", "wait_time_total"]:
+            with self.subTest(key):
+                self.assertIn(key, stats)
+
     def test_get_session(self):
         sql_session = self.sql_test.get_session()
         self.assertIsInstance(sql_session, SQLSession)
         with sql_session as session:
             self.assertIsInstance(session, Session)
 
+    def test_unit_of_work_share_session(self):
+        with self.sql_test.unit_of_work():
+            sql_session = self.sql_test.get_session()
+            self.assertIsInstance(sql_session, SharedSQLSession)
+
+            with sql_session as session_1, self.sql_test.get_session() as session_2:
+                self.assertIs(session_1, session_2)
+                session_1.execute(check_connection_query())
+
+            self.assertEqual(self.sql_test.get_pool_stats()["checked_out"], 1)
+
+        self.assertEqual(self.sql_test.get_pool_stats()["checked_out"], 0)
+        self.assertNotIsInstance(self.sql_test.get_session(), SharedSQLSession)
+
+    def test_unit_of_work_rollback(self):
+        with self.assertRaises(ValueError):
+            with self.sql_test.unit_of_work():
+                with self.sql_test.get_session() as session:
+                    session.execute(check_connection_query())
+                    with patch.object(session, "commit") as mock_commit:
+                        raise ValueError()
+
+        mock_commit.assert_not_called()
+        self.assertNotIsInstance(self.sql_test.get_session(), SharedSQLSession)
+
+    def test_nested_unit_of_work(self):
+        self.sql_test.begin_unit_of_work()
+        self.sql_test.begin_unit_of_work()
+        with self.sql_test.get_session() as session_1:
+            pass
+
+        self.sql_test.end_unit_of_work(commit=True)
+        with self.sql_test.get_session() as session_2:
+            self.assertIs(session_1, session_2)
+
+        self.sql_test.end_unit_of_work(commit=True)
+        self.assertNotIsInstance(self.sql_test.get_session(), SharedSQLSession)
+
+    def test_readonly_session_without_replica(self):
+        sql_session = self.sql_test.get_session(readonly=True)
+        self.assertNotIsInstance(sql_session, ReadOnlySQLSession)
+        sql_session.close()
+
+    def test_readonly_session_round_robin(self):
+        sql_replica = TestPersistenceService()
+        test_url = sql_replica.get_database_url()
+        with patch.object(
+            sql_replica, "get_replica_urls", return_value=[test_url, test_url]
+        ):
+            sessions = [sql_replica.get_session(readonly=True) for _ in range(3)]
+
+        self.assertEqual(len(sql_replica._replica_engines), 2)
+        for sql_session in sessions:
+            self.assertIsInstance(sql_session, ReadOnlySQLSession)
+            sql_session.close()
+
+        binds = [sql_session.session.bind for sql_session in sessions]
+        self.assertIsNot(binds[0], binds[1])
+        self.assertIs(binds[0], binds[2])
+        self.assertNotIn(sql_replica.get_engine(), binds)
+
+    def test_readonly_session_least_connections(self):
+        sql_replica = TestPersistenceService(replica_strategy="least_connections")
+        test_url = sql_replica.get_database_url()
+        with patch.object(
+            sql_replica, "get_replica_urls", return_value=[test_url, test_url]
+        ):
+            with sql_replica.get_session(readonly=True) as session_1:
+                session_1.execute(check_connection_query())
+                with sql_replica.get_session(readonly=True) as session_2:
+                    self.assertIsNot(session_1.bind, session_2.bind)
+
+    def test_read_your_writes(self):
+        sql_replica = TestPersistenceService()
+        test_url = sql_replica.get_database_url()
+        with patch.object(sql_replica, "get_replica_urls", return_value=[test_url]):
+            with sql_replica.unit_of_work():
+                with sql_replica.get_session(readonly=True) as session:
+                    replica_session = session
+
+                with sql_replica.get_session() as session:
+                    primary_session = session
+                    session.execute(
+                        update(User).where(User.id == "unknown").values(first_name="")
+                    )
+
+                with sql_replica.get_session(readonly=True) as session:
+                    self.assertIsNot(replica_session, primary_session)
+                    self.assertIs(session, primary_session)
+
+            with sql_replica.unit_of_work():
+                with sql_replica.get_session(readonly=True) as session:
+                    self.assertIsNot(session, primary_session)
+
+    def test_read_your_writes_without_unit_of_work(self):
+        sql_replica = TestPersistenceService()
+        test_url = sql_replica.get_database_url()
+        with patch.object(sql_replica, "get_replica_urls", return_value=[test_url]):
+            with sql_replica.get_session() as session:
+                session.execute(
+                    update(User).where(User.id == "unknown").values(first_name="")
+                )
+
+            sql_session = sql_replica.get_session(readonly=True)
+            self.assertNotIsInstance(sql_session, ReadOnlySQLSession)
+            sql_session.close()
+
+            # Next request or task
+            sql_replica.reset_written()
+            sql_session = sql_replica.get_session(readonly=True)
+            self.assertIsInstance(sql_session, ReadOnlySQLSession)
+            sql_session.close()
+
+    def test_after_commit(self):
+        calls = []
+        with self.sql_test.get_session() as session:
+            session.execute(check_connection_query())
+            self.sql_test.after_commit(session, calls.append, "committed")
+            self.assertEqual(calls, [])
+
+        self.assertEqual(calls, ["committed"])
+
+    def test_after_commit_dropped_on_rollback(self):
+        calls = []
+        with self.sql_test.unit_of_work():
+            with self.sql_test.get_session() as session:
+                session.execute(check_connection_query())
+                self.sql_test.after_commit(session, calls.append, "rollback")
+                session.rollback()
+
+        self.assertEqual(calls, [])
+
+    def test_query_stats(self):
+        self.sql_test.begin_query_stats()
+        with self.sql_test.get_session() as session:
+            session.execute(check_connection_query())
+            session.execute(check_connection_query())
+        query_stats = self.sql_test.end_query_stats()
+
+        self.assertEqual(query_stats.count, 2)
+        self.assertEqual(query_stats.get_max_repeat(), 2)
+        self.assertIsNone(self.sql_test.end_query_stats())
+
     def test_db_connection(self):
         with Session(self.sql_test.get_engine()) as session:
             result = session.execute(check_connection_query()).scalar_one_or_none()
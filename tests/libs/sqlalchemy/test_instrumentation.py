@@ -0,0 +1,72 @@
+from logging import getLogger
+from unittest import TestCase
+
+from src.libs.sqlalchemy.instrumentation import QueryStats, log_query_stats
+
+logger = getLogger(__name__)
+
+
+class TestQueryStats(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.query_stats = QueryStats()
+
+    def test_add(self):
+        self.query_stats.add("SELECT 1", 0.002)
+        self.query_stats.add("SELECT 2", 0.003)
+
+        self.assertEqual(self.query_stats.count, 2)
+        self.assertAlmostEqual(self.query_stats.duration, 0.005)
+        self.assertEqual(self.query_stats.get_max_repeat(), 1)
+        self.assertDictEqual(self.query_stats.get_duplicates(), {})
+
+    def test_duplicates(self):
+        for _ in range(3):
+            self.query_stats.add("SELECT * FROM tags WHERE id = %(id_1)s", 0.001)
+        self.query_stats.add("SELECT 1", 0.001)
+
+        self.assertEqual(self.query_stats.get_max_repeat(), 3)
+        self.assertDictEqual(
+            self.query_stats.get_duplicates(),
+            {"SELECT * FROM tags WHERE id = %(id_1)s": 3},
+        )
+        self.assertDictEqual(self.query_stats.get_duplicates(min_repeat=4), {})
+
+    def test_parent(self):
+        child = QueryStats(parent=self.query_stats)
+        child.add("SELECT 1", 0.001)
+
+        self.assertEqual(child.count, 1)
+        self.assertEqual(self.query_stats.count, 1)
+
+    def test_server_timing(self):
+        self.query_stats.add("SELECT 1", 0.0123)
+
+        self.assertEqual(
+            self.query_stats.get_server_timing(), 'db;dur=12.3;desc="1 queries"'
+        )
+
+    def test_log_fields(self):
+        self.query_stats.add("SELECT 1", 0.0123)
+        self.query_stats.add("SELECT 1", 0.001)
+
+        self.assertDictEqual(
+            self.query_stats.get_log_fields(),
+            {
+                "db_queries": 2,
+                "db_time_ms": 13.3,
+                "db_duplicated_shapes": 1,
+                "db_max_repeat": 2,
+            },
+        )
+
+    def test_log_query_stats_warn_repeats(self):
+        for _ in range(5):
+            self.query_stats.add("SELECT 1", 0.001)
+
+        with self.assertLogs(logger, level="INFO") as cm:
+            log_query_stats(logger, "GET /", self.query_stats, repeat_warning=5)
+
+        self.assertEqual(len(cm.records), 2)
+        self.assertEqual(cm.records[0].db_queries, 5)
+        self.assertEqual(cm.records[1].levelname, "WARNING")
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+
+from src.events.persistence.sqlalchemy import EventDB
+from src.libs.hmi.querystring import QueryStringFilter
+from src.notifications.persistence.sqlalchemy.adapters import SubscriptionDB
+from src.tasks.persistence.sqlalchemy import TagDB, TaskDB
+from src.users.persistence.sqlalchemy import TokenDB
+from tests.base_test import BaseTestCase
+from tests.utils.db_utils import capture_statements
+
+SEED_QUERIES = [
+    """
+    INSERT INTO users (id, first_name, last_name, email, locale, timezone, created_at)
+    SELECT 'plan_user_' || i, 'Plan', 'User', 'plan_user_' || i || '@plan.test',
+        'fr', 'Europe/Paris', now()
+    FROM generate_series(1, 100) i;
+    """,
+    """
+    INSERT INTO tokens (id, created_at, last_activity_at, temp, sha_token, user_id)
+    SELECT 'plan_token_' || i, now(), now(), i % 10 = 0, md5('plan_token_' || i),
+        'plan_user_' || (i % 100 + 1)
+    FROM generate_series(1, 20000) i;
+    """,
+    """
+    INSERT INTO contacts (id, created_at, updated_at, first_name, last_name,
+        locale, timezone, email, telegram, phone_number)
+    SELECT 'plan_contact_' || i, now(), now(), 'Plan', 'Contact', 'fr',
+        'Europe/Paris', 'plan_contact_' || i || '@plan.test', '', ''
+    FROM generate_series(1, 400) i;
+    """,
+    """
+    INSERT INTO subscriptions (id, created_at, updated_at, contact_id, name, type)
+    SELECT 'plan_subscription_' || i, now(), now(), 'plan_contact_' || (i / 50 + 1),
+        'plan:event:' || (i % 50), 'EMAIL'::messagetype
+    FROM generate_series(0, 19999) i;
+    """,
+    """
+    INSERT INTO events (id, created_at, tenant_id, name, data)
+    SELECT 'plan_event_' || i, now() - i * interval '1 minute',
+        'plan_tenant_' || (i % 200), 'plan:event', '{}'::json
+    FROM generate_series(1, 20000) i;
+    """,
+    """
+    INSERT INTO tags (id, created_at, tenant_id, title)
+    SELECT 'plan_tag_' || i, now(), 'plan_tenant_' || (i % 200), 'Plan tag'
+    FROM generate_series(1, 20000) i;
+    """,
+    """
+    INSERT INTO tasks (id, created_at, tenant_id, title, description, emergency,
+        important, scheduled_at, assigned_to)
+    SELECT 'plan_task_' || i, now(), 'plan_tenant_' || (i % 200), 'Plan task', '',
+        false, false,
+        CASE WHEN i % 4 = 0 THEN now() + i * interval '1 minute' END,
+        'plan_user_' || (i % 100 + 1)
+    FROM generate_series(1, 20000) i;
+    """,
+    "ANALYZE users, tokens, contacts, subscriptions, events, tags, tasks;",
+]
+
+CLEAN_QUERIES = [
+    "DELETE FROM tokens WHERE id LIKE 'plan_token_%';",
+    "DELETE FROM users WHERE id LIKE 'plan_user_%';",
+    "DELETE FROM subscriptions WHERE id LIKE 'plan_subscription_%';",
+    "DELETE FROM contacts WHERE id LIKE 'plan_contact_%';",
+    "DELETE FROM events WHERE id LIKE 'plan_event_%';",
+    "DELETE FROM tags WHERE id LIKE 'plan_tag_%';",
+    "DELETE FROM tasks WHERE id LIKE 'plan_task_%';",
+]
+
+
+class TestQueryPlans(BaseTestCase):
+    """Hot queries must be served by an index, not by a sequential scan"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        with cls.app.dependencies.persistence.get_session() as session:
+            for query in SEED_QUERIES:
+                session.execute(text(query))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        with cls.app.dependencies.persistence.get_session() as session:
+            for query in CLEAN_QUERIES:
+                session.execute(text(query))
+        super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.engine = self.app.dependencies.persistence.get_engine()
+        self.now = datetime.now(tz=ZoneInfo("UTC"))
+
+    def test_tenant_tasks(self):
+        task_db = TaskDB()
+        filters = QueryStringFilter("limit=20").get_filters()
+
+        with self.app.dependencies.persistence.get_session() as session:
+            with capture_statements(self.engine) as statements:
+                task_db.tasks(session, tenant_ids=["plan_tenant_1"], filters=filters)
+
+            self.assertNoSeqScan(session, statements, ["tasks", "taskstags"])
+
+    def test_tenant_tags(self):
+        tag_db = TagDB()
+
+        with self.app.dependencies.persistence.get_session() as session:
+            with capture_statements(self.engine) as statements:
+                tag_db.tags(session, tenant_ids=["plan_tenant_1"])
+
+            self.assertNoSeqScan(session, statements, ["tags", "taskstags"])
+
+    def test_daily_digest_tasks(self):
+        task_db = TaskDB()
+        start, end = self.now, self.now + timedelta(days=1)
+
+        with self.app.dependencies.persistence.get_session() as session:
+            with capture_statements(self.engine) as statements:
+                ids = task_db.all_assigned_to_for_scheduled_between(
+                    session, start=start, end=end
+                )
+                task_db.get_tasks_assigned_to_and_scheduled_between(
+                    session, ids=ids[:5], start=start, end=end
+                )
+
+            self.assertNoSeqScan(session, statements, ["tasks"])
+
+    def test_tenant_events(self):
+        event_db = EventDB()
+
+        with self.app.dependencies.persistence.get_session() as session:
+            with capture_statements(self.engine) as statements:
+                event_db.get_all_from_tenant(session, tenant_id="plan_tenant_1")
+
+            self.assertNoSeqScan(session, statements, ["events"])
+
+    def test_event_subscriptions(self):
+        subscription_db = SubscriptionDB()
+
+        with self.app.dependencies.persistence.get_session() as session:
+            with capture_statements(self.engine) as statements:
+                subscription_db.get_subscriptions_for_event(
+                    session, name="plan:event:1", targets=["plan_contact_1"]
+                )
+
+            self.assertNoSeqScan(session, statements, ["subscriptions"])
+
+    def test_expired_tokens_cleanup(self):
+        token_db = TokenDB()
+
+        with self.app.dependencies.persistence.get_session() as session:
+            with capture_statements(self.engine) as statements:
+                token_db.clean_expired(session)
+
+            self.assertNoSeqScan(session, statements, ["tokens"])
+            session.rollback()
@@ -1,12 +1,19 @@
 from dataclasses import dataclass
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from sqlalchemy import Column, Integer, String, Table
 
-from src.libs.hmi.querystring import QueryStringFilter
+from src.libs.hmi.querystring import (
+    DEFAULT_PAGE_SIZE,
+    Cursor,
+    InvalidCursorError,
+    QueryStringFilter,
+)
 from src.libs.sqlalchemy.base import mapper_registry
-from src.libs.sqlalchemy.queryset import Queryset
+from src.libs.sqlalchemy.queryset import Queryset, statement_cache
+from src.users.hmi.dto import RoleDTO
+from src.users.models import Role
 
 
 @dataclass
@@ -35,8 +42,7 @@ mapper_registry.map_imperatively(
 class TestQueryset(TestCase):
     def setUp(self) -> None:
         super().setUp()
-        self.queryset = Queryset(TestUser)
-        self.queryset.select()
+        self.queryset = Queryset(TestUser).select()
 
     def assertInStatment(self, stmt: str, *args: str):
         for arg in args:
@@ -49,160 +55,219 @@ class TestQueryset(TestCase):
                 self.assertNotIn(arg, stmt)
 
     def test_options(self):
-        self.queryset._query.options = MagicMock()
-        tested = self.queryset._query.options
-        result = self.queryset.options(test_name="test_value")
+        option = MagicMock()
+        with patch("src.libs.sqlalchemy.queryset.select") as mock_select:
+            qs = self.queryset.options(option)
+            tested = mock_select.return_value.options
+            qs.statement
+
+        tested.assert_called_once_with(option)
+        self.assertIsInstance(qs, Queryset)
+        self.assertIsNot(qs, self.queryset)
+        self.assertIsNone(qs.shape)
+
+    def test_immutable(self):
+        qs = self.queryset.id("abc")
+
+        self.assertIsNot(qs, self.queryset)
+        self.assertNotIn("WHERE", str(self.queryset.statement))
+        self.assertInStatment(str(qs.statement), "WHERE", "test_user.id = :qs_id_1")
+        self.assertEqual(qs.params, {"qs_id_1": "abc"})
+        self.assertEqual(self.queryset.params, {})
+
+    def test_statement_cache(self):
+        statement_cache.clear()
+        qs_1 = self.queryset.id("abc").order_by(name="ASC")
+        qs_2 = self.queryset.id("def").order_by(name="ASC")
+
+        self.assertEqual(qs_1.shape, qs_2.shape)
+        self.assertIs(qs_1.statement, qs_2.statement)
+        self.assertNotEqual(qs_1.params, qs_2.params)
+        self.assertEqual(statement_cache.get_stats()["hits"], 1)
+
+    def test_statement_cache_different_shapes(self):
+        qs_1 = self.queryset.id("abc").order_by(name="ASC")
+        qs_2 = self.queryset.id("abc").order_by(name="DESC")
+        qs_3 = self.queryset.ids(["abc"]).order_by(name="ASC")
+
+        self.assertNotEqual(qs_1.shape, qs_2.shape)
+        self.assertNotEqual(qs_1.shape, qs_3.shape)
+        self.assertIsNot(qs_1.statement, qs_2.statement)
+
+    def test_where_is_not_cached(self):
+        qs = self.queryset.where(TestUser.age > 18)
+        self.assertIsNone(qs.shape)
+        self.assertIsNot(qs.statement, qs.statement)
+
+    def test_filter_by(self):
+        qs = self.queryset.filter_by(name="val", age=42)
+        self.assertInStatment(
+            str(qs.statement), "test_user.name = :qs_name_1", "test_user.age = :qs_age_2"
+        )
+        self.assertEqual(qs.params, {"qs_name_1": "val", "qs_age_2": 42})
 
-        tested.assert_called_once_with(test_name="test_value")
-        self.assertIsInstance(result, Queryset)
-        self.assertIs(result, self.queryset)
+    def test_bind(self):
+        qs = self.queryset.filter_by(name="").ids([])
 
-    def test_page(self):
-        self.queryset.page(2)
-        self.assertInStatment(
-            str(self.queryset.statement), "SELECT", "FROM", "OFFSET", "LIMIT"
+        self.assertEqual(
+            qs.bind(name="val", ids=("abc", "def")),
+            {"qs_name_1": "val", "qs_ids_2": ["abc", "def"]},
         )
-        self.assertNotIn(str(self.queryset.statement), "WHERE")
+        self.assertEqual(qs.params, {"qs_name_1": "", "qs_ids_2": []})
+
+    def test_bind_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            self.queryset.id("").bind(name="val")
+
+    def test_exists(self):
+        qs = self.queryset.exists().id("abc")
 
-    def test_order_by_asc(self):
-        self.queryset.order_by(name="ASC")
         self.assertInStatment(
-            str(self.queryset.statement), "ORDER BY test_user.name ASC"
+            str(qs.statement), "SELECT EXISTS (SELECT", "test_user.id = :qs_id_1"
         )
+        self.assertEqual(qs.params, {"qs_id_1": "abc"})
+
+    def test_page(self):
+        qs = self.queryset.page(2)
+        self.assertInStatment(str(qs.statement), "SELECT", "FROM", "OFFSET", "LIMIT")
+        self.assertNotIn(str(qs.statement), "WHERE")
+
+    def test_order_by_asc(self):
+        qs = self.queryset.order_by(name="ASC")
+        self.assertInStatment(str(qs.statement), "ORDER BY test_user.name ASC")
 
     def test_order_by_desc(self):
-        self.queryset.order_by(age="DESC")
-        self.assertInStatment(
-            str(self.queryset.statement), "ORDER BY test_user.age DESC"
-        )
+        qs = self.queryset.order_by(age="DESC")
+        self.assertInStatment(str(qs.statement), "ORDER BY test_user.age DESC")
 
     def test_limit(self):
-        self.queryset.limit(42)
-        self.assertInStatment(str(self.queryset.statement), "LIMIT")
+        qs = self.queryset.limit(42)
+        self.assertInStatment(str(qs.statement), "LIMIT")
 
     def test_filter_EQ(self):
         qsf = QueryStringFilter("name_eq=val")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.name = :name_1")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.name = :qs_name_1")
 
     def test_filter_NEQ(self):
         qsf = QueryStringFilter("name_neq=val")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.name != :name_1")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.name != :qs_name_1")
 
     def test_filter_LT(self):
         qsf = QueryStringFilter("age_lt=42")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.age < :age_1")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.age < :qs_age_1")
 
     def test_filter_LTE(self):
         qsf = QueryStringFilter("age_lte=42")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.age <= :age_1")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.age <= :qs_age_1")
 
     def test_filter_GT(self):
         qsf = QueryStringFilter("age_gt=42")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.age > :age_1")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.age > :qs_age_1")
 
     def test_filter_GTE(self):
         qsf = QueryStringFilter("age_gte=42")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.age >= :age_1")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.age >= :qs_age_1")
 
     def test_filter_CONTAINS(self):
         qsf = QueryStringFilter("name_contains=val")
-        self.queryset.from_filters(qsf.get_filters())
+        qs = self.queryset.from_filters(qsf.get_filters())
         self.assertInStatment(
-            str(self.queryset.statement), "test_user.name LIKE '%' || :name_1 || '%'"
+            str(qs.statement), "test_user.name LIKE '%' || :qs_name_1 || '%'"
         )
 
     def test_filter_NCONTAINS(self):
         qsf = QueryStringFilter("name_ncontains=val")
-        self.queryset.from_filters(qsf.get_filters())
+        qs = self.queryset.from_filters(qsf.get_filters())
         self.assertInStatment(
-            str(self.queryset.statement), "test_user.name NOT LIKE '%' || :name_1 || '%'"
+            str(qs.statement), "test_user.name NOT LIKE '%' || :qs_name_1 || '%'"
         )
 
     def test_filter_STARTSWITH(self):
         qsf = QueryStringFilter("name_startswith=val")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(
-            str(self.queryset.statement), "test_user.name LIKE :name_1 || '%'"
-        )
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.name LIKE :qs_name_1 || '%'")
 
     def test_filter_NSTARTSWITH(self):
         qsf = QueryStringFilter("name_nstartswith=val")
-        self.queryset.from_filters(qsf.get_filters())
+        qs = self.queryset.from_filters(qsf.get_filters())
         self.assertInStatment(
-            str(self.queryset.statement), "test_user.name NOT LIKE :name_1 || '%'"
+            str(qs.statement), "test_user.name NOT LIKE :qs_name_1 || '%'"
         )
 
     def test_filter_ENDSWITH(self):
         qsf = QueryStringFilter("name_endswith=val")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(
-            str(self.queryset.statement), "test_user.name LIKE '%' || :name_1"
-        )
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.name LIKE '%' || :qs_name_1")
 
     def test_filter_NENDSWITH(self):
         qsf = QueryStringFilter("name_nendswith=val")
-        self.queryset.from_filters(qsf.get_filters())
+        qs = self.queryset.from_filters(qsf.get_filters())
         self.assertInStatment(
-            str(self.queryset.statement), "test_user.name NOT LIKE '%' || :name_1"
+            str(qs.statement), "test_user.name NOT LIKE '%' || :qs_name_1"
         )
 
     def test_filter_IN(self):
         qsf = QueryStringFilter("name_in=val")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.name IN")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.name IN")
 
     def test_filter_NIN(self):
         qsf = QueryStringFilter("name_nin=val")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.name NOT IN")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.name NOT IN")
 
     def test_filter_ISNULL(self):
         qsf = QueryStringFilter("name_isnull=t")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.name IS NULL")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.name IS NULL")
 
     def test_filter_not_ISNULL(self):
         qsf = QueryStringFilter("name_isnull=0")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "test_user.name IS NOT NULL")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "test_user.name IS NOT NULL")
 
     def test_filter_order_by_asc(self):
         qsf = QueryStringFilter("orderby=name")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(
-            str(self.queryset.statement), "ORDER BY test_user.name ASC"
-        )
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "ORDER BY test_user.name ASC")
 
     def test_filter_order_by_desc(self):
         qsf = QueryStringFilter("orderby=-name")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(
-            str(self.queryset.statement), "ORDER BY test_user.name DESC"
-        )
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "ORDER BY test_user.name DESC")
 
     def test_filter_limit(self):
         qsf = QueryStringFilter("limit=42")
-        self.queryset.from_filters(qsf.get_filters())
-        self.assertInStatment(str(self.queryset.statement), "LIMIT :param_1")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "LIMIT :qs_param_1")
 
     def test_filter_offset(self):
         qsf = QueryStringFilter("offset=42")
-        self.queryset.from_filters(qsf.get_filters())
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "LIMIT :qs_param_1 OFFSET :qs_offset_2")
+
+    def test_from_empty_filters(self):
+        qs = self.queryset.from_filters([])
         self.assertInStatment(
-            str(self.queryset.statement), "LIMIT :param_1 OFFSET :param_2"
+            str(qs.statement), "ORDER BY test_user.id ASC", "LIMIT :qs_param_1"
         )
+        self.assertEqual(qs.params["qs_param_1"], DEFAULT_PAGE_SIZE)
+
+    def test_from_no_filters(self):
+        qs = self.queryset.from_filters(None)
+        self.assertNotIn("LIMIT", str(qs.statement))
 
     def test_from_filters(self):
         qsf = QueryStringFilter("name_in=val,bou&orderby=-name&age_gte=18&page=2")
-        self.queryset.from_filters(qsf.get_filters())
+        qs = self.queryset.from_filters(qsf.get_filters())
         self.assertInStatment(
-            str(self.queryset.statement),
+            str(qs.statement),
             "SELECT",
             "FROM",
             "WHERE",
@@ -211,3 +276,80 @@ class TestQueryset(TestCase):
             "OFFSET",
             "LIMIT",
         )
+
+    def test_filter_order_by_id_tiebreaker(self):
+        qsf = QueryStringFilter("orderby=name")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(
+            str(qs.statement), "ORDER BY test_user.name ASC, test_user.id ASC"
+        )
+
+    def test_filter_after_cursor(self):
+        cursor = Cursor(sort_keys=[("age", False), ("id", True)], values=[18, "abc"])
+        qsf = QueryStringFilter(f"orderby=-age&offset=42&after={cursor.encode()}")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(
+            str(qs.statement),
+            "WHERE test_user.age < :qs_key0_1",
+            "OR test_user.age = :qs_key0_1 AND (test_user.id > :qs_key1_2",
+            "ORDER BY test_user.age DESC, test_user.id ASC",
+        )
+        self.assertEqual(qs.params["qs_offset_4"], 0)
+
+    def test_filter_after_cursor_with_null(self):
+        cursor = Cursor(sort_keys=[("fullname", True), ("id", True)], values=[None, "a"])
+        qsf = QueryStringFilter(f"orderby=fullname&after={cursor.encode()}")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(
+            str(qs.statement),
+            "test_user.fullname IS NULL AND (test_user.id > :qs_key1_1",
+        )
+        self.assertNotIn("key0", qs.params)
+
+    def test_filter_before_cursor(self):
+        cursor = Cursor(sort_keys=[("name", True), ("id", True)], values=["val", "a"])
+        qsf = QueryStringFilter(f"orderby=name&before={cursor.encode()}")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertInStatment(
+            str(qs.statement),
+            "WHERE test_user.name < :qs_key0_1",
+            "ORDER BY test_user.name DESC, test_user.id DESC",
+            "ORDER BY anon_1.name ASC, anon_1.id ASC",
+        )
+
+    def test_filter_cursor_of_other_order_is_ignored(self):
+        cursor = Cursor(sort_keys=[("name", True), ("id", True)], values=["val", "a"])
+        qsf = QueryStringFilter(f"orderby=-age&after={cursor.encode()}")
+        qs = self.queryset.from_filters(qsf.get_filters())
+        self.assertNotIn("key0", str(qs.statement))
+
+    def test_filter_cursor_values_of_other_types(self):
+        for values in [["18", "a"], [18.5, "a"], [True, "a"], [[18, 19], "a"]]:
+            with self.subTest(values):
+                cursor = Cursor(sort_keys=[("age", False), ("id", True)], values=values)
+                qsf = QueryStringFilter(f"orderby=-age&after={cursor.encode()}")
+
+                with self.assertRaises(InvalidCursorError):
+                    self.queryset.from_filters(qsf.get_filters())
+
+    def test_loader_strategies_are_cached(self):
+        qs = Queryset(Role).select()
+        self.assertIs(
+            qs.selectinload("user").statement, qs.selectinload("user").statement
+        )
+        self.assertIsNot(qs.noload("user").statement, qs.raiseload("user").statement)
+
+    def test_noload_skip_join(self):
+        qs = Queryset(Role).select()
+        self.assertIn("JOIN users", str(qs.statement))
+        self.assertNotIn("JOIN users", str(qs.noload("user").statement))
+
+    def test_load_only(self):
+        qs = Queryset(Role).select().load_only("user_id")
+        self.assertNotIn("roles.created_at", str(qs.statement))
+
+    def test_filter_fields_and_include(self):
+        qsf = QueryStringFilter("fields=id,group&include=user", dto=RoleDTO)
+        qs = Queryset(Role).select().from_filters(qsf.get_filters())
+        self.assertInStatment(str(qs.statement), "JOIN users", "JOIN groups")
+        self.assertNotIn("JOIN roletypes", str(qs.statement))
@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from src.libs.iam.constants import Permissions
+from src.libs.sqlalchemy.queryset import statement_cache
+from src.users.persistence.sqlalchemy import TokenDB
+from src.users.persistence.sqlalchemy.querysets import UserPermissionQueryset
+
+
+class TestAuthStatementsCache(TestCase):
+    """
+    Hot authentication statements are built once: values are only bound,
+    so SQLAlchemy reuses the compiled statement (same cache key).
+    """
+
+    def test_get_token(self):
+        token_db = TokenDB()
+        qs = token_db._by_sha_qs
+
+        params = [qs.bind(sha_token=sha) for sha in ("sha_1", "sha_2")]
+
+        self.assertNotEqual(params[0], params[1])
+        self.assertIs(token_db._by_sha_qs.statement, qs.statement)
+        self.assertEqual(
+            qs.statement._generate_cache_key(),
+            token_db.qs.select().by_sha("other").statement._generate_cache_key(),
+        )
+
+    def test_has_permissions(self):
+        def get_queryset(user_id: str, group_id: str) -> UserPermissionQueryset:
+            return (
+                UserPermissionQueryset()
+                .select()
+                .granted(user_id=user_id, resource="Task", permission=Permissions.READ)
+                .tenant(group_id)
+                .exists()
+            )
+
+        statement_cache.clear()
+        statement = get_queryset("user_1", "group_1").statement
+        other_qs = get_queryset("user_2", "group_2")
+
+        self.assertIs(other_qs.statement, statement)
+        self.assertEqual(statement_cache.get_stats()["hits"], 1)
+        self.assertIn("user_2", other_qs.params.values())
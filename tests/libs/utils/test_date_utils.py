@@ -1,7 +1,7 @@
-from datetime import time, timedelta
+from datetime import date, time, timedelta
 from unittest import TestCase
 
-from src.libs.utils import seconds_to_time, time_to_seconds
+from src.libs.utils import next_month, seconds_to_time, time_to_seconds
 from src.libs.utils.exceptions import DateUtilConvertionError
 
 
@@ -80,3 +80,11 @@ class TestTimedeltaToTime(TestCase):
         seconds = -1
         with self.assertRaises(DateUtilConvertionError):
             seconds_to_time(to_convert=seconds)
+
+
+class TestNextMonth(TestCase):
+    def test_next_month(self):
+        self.assertEqual(next_month(date(2024, 1, 31)), date(2024, 2, 1))
+
+    def test_next_month_new_year(self):
+        self.assertEqual(next_month(date(2024, 12, 15)), date(2025, 1, 1))
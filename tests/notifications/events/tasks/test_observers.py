@@ -41,6 +41,27 @@ class TestTasksNotificationsObserver(DummyBaseTestCase):
             service.add_messages.assert_called_once_with(messages=["a"])
             service.notify_all.assert_called_once()
 
+    def test_notifications_observer_batch(self):
+        events = [
+            {"targets": [f"assigned_{i}"], "today": [], "tomorrow": []} for i in range(3)
+        ]
+
+        with patch(NOTIFICATION_SERVICE_PATH) as MockClass:
+            service = MockClass.return_value
+            service.build_batch_messages = MagicMock(return_value=["a", "b", "c"])
+            service.add_messages = MagicMock()
+            service.notify_all = MagicMock()
+
+            TasksNotificationsObserver.run_batch(
+                self.app, event_name="tasks:todo_today:tasks", events=events
+            )
+
+            service.build_batch_messages.assert_called_once_with(
+                name="tasks:todo_today:tasks", contexts=events
+            )
+            service.add_messages.assert_called_once_with(messages=["a", "b", "c"])
+            service.notify_all.assert_called_once()
+
     def test_notifications_observer_log_error(self):
         event_data = {
             "targets": ["assigned_123"],
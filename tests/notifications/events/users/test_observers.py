@@ -51,6 +51,30 @@ class TestUsersNotificationsObservers(DummyBaseTestCase):
             service.add_messages.assert_called_once()
             service.notify_all.assert_called_once()
 
+    def test_users_register_user_batch(self):
+        events = [
+            {
+                "targets": [f"user_{i}"],
+                "user_id": f"user_{i}",
+                "first_name": "first",
+                "last_name": "last",
+                "email": self.generate_email(),
+            }
+            for i in range(2)
+        ]
+
+        with patch(NOTIFICATION_SERVICE_PATH) as MockClass:
+            service = MockClass.return_value
+
+            UsersRegisterUserObserver.run_batch(
+                self.app, event_name="users:register:user", events=events
+            )
+
+            self.assertEqual(service.add_new_contact.call_count, 2)
+            service.build_batch_messages.assert_called_once()
+            service.add_messages.assert_called_once()
+            service.notify_all.assert_called_once()
+
     def test_update_existing_user_observer(self):
         event_data = {
             "user_id": "user_123",
@@ -91,6 +115,19 @@ class TestUsersNotificationsObservers(DummyBaseTestCase):
 
             service.delete_contact.assert_called_once()
 
+    def test_delete_user_observer_batch(self):
+        events = [{"user_id": "user_123"}, {"user_id": "user_456"}]
+
+        with patch(NOTIFICATION_SERVICE_PATH) as MockClass:
+            service = MockClass.return_value
+            service.delete_contact = MagicMock()
+
+            UsersDeleteUserObserver.run_batch(
+                self.app, event_name="users:delete:user", events=events
+            )
+
+            self.assertEqual(service.delete_contact.call_count, 2)
+
     def test_change_email_observer(self):
         event_data = {
             "targets": ["user_123"],
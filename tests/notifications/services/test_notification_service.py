@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock
 
 from src.notifications.managers import AbstractSender
 from src.notifications.models import AbstractMessage, Contact, Subscription
@@ -268,6 +268,54 @@ class TestNotificationsService(BaseTestCase):
         self.assertIsInstance(messages, list)
         self.assertEqual(len(messages), 0)
 
+    def test_build_batch_messages(self):
+        event = "users:register:user"
+        contexts = [
+            {
+                "first_name": "first",
+                "email": f"test{i}@example.com",
+                "LINK_TO_LOGIN": "htttp://www.vtaskr.com",
+                "targets": [f"abc12{i}"],
+            }
+            for i in range(3)
+        ]
+        self.notification_service._messages.clear()
+
+        sub_manager = self.notification_service.subscription_manager
+        sub_manager.get_subscriptions_for_event = MagicMock(
+            return_value=[
+                Subscription(
+                    type=MessageType.EMAIL,
+                    contact_id=f"abc12{i}",
+                    contact=Contact(
+                        first_name="first",
+                        last_name="last",
+                        email=f"test{i}@example.com",
+                        id=f"abc12{i}",
+                        locale="en_GB",
+                    ),
+                    name="users:register:user",
+                )
+                for i in range(2)
+            ]
+        )
+
+        with self.app.app_context():
+            with self.assertLogs(
+                "src.notifications.services.notification_service", level="ERROR"
+            ):
+                messages = self.notification_service.build_batch_messages(
+                    name=event, contexts=contexts
+                )
+
+        sub_manager.get_subscriptions_for_event.assert_called_once_with(
+            session=ANY, name=event, targets=["abc120", "abc121", "abc122"]
+        )
+
+        self.assertEqual(len(messages), 2)
+        self.assertIsInstance(messages[0], AbstractMessage)
+        self.assertEqual(len(self.notification_service._messages), 0)
+
     def test_add_messages(self):
         initial = len(self.notification_service._messages)
         messages = ["a", "b", "c"]
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from src.tasks.managers import TagManager
 from src.tasks.models import Tag
@@ -94,6 +94,46 @@ class TestTagManager(DummyBaseTestCase):
         self.assertIsInstance(tags[0], Tag)
         self.assertEqual(tags[0].title, "Test Tag")
 
+    def test_get_tags_cached_until_tag_change(self):
+        tag = Tag(title="Cached Tag", tenant_id="tenant_cached")
+
+        self.tag_m.services.identity.all_tenants_with_access = MagicMock(
+            return_value=[tag.tenant_id]
+        )
+        self.tag_m.services.identity.can = MagicMock(return_value=True)
+        self.tag_m.tag_db.tags = MagicMock(return_value=[tag])
+        self.tag_m.tag_db.save = MagicMock()
+
+        with patch.object(
+            self.tag_m.services.persistence, "can_cache", return_value=True
+        ):
+            for _ in range(2):
+                tags = self.tag_m.get_tags(session=None, user_id="user_123")
+            self.tag_m.tag_db.tags.assert_called_once()
+            self.assertEqual(tags[0].id, tag.id)
+            self.assertEqual(tags[0].title, "Cached Tag")
+            self.assertEqual(tags[0].created_at, tag.created_at)
+            self.assertEqual(str(tags[0].color), str(tag.color))
+
+            self.tag_m.update_tag(session=None, user_id="user_123", tag=tag)
+            self.tag_m.get_tags(session=None, user_id="user_123")
+            self.assertEqual(self.tag_m.tag_db.tags.call_count, 2)
+
+    def test_get_tags_not_cached_with_pending_changes(self):
+        tag = Tag(title="Pending Tag", tenant_id="tenant_pending")
+
+        self.tag_m.services.identity.all_tenants_with_access = MagicMock(
+            return_value=[tag.tenant_id]
+        )
+        self.tag_m.tag_db.tags = MagicMock(return_value=[tag])
+
+        with patch.object(
+            self.tag_m.services.persistence, "can_cache", return_value=False
+        ):
+            for _ in range(2):
+                self.tag_m.get_tags(session=None, user_id="user_123")
+        self.assertEqual(self.tag_m.tag_db.tags.call_count, 2)
+
     def test_get_tags_from_ids(self):
         self.tag_m.services.identity.all_tenants_with_access = MagicMock()
         self.tag_m.tag_db.tags_from_ids = MagicMock(return_value=[])
@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock, patch
 
+from src.libs.security.utils import HashingOverloadError
 from tests.base_test import DummyBaseTestCase
 
 URL_API = "/api/v1"
@@ -88,6 +89,24 @@ class TestUserV1NewPassword(DummyBaseTestCase):
             email=email, hash="hash_123", password=self.new_password
         )
 
+    @patch(
+        "src.users.services.UsersService.set_new_password",
+        side_effect=HashingOverloadError("Too many passwords are being hashed"),
+    )
+    def test_set_new_password_overloaded(self, mock: MagicMock):
+        user_data = {
+            "email": "test@example.com",
+            "hash": "hash_123",
+            "new_password": self.new_password,
+        }
+
+        response = self.client.post(
+            f"{URL_API}/new-password", json=user_data, headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers.get("Retry-After"), "1")
+
     @patch(
         "src.users.services.UsersService.set_new_password",
         return_value=False,
@@ -31,6 +31,29 @@ class TestUserV1Confirm2FA(BaseTestCase):
             sha_token=self.token.sha_token, code=payload.get("code_2FA")
         )
 
+    @patch("src.users.hmi.flask.api.v1.confirm_2fa.ACCESS_TOKENS", True)
+    @patch(
+        "src.users.services.UsersService.refresh_access_token",
+        return_value="at.access_token",
+    )
+    @patch(
+        "src.users.services.UsersService.get_temp_token",
+        return_value="token_123",
+    )
+    def test_post_confirm_2FA_access_token(self, mock: MagicMock, mock_at: MagicMock):
+        headers = self.get_token_headers(valid=False)
+        payload = {
+            "code_2FA": self.token.temp_code,
+        }
+
+        response = self.client.post(
+            f"{URL_API_USERS}/2fa", headers=headers, json=payload
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["access_token"], "at.access_token")
+        mock_at.assert_called_once_with(self.token.sha_token)
+
     @patch(
         "src.users.services.UsersService.get_temp_token",
         return_value=None,
@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock, patch
 
+from src.libs.security.utils import HashingOverloadError
 from src.users.models import Token
 from tests.base_test import BaseTestCase
 
@@ -30,6 +31,8 @@ class TestUserV1Login(BaseTestCase):
 
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.content_type, "application/json")
+        self.assertEqual(response.headers.get("X-RateLimit-Limit"), "5")
+        self.assertIn("X-RateLimit-Remaining", response.headers)
 
         token = response.json.get("token")
         self.assertEqual(token, "sha_123")
@@ -59,6 +62,23 @@ class TestUserV1Login(BaseTestCase):
             email=payload.get("email"), password=payload.get("password")
         )
 
+    @patch(
+        "src.users.services.UsersService.authenticate",
+        side_effect=HashingOverloadError("Too many passwords are being hashed"),
+    )
+    def test_post_login_overloaded(self, mock: MagicMock):
+        payload = {
+            "email": self.user.email,
+            "password": self.password,
+        }
+
+        response = self.client.post(
+            f"{URL_API_USERS}/login", headers=self.headers, json=payload
+        )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers.get("Retry-After"), "1")
+
     def test_no_get(self):
         response = self.client.get(f"{URL_API_USERS}/login", headers=self.headers)
         self.assertEqual(response.status_code, 405)
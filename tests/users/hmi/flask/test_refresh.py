@@ -0,0 +1,47 @@
+from unittest.mock import MagicMock, patch
+
+from tests.base_test import DummyBaseTestCase
+
+URL_API_USERS = "/api/v1/users"
+
+
+class TestUserV1Refresh(DummyBaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.headers = self.get_json_headers()
+
+    @patch(
+        "src.users.services.UsersService.refresh_access_token",
+        return_value="at.access_token",
+    )
+    def test_post_refresh(self, mock: MagicMock):
+        headers = self.get_token_headers()
+
+        response = self.client.post(f"{URL_API_USERS}/refresh", headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, "application/json")
+        self.assertEqual(response.json["access_token"], "at.access_token")
+        self.assertIn("expires_in", response.json)
+
+        mock.assert_called_once_with(self.token)
+
+    @patch(
+        "src.users.services.UsersService.refresh_access_token",
+        return_value=None,
+    )
+    def test_post_refresh_invalid_token(self, mock: MagicMock):
+        headers = self.get_token_headers()
+
+        response = self.client.post(f"{URL_API_USERS}/refresh", headers=headers)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.content_type, "application/json")
+
+    def test_no_get(self):
+        response = self.client.get(f"{URL_API_USERS}/refresh", headers=self.headers)
+        self.assertEqual(response.status_code, 405)
+
+    def test_no_delete(self):
+        response = self.client.delete(f"{URL_API_USERS}/refresh", headers=self.headers)
+        self.assertEqual(response.status_code, 405)
@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch
 
 from babel import Locale
 
+from src.libs.security.utils import HashingOverloadError
 from src.settings import LOCALE, TIMEZONE
 from src.users.models import User
 from tests.base_test import DummyBaseTestCase
@@ -82,6 +83,28 @@ class TestUserV1Register(DummyBaseTestCase):
 
         mock_clean.assert_not_called()
 
+    @patch("src.users.services.UsersService.clean_unused_accounts")
+    @patch(
+        "src.users.services.UsersService.register",
+        side_effect=HashingOverloadError("Too many passwords are being hashed"),
+    )
+    def test_post_register_overloaded(
+        self, mock_register: MagicMock, mock_clean: MagicMock
+    ):
+        user_data = {
+            "first_name": self.fake.first_name(),
+            "last_name": self.fake.last_name(),
+            "email": self.generate_email(),
+            "password": self.generate_password(),
+        }
+
+        response = self.client.post(
+            f"{URL_API_USERS}/register", json=user_data, headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers.get("Retry-After"), "1")
+
     def test_no_get(self):
         response = self.client.get(f"{URL_API_USERS}/register", headers=self.headers)
         self.assertEqual(response.status_code, 405)
@@ -0,0 +1,15 @@
+from unittest.mock import MagicMock, patch
+
+from src.users.jobs.tasks import save_tokens_activity
+from tests.base_test import DummyCeleryTestCase
+
+
+class TestUsersTasks(DummyCeleryTestCase):
+    def test_save_tokens_activity(self):
+        with patch("src.users.jobs.tasks.UsersService") as MockClass:
+            service = MockClass.return_value
+            service.save_tokens_activity = MagicMock(return_value=2)
+
+            self.assertEqual(save_tokens_activity(), 2)
+
+            service.save_tokens_activity.assert_called_once()
@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from src.settings import LOCALE, TIMEZONE
+from src.users.managers import AccessTokenManager
+from src.users.models import Token, User
+from tests.base_test import DummyBaseTestCase
+
+
+class TestAccessTokenManager(DummyBaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.access_token_m = AccessTokenManager(services=self.app.dependencies)
+        self.user = User(
+            first_name=self.fake.first_name(),
+            last_name=self.fake.last_name(),
+            email=self.generate_email(),
+            locale=LOCALE,
+            timezone=TIMEZONE,
+        )
+        self.user.set_password(self.generate_password())
+        self.token = Token(user_id=self.user.id, temp=False)
+
+    def test_create_access_token(self):
+        access_token = self.access_token_m.create_access_token(self.token, self.user)
+
+        self.assertTrue(self.access_token_m.is_access_token(access_token))
+        self.assertFalse(self.access_token_m.is_access_token(self.token.sha_token))
+        self.assertNotIn(self.user.hash_password, access_token)
+
+    def test_get_claims(self):
+        access_token = self.access_token_m.create_access_token(self.token, self.user)
+
+        claims = self.access_token_m.get_claims(access_token)
+
+        self.assertEqual(claims["tid"], self.token.id)
+        self.assertEqual(claims["uid"], self.user.id)
+        self.assertIsInstance(claims["iat"], float)
+        self.assertNotIn("user", claims)
+        self.assertNotIn(self.user.email, str(claims))
+
+    def test_get_claims_expired(self):
+        with patch("src.users.managers.access_token_manager.ACCESS_TOKEN_VALIDITY", 0):
+            access_token = self.access_token_m.create_access_token(self.token, self.user)
+
+        self.assertIsNone(self.access_token_m.get_claims(access_token))
+
+    def test_get_claims_bad_signature(self):
+        access_token = self.access_token_m.create_access_token(self.token, self.user)
+
+        self.assertIsNone(self.access_token_m.get_claims(access_token[:-2]))
+        self.assertIsNone(self.access_token_m.get_claims(self.token.sha_token))
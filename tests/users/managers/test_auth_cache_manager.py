@@ -0,0 +1,128 @@
+from time import time
+from unittest.mock import MagicMock, patch
+
+from src.settings import LOCALE, TIMEZONE
+from src.users.managers import AuthCacheManager
+from src.users.models import Token, User
+from tests.base_test import DummyBaseTestCase
+
+
+class TestAuthCacheManager(DummyBaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.auth_cache_m = AuthCacheManager(services=self.app.dependencies)
+        self.user = User(
+            first_name=self.fake.first_name(),
+            last_name=self.fake.last_name(),
+            email=self.generate_email(),
+            locale=LOCALE,
+            timezone=TIMEZONE,
+        )
+        self.user.set_password(self.generate_password())
+        self.token = Token(user_id=self.user.id)
+
+    def test_get_user_not_cached(self):
+        self.assertIsNone(self.auth_cache_m.get_user(self.token.sha_token))
+
+    def test_set_get_user(self):
+        self.auth_cache_m.set_user(self.token.sha_token, self.user)
+
+        user = self.auth_cache_m.get_user(self.token.sha_token)
+
+        self.auth_cache_m.user_db.restore.assert_called_once_with(user)
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.email, self.user.email)
+        self.assertEqual(str(user.locale), str(self.user.locale))
+        self.assertEqual(user.created_at, self.user.created_at)
+
+    def test_set_get_user_by_id(self):
+        self.assertIsNone(self.auth_cache_m.get_user_by_id(self.user.id))
+
+        self.auth_cache_m.set_user_by_id(self.user)
+
+        user = self.auth_cache_m.get_user_by_id(self.user.id)
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.email, self.user.email)
+
+    def test_cache_unavailable(self):
+        with patch.object(self.auth_cache_m.services, "cache") as cache:
+            cache.get.side_effect = ConnectionError
+            cache.set.side_effect = ConnectionError
+
+            self.auth_cache_m.set_user(self.token.sha_token, self.user)
+            self.assertIsNone(self.auth_cache_m.get_user(self.token.sha_token))
+            self.assertIsNone(
+                self.auth_cache_m.is_access_token_revoked(self.token.id, time())
+            )
+
+    def test_password_hash_not_cached(self):
+        self.auth_cache_m.set_user(self.token.sha_token, self.user)
+
+        key = self.auth_cache_m._get_key(self.token.sha_token)
+        self.assertNotIn(self.token.sha_token, key)
+        self.assertNotIn("hash_password", self.app.dependencies.cache.get(key))
+
+    def test_invalidate_tokens(self):
+        self.auth_cache_m.set_user(self.token.sha_token, self.user)
+
+        self.auth_cache_m.invalidate_tokens(self.token.sha_token)
+
+        self.assertIsNone(self.auth_cache_m.get_user(self.token.sha_token))
+
+    def test_invalidate_user(self):
+        other_token = Token(user_id=self.user.id)
+        self.auth_cache_m.set_user(self.token.sha_token, self.user)
+        self.auth_cache_m.set_user(other_token.sha_token, self.user)
+        self.auth_cache_m.set_user_by_id(self.user)
+        self.auth_cache_m.token_db.get_user_tokens = MagicMock(
+            return_value=[self.token, other_token]
+        )
+
+        self.auth_cache_m.invalidate_user(session=None, user_id=self.user.id)
+
+        self.auth_cache_m.token_db.get_user_tokens.assert_called_once()
+        self.assertIsNone(self.auth_cache_m.get_user(self.token.sha_token))
+        self.assertIsNone(self.auth_cache_m.get_user(other_token.sha_token))
+        self.assertIsNone(self.auth_cache_m.get_user_by_id(self.user.id))
+        issued_at = time() - 1
+        self.assertTrue(
+            self.auth_cache_m.is_access_token_revoked(self.token.id, issued_at)
+        )
+        self.assertTrue(
+            self.auth_cache_m.is_access_token_revoked(other_token.id, issued_at)
+        )
+
+    def test_invalidate_user_after_commit(self):
+        self.auth_cache_m.set_user(self.token.sha_token, self.user)
+        self.auth_cache_m.token_db.get_user_tokens = MagicMock(return_value=[self.token])
+
+        with patch.object(
+            self.auth_cache_m.services.persistence, "after_commit"
+        ) as after_commit:
+            self.auth_cache_m.invalidate_user(session=None, user_id=self.user.id)
+
+        self.assertIsNotNone(self.auth_cache_m.get_user(self.token.sha_token))
+        self.assertEqual(after_commit.call_count, 3)
+
+        for callback_call in after_commit.call_args_list:
+            _, callback, *args = callback_call.args
+            callback(*args)
+        self.assertIsNone(self.auth_cache_m.get_user(self.token.sha_token))
+
+    def test_revoke_access_tokens(self):
+        issued_at = time() - 1
+        self.assertFalse(
+            self.auth_cache_m.is_access_token_revoked(self.token.id, issued_at)
+        )
+
+        self.auth_cache_m.revoke_access_tokens(self.token.id)
+
+        self.assertTrue(
+            self.auth_cache_m.is_access_token_revoked(self.token.id, issued_at)
+        )
+        # Access tokens refreshed after the revocation are accepted
+        self.assertFalse(
+            self.auth_cache_m.is_access_token_revoked(self.token.id, time() + 1)
+        )
@@ -1,7 +1,7 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from src.users.managers import GroupManager
-from src.users.models import Group
+from src.users.models import Group, Role
 from tests.base_test import DummyBaseTestCase
 
 
@@ -118,3 +118,26 @@ class TestGroupManager(DummyBaseTestCase):
 
         self.group_m.group_db.get_all_user_groups.assert_called_once()
         self.assertIsInstance(user_groups, list)
+
+    def test_get_all_groups_cached_until_group_change(self):
+        group = self._get_group()
+        role = Role(user_id="user_cached", group_id=group.id, roletype_id="admin")
+
+        self.group_m.services.identity.can = MagicMock(return_value=True)
+        self.group_m.group_db.get_all_user_groups = MagicMock(return_value=[group])
+        self.group_m.group_db.save = MagicMock()
+        self.group_m.role_db.get_group_roles = MagicMock(return_value=[role])
+
+        with patch.object(
+            self.group_m.services.persistence, "can_cache", return_value=True
+        ):
+            for _ in range(2):
+                user_groups = self.group_m.get_all_groups(
+                    session=None, user_id="user_cached"
+                )
+            self.group_m.group_db.get_all_user_groups.assert_called_once()
+            self.assertEqual(user_groups, [group])
+
+            self.group_m.update_group(session=None, user_id="user_cached", group=group)
+            self.group_m.get_all_groups(session=None, user_id="user_cached")
+            self.assertEqual(self.group_m.group_db.get_all_user_groups.call_count, 2)
@@ -1,8 +1,8 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from src.libs.iam.constants import Permissions
 from src.users.managers import RightManager
-from src.users.models import Right, RoleType
+from src.users.models import Right, Role, RoleType
 from tests.base_test import DummyBaseTestCase
 
 
@@ -111,6 +111,27 @@ class TestRightManager(DummyBaseTestCase):
 
         self.assertEqual(right.id, user_right.id)
 
+    def test_get_all_rights_cached(self):
+        right = self._get_right()
+
+        self.right_m.services.identity.all_tenants_with_access = MagicMock(
+            return_value=["group_rights_cached"]
+        )
+        self.right_m.right_db.get_all_user_rights = MagicMock(return_value=[right])
+        # Entries of previous runs are never read
+        self.right_m.services.cache.bump_versions("group_rights_cached")
+
+        with patch.object(
+            self.right_m.services.persistence, "can_cache", return_value=True
+        ):
+            for _ in range(2):
+                user_rights = self.right_m.get_all_rights(
+                    session=None, user_id="user_132"
+                )
+
+        self.right_m.right_db.get_all_user_rights.assert_called_once()
+        self.assertEqual(user_rights, [right])
+
     def test_cannot_get_right(self):
         right = self._get_right()
 
@@ -161,6 +182,25 @@ class TestRightManager(DummyBaseTestCase):
         self.right_m.right_db.save.assert_called_once()
         self.assertTrue(udpated)
 
+    def test_update_right_invalidate_members_permissions(self):
+        base_right = self._get_right()
+        base_roletype = self._get_roletype()
+        role = Role(user_id="user_456", group_id="group_123", roletype_id="roletype_123")
+
+        self.right_m.right_db.save = MagicMock()
+        self.right_m.role_db.get_group_roles = MagicMock(return_value=[role])
+        self.right_m.services.identity.can = MagicMock(return_value=True)
+
+        with patch.object(self.right_m.services.cache, "bump_versions") as bump:
+            self.right_m.update_right(
+                session=None,
+                user_id="user_123",
+                right=base_right,
+                roletype=base_roletype,
+            )
+
+        bump.assert_called_once_with("group_123", "user_456")
+
     def test_cannot_update_right(self):
         base_right = self._get_right()
         base_roletype = self._get_roletype()
@@ -47,6 +47,7 @@ class TestRoleManager(DummyBaseTestCase):
             )
 
         self.role_m.role_db.save.assert_called_once()
+        self.role_m.permission_db.sync_users.assert_called_once_with(session, ["a1"])
         self.assertEqual(role.user_id, "a1")
         self.assertEqual(role.group_id, "b2")
         self.assertEqual(role.roletype_id, "c3")
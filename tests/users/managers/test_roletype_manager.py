@@ -1,7 +1,7 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from src.users.managers import RoleTypeManager
-from src.users.models import RoleType
+from src.users.models import Role, RoleType
 from tests.base_test import DummyBaseTestCase
 
 
@@ -141,6 +141,29 @@ class TestRoleTypeManager(DummyBaseTestCase):
         self.assertEqual(roletype.name, base_roletype.name)
         self.assertEqual(roletype.group_id, base_roletype.group_id)
 
+    def test_get_all_roletypes_cached(self):
+        base_roletype = self._get_other_roletype()
+
+        self.roletype_m.roletype_db.get_all_user_roletypes = MagicMock(
+            return_value=[base_roletype]
+        )
+        self.roletype_m.services.identity.all_tenants_with_access = MagicMock(
+            return_value=["group_roletypes_cached"]
+        )
+        # Entries of previous runs are never read
+        self.roletype_m.services.cache.bump_versions("group_roletypes_cached")
+
+        with patch.object(
+            self.roletype_m.services.persistence, "can_cache", return_value=True
+        ):
+            for _ in range(2):
+                roletypes_list = self.roletype_m.get_all_roletypes(
+                    session=None, user_id="user_123"
+                )
+
+        self.roletype_m.roletype_db.get_all_user_roletypes.assert_called_once()
+        self.assertEqual(roletypes_list, [base_roletype])
+
     def test_update_roletype(self):
         base_roletype = self._get_other_roletype()
 
@@ -183,6 +206,28 @@ class TestRoleTypeManager(DummyBaseTestCase):
         self.roletype_m.roletype_db.delete.assert_called_once()
         self.assertTrue(deleted)
 
+    def test_delete_roletype_sync_permissions(self):
+        base_roletype = self._get_other_roletype()
+        role = Role(
+            user_id="user_456", group_id="group_123", roletype_id=base_roletype.id
+        )
+        other_role = Role(user_id="user_789", group_id="group_123", roletype_id="other")
+
+        self.roletype_m.roletype_db.delete = MagicMock()
+        self.roletype_m.permission_db.sync_users = MagicMock()
+        self.roletype_m.role_db.get_group_roles = MagicMock(
+            return_value=[role, other_role]
+        )
+        self.roletype_m.services.identity.can = MagicMock(return_value=True)
+
+        self.roletype_m.delete_roletype(
+            session=None, user_id="user_123", roletype=base_roletype
+        )
+
+        self.roletype_m.permission_db.sync_users.assert_called_once_with(
+            None, ["user_456"]
+        )
+
     def test_cannot_delete_roletype(self):
         base_roletype = self._get_other_roletype()
 
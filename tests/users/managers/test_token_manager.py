@@ -1,5 +1,9 @@
-from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
 
+from src.libs.security.utils import get_id
+from src.settings import TOKEN_ACTIVITY_GRANULARITY
 from src.users.managers import TokenManager
 from src.users.models import Token
 from tests.base_test import DummyBaseTestCase
@@ -9,6 +13,7 @@ class TestTokenManager(DummyBaseTestCase):
     def setUp(self) -> None:
         super().setUp()
         self.token_m = TokenManager(services=self.app.dependencies)
+        self.token_m.activity_key = f"test:tokens_activity:{get_id()}"
 
     def _get_token(self):
         return Token(user_id="user_123")
@@ -37,6 +42,23 @@ class TestTokenManager(DummyBaseTestCase):
 
         self.token_m.token_db.clean_expired.assert_called_once()
 
+    def test_clean_expired_saves_pending_activities(self):
+        base_token = self._get_token()
+        old_activity = datetime.now(tz=ZoneInfo("UTC")) - timedelta(
+            seconds=TOKEN_ACTIVITY_GRANULARITY
+        )
+        self.token_m.touch_token(base_token, old_activity)
+        manager = MagicMock()
+        self.token_m.token_db.bulk_activity_update = manager.bulk_activity_update
+        self.token_m.token_db.clean_expired = manager.clean_expired
+
+        self.token_m.clean_expired(session=None)
+
+        self.assertEqual(
+            [name for name, _, _ in manager.mock_calls],
+            ["bulk_activity_update", "clean_expired"],
+        )
+
     def test_update_token(self):
         base_token = self._get_token()
         self.token_m.token_db.save = MagicMock()
@@ -54,3 +76,58 @@ class TestTokenManager(DummyBaseTestCase):
 
         self.token_m.token_db.delete.assert_called_once()
         self.assertTrue(result)
+
+    def test_touch_token(self):
+        base_token = self._get_token()
+        old_activity = datetime.now(tz=ZoneInfo("UTC")) - timedelta(
+            seconds=TOKEN_ACTIVITY_GRANULARITY
+        )
+
+        self.assertIsNone(self.token_m.get_pending_activity(base_token))
+        self.assertTrue(self.token_m.touch_token(base_token, old_activity))
+
+        pending_activity_at = self.token_m.get_pending_activity(base_token)
+        self.assertGreater(pending_activity_at, old_activity)
+
+    def test_touch_token_recent_activity(self):
+        base_token = self._get_token()
+
+        self.assertFalse(
+            self.token_m.touch_token(base_token, base_token.last_activity_at)
+        )
+        self.assertIsNone(self.token_m.get_pending_activity(base_token))
+
+    def test_save_pending_activities(self):
+        tokens = [self._get_token(), self._get_token()]
+        old_activity = datetime.now(tz=ZoneInfo("UTC")) - timedelta(
+            seconds=TOKEN_ACTIVITY_GRANULARITY
+        )
+        for token in tokens:
+            self.token_m.touch_token(token, old_activity)
+        self.token_m.token_db.bulk_activity_update = MagicMock()
+
+        self.assertEqual(self.token_m.save_pending_activities(session=None), 2)
+
+        activities = self.token_m.token_db.bulk_activity_update.call_args.kwargs[
+            "activities"
+        ]
+        self.assertEqual(set(activities), {token.id for token in tokens})
+        self.assertIsNone(self.token_m.get_pending_activity(tokens[0]))
+        self.assertEqual(self.token_m.save_pending_activities(session=None), 0)
+
+    def test_save_pending_activities_kept_until_commit(self):
+        self.token_m.token_db.bulk_activity_update = MagicMock()
+        self.token_m.save_pending_activities(session=None)
+        base_token = self._get_token()
+        old_activity = datetime.now(tz=ZoneInfo("UTC")) - timedelta(
+            seconds=TOKEN_ACTIVITY_GRANULARITY
+        )
+        self.token_m.touch_token(base_token, old_activity)
+
+        # Never committed (eg: the transaction failed)
+        with patch.object(self.token_m.services.persistence, "after_commit"):
+            self.token_m.save_pending_activities(session=None)
+
+        self.assertIsNotNone(self.token_m.get_pending_activity(base_token))
+        self.assertEqual(self.token_m.save_pending_activities(session=None), 1)
+        self.assertIsNone(self.token_m.get_pending_activity(base_token))
@@ -37,6 +37,26 @@ class TestToken(TestCase):
         )
         self.assertFalse(token.is_valid())
 
+    def test_token_old_valid_with_pending_activity(self):
+        token = self.create_token(temp=False)
+        token.last_activity_at = datetime.now(tz=ZoneInfo("UTC")) - timedelta(
+            seconds=TOKEN_VALIDITY
+        )
+        pending_activity_at = datetime.now(tz=ZoneInfo("UTC")) - timedelta(seconds=10)
+
+        self.assertTrue(token.is_valid(pending_activity_at))
+        self.assertEqual(
+            token.get_last_activity(pending_activity_at), pending_activity_at
+        )
+
+    def test_token_older_pending_activity_ignored(self):
+        token = self.create_token(temp=False)
+        pending_activity_at = token.last_activity_at - timedelta(seconds=10)
+
+        self.assertEqual(
+            token.get_last_activity(pending_activity_at), token.last_activity_at
+        )
+
     def test_token_temp_is_invalid(self):
         token = self.create_token()
         self.assertFalse(token.is_valid())
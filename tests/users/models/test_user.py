@@ -2,6 +2,7 @@ from datetime import datetime
 from unittest import TestCase
 from zoneinfo import ZoneInfo
 
+from argon2 import PasswordHasher
 from babel import Locale
 from faker import Faker
 
@@ -60,6 +61,16 @@ class TestUser(TestCase):
         self.user.set_password(password)
         self.assertFalse(self.user.check_password("abc_123"))  # nosec
 
+    def test_user_rehash_password(self):
+        password = "aB#1234aB#1234"  # nosec
+        self.user.hash_password = PasswordHasher(time_cost=1).hash(password)
+        old_hash = self.user.hash_password
+
+        self.assertTrue(self.user.rehash_password(password))
+        self.assertNotEqual(old_hash, self.user.hash_password)
+        self.assertTrue(self.user.check_password(password))
+        self.assertFalse(self.user.rehash_password(password))
+
     def test_user_to_string(self):
         self.assertEqual(str(self.user), self.user.full_name)
 
@@ -54,6 +54,40 @@ class TestTokenAdapter(BaseTestCase):
             session.commit()
             self.assertLess(last_activity, self.token.last_activity_at)
 
+    def test_get_user_tokens(self):
+        with self.app.dependencies.persistence.get_session() as session:
+            self.token_db.save(session, self.token)
+            session.commit()
+
+            tokens = self.token_db.get_user_tokens(session, self.user.id)
+            self.assertEqual([token.id for token in tokens], [self.token.id])
+
+    def test_bulk_activity_update(self):
+        old_activity = datetime.now(tz=ZoneInfo("UTC")) - timedelta(hours=1)
+        token = Token(self.user.id, temp=False, last_activity_at=old_activity)
+        self.token.last_activity_at = old_activity
+        new_activity = datetime.now(tz=ZoneInfo("UTC"))
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.token_db.save(session, self.token)
+            self.token_db.save(session, token)
+            session.commit()
+
+            self.token_db.bulk_activity_update(
+                session,
+                {
+                    self.token.id: new_activity,
+                    token.id: old_activity - timedelta(hours=1),
+                },
+            )
+            session.commit()
+
+            session.refresh(self.token)
+            session.refresh(token)
+            self.assertEqual(self.token.last_activity_at, new_activity)
+            # A more recent activity is never replaced
+            self.assertEqual(token.last_activity_at, old_activity)
+
     def test_clean_expired(self):
         token = Token(
             self.user.id,
@@ -0,0 +1,47 @@
+from sqlalchemy import delete
+
+from src.libs.iam.constants import Permissions
+from src.users.persistence.sqlalchemy import GroupDB, UserDB, UserPermissionDB
+from src.users.persistence.sqlalchemy.tables import user_permission_table
+from tests.base_test import BaseTestCase
+
+
+class TestUserPermissionAdapter(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_user()
+
+        self.user_db = UserDB()
+        self.group_db = GroupDB()
+        self.permission_db = UserPermissionDB()
+
+    def has_delete_permission(self, session) -> bool:
+        return self.user_db.has_permissions(
+            session, self.user.id, "Group", Permissions.DELETE, self.group.id
+        )
+
+    def test_synced_with_roles(self):
+        with self.app.dependencies.persistence.get_session() as session:
+            self.assertTrue(self.has_delete_permission(session))
+            self.assertIn(
+                self.group.id,
+                self.group_db.accessibles_by_user_with_permission(
+                    session, Permissions.READ, self.user.id, "Group"
+                ),
+            )
+            self.assertNotIn(self.user.id, self.permission_db.get_drifted_users(session))
+
+    def test_drift_detected_and_fixed(self):
+        with self.app.dependencies.persistence.get_session() as session:
+            session.execute(
+                delete(user_permission_table).where(
+                    user_permission_table.c.user_id == self.user.id
+                )
+            )
+            self.assertFalse(self.has_delete_permission(session))
+            self.assertIn(self.user.id, self.permission_db.get_drifted_users(session))
+
+            self.permission_db.sync_users(session, [self.user.id])
+
+            self.assertTrue(self.has_delete_permission(session))
+            self.assertNotIn(self.user.id, self.permission_db.get_drifted_users(session))
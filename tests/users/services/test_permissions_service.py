@@ -1,6 +1,6 @@
 from src.libs.iam.constants import Permissions
 from src.users.managers import RightManager, RoleManager, RoleTypeManager
-from src.users.services import UsersService
+from src.users.services import PermissionError, UsersService
 from tests.base_test import BaseTestCase
 
 
@@ -104,20 +104,20 @@ class TestPermissionControlOnOthersGroups(BaseTestCase, CheckCanMixin):
     def setUp(self) -> None:
         super().setUp()
         self.create_user()
-        first_user, self.first_group = self.user, self.group
+        self.first_user, self.first_group = self.user, self.group
         self.create_user()
 
-        self.assertNotEqual(first_user.id, self.user.id)
+        self.assertNotEqual(self.first_user.id, self.user.id)
 
         user_service = UsersService(self.app.dependencies)
         self.shared_group = user_service.create_new_group(
-            user_id=first_user.id, group_name="My Shared Group", is_private=False
+            user_id=self.first_user.id, group_name="My Shared Group", is_private=False
         )
 
         roletype_manager = RoleTypeManager(self.app.dependencies)
 
         with self.app.dependencies.persistence.get_session() as session:
-            roletype, _created = roletype_manager.create_custom_roletype(
+            self.roletype, _created = roletype_manager.create_custom_roletype(
                 session=session,
                 name="Read and Create on RoleType only",
                 group_id=self.shared_group.id,
@@ -129,13 +129,13 @@ class TestPermissionControlOnOthersGroups(BaseTestCase, CheckCanMixin):
                 session=session,
                 user_id=self.user.id,
                 group_id=self.shared_group.id,
-                roletype_id=roletype.id,
+                roletype_id=self.roletype.id,
             )
 
-            right_manager = RightManager(self.app.dependencies)
-            right_manager.add_right(
+            self.right_manager = RightManager(self.app.dependencies)
+            self.right = self.right_manager.add_right(
                 session=session,
-                roletype_id=roletype.id,
+                roletype_id=self.roletype.id,
                 resource="RoleType",
                 permissions=[Permissions.READ, Permissions.EXECUTE],
             )
@@ -178,6 +178,51 @@ class TestPermissionControlOnOthersGroups(BaseTestCase, CheckCanMixin):
             )
         )
 
+    def test_permissions_map_updated_after_a_right_change(self):
+        self.assertFalse(
+            self.check_can(
+                permission=Permissions.CREATE,
+                user_id=self.user.id,
+                group_id_resource=self.shared_group.id,
+            )
+        )
+
+        with self.app.dependencies.persistence.get_session() as session:
+            self.right.permissions = [Permissions.READ, Permissions.CREATE]
+            self.right_manager.update_right(
+                session=session,
+                user_id=self.first_user.id,
+                right=self.right,
+                roletype=self.roletype,
+            )
+
+        self.assertTrue(
+            self.check_can(
+                permission=Permissions.CREATE,
+                user_id=self.user.id,
+                group_id_resource=self.shared_group.id,
+            )
+        )
+
+    def test_can_many(self):
+        checks = [
+            (Permissions.READ, self.group.id, "RoleType"),
+            (Permissions.READ, self.shared_group.id, "RoleType"),
+            (Permissions.CREATE, self.shared_group.id, "RoleType"),
+            (Permissions.READ, self.first_group.id, "RoleType"),
+        ]
+
+        with self.app.dependencies.persistence.get_session() as session:
+            results = self.app.dependencies.identity.can_many(
+                session, user_id=self.user.id, checks=checks, exception=False
+            )
+            self.assertEqual(results, [True, True, False, False])
+
+            with self.assertRaises(PermissionError):
+                self.app.dependencies.identity.can_many(
+                    session, user_id=self.user.id, checks=checks
+                )
+
     def test_all_tenants_with_read_access_to_group_and_shared(self):
         with self.app.dependencies.persistence.get_session() as session:
             read_roletype_tenant_ids = (
@@ -1,4 +1,5 @@
-from unittest.mock import ANY, MagicMock
+from time import sleep
+from unittest.mock import ANY, MagicMock, patch
 
 from src.libs.iam.constants import Permissions
 from src.settings import LOCALE, TIMEZONE
@@ -312,11 +313,15 @@ class TestUsersService(DummyBaseTestCase):
 
         self.users_service.token_manager.get_token = MagicMock(return_value=base_token)
         self.users_service.token_manager.delete_token = MagicMock()
+        self.users_service.auth_cache_manager.invalidate_tokens = MagicMock()
 
         result = self.users_service.logout(sha_token=base_token.sha_token)
 
         self.users_service.token_manager.get_token.assert_called_once()
         self.users_service.token_manager.delete_token.assert_called_once()
+        self.users_service.auth_cache_manager.invalidate_tokens.assert_called_once_with(
+            base_token.sha_token
+        )
 
         self.assertTrue(result)
 
@@ -337,24 +342,60 @@ class TestUsersService(DummyBaseTestCase):
         base_token.update_last_activity = MagicMock()
         base_user = self._get_user()
         self.users_service.token_manager.get_token = MagicMock(return_value=base_token)
+        self.users_service.token_manager.touch_token = MagicMock()
         self.users_service.user_manager.get_user = MagicMock(return_value=base_user)
 
         user = self.users_service.user_from_token(sha_token=base_token.sha_token)
 
         self.users_service.token_manager.get_token.assert_called_once()
         base_token.is_valid.assert_called_once()
-        base_token.update_last_activity.assert_called_once()
+        base_token.update_last_activity.assert_not_called()
+        self.users_service.token_manager.touch_token.assert_called_once()
         self.users_service.user_manager.get_user.assert_called_once()
 
         self.assertIsInstance(user, User)
         self.assertEqual(base_user.id, user.id)
 
+    def test_user_from_token_cached(self):
+        base_token = self._get_token()
+        base_user = self._get_user()
+        self.users_service.auth_cache_manager.get_user = MagicMock(
+            return_value=base_user
+        )
+        self.users_service.token_manager.get_token = MagicMock()
+
+        user = self.users_service.user_from_token(sha_token=base_token.sha_token)
+
+        self.users_service.token_manager.get_token.assert_not_called()
+        self.assertIs(user, base_user)
+
+    @patch("src.users.managers.token_manager.TOKEN_ACTIVITY_GRANULARITY", 0)
+    def test_user_from_token_cache_unavailable(self):
+        base_token = self._get_token()
+        base_token.is_valid = MagicMock(return_value=True)
+        base_user = self._get_user()
+        self.users_service.token_manager.get_token = MagicMock(return_value=base_token)
+        self.users_service.user_manager.get_user = MagicMock(return_value=base_user)
+        self.users_service.token_manager.token_db.activity_update = MagicMock()
+
+        with patch.object(self.users_service.services, "cache") as cache:
+            cache.get.side_effect = ConnectionError
+            cache.set.side_effect = ConnectionError
+            cache.get_score.side_effect = ConnectionError
+            cache.set_max_score.side_effect = ConnectionError
+
+            user = self.users_service.user_from_token(sha_token=base_token.sha_token)
+
+        self.assertEqual(user.id, base_user.id)
+        self.users_service.token_manager.token_db.activity_update.assert_called_once()
+
     def test_user_from_token_with_temp_token(self):
         base_token = self._get_token()
         base_token.is_valid = MagicMock(return_value=False)
         base_token.update_last_activity = MagicMock()
         base_user = self._get_user()
         self.users_service.token_manager.get_token = MagicMock(return_value=base_token)
+        self.users_service.token_manager.touch_token = MagicMock()
         self.users_service.user_manager.get_user = MagicMock(return_value=base_user)
 
         user = self.users_service.user_from_token(sha_token=base_token.sha_token)
@@ -362,6 +403,7 @@ class TestUsersService(DummyBaseTestCase):
         self.users_service.token_manager.get_token.assert_called_once()
         base_token.is_valid.assert_called_once()
         base_token.update_last_activity.assert_not_called()
+        self.users_service.token_manager.touch_token.assert_not_called()
         self.users_service.user_manager.get_user.assert_not_called()
 
         self.assertIsNone(user)
@@ -379,6 +421,126 @@ class TestUsersService(DummyBaseTestCase):
 
         self.assertIsNone(user)
 
+    @patch("src.users.services.users_service.ACCESS_TOKENS", True)
+    def test_refresh_access_token(self):
+        base_token = self._get_token()
+        base_token.is_valid = MagicMock(return_value=True)
+        base_user = self._get_user()
+        self.users_service.token_manager.get_token = MagicMock(return_value=base_token)
+        self.users_service.token_manager.touch_token = MagicMock()
+        self.users_service.user_manager.get_user = MagicMock(return_value=base_user)
+
+        access_token = self.users_service.refresh_access_token(base_token.sha_token)
+
+        self.users_service.token_manager.touch_token.assert_called_once()
+        claims = self.users_service.access_token_manager.get_claims(access_token)
+        self.assertEqual(claims["tid"], base_token.id)
+        self.assertEqual(claims["uid"], base_user.id)
+
+    def test_refresh_access_token_disabled(self):
+        self.users_service.token_manager.get_token = MagicMock()
+
+        self.assertIsNone(self.users_service.refresh_access_token("sha_123"))
+        self.users_service.token_manager.get_token.assert_not_called()
+
+    @patch("src.users.services.users_service.ACCESS_TOKENS", True)
+    def test_user_from_access_token(self):
+        base_token = self._get_token()
+        base_user = self._get_user()
+        access_token = self.users_service.access_token_manager.create_access_token(
+            base_token, base_user
+        )
+        self.users_service.token_manager.get_token = MagicMock()
+        self.users_service.auth_cache_manager.get_user = MagicMock()
+        self.users_service.user_manager.get_user = MagicMock(return_value=base_user)
+
+        user = self.users_service.user_from_token(sha_token=access_token)
+
+        self.users_service.token_manager.get_token.assert_not_called()
+        self.users_service.auth_cache_manager.get_user.assert_not_called()
+        self.users_service.user_manager.get_user.assert_called_once_with(
+            ANY, user_id=base_user.id
+        )
+        self.assertIsInstance(user, User)
+        self.assertEqual(base_user.id, user.id)
+
+        # Then the user is read from cache
+        user = self.users_service.user_from_token(sha_token=access_token)
+
+        self.users_service.user_manager.get_user.assert_called_once()
+        self.assertEqual(base_user.id, user.id)
+
+    @patch("src.users.services.users_service.ACCESS_TOKENS", True)
+    def test_user_from_revoked_access_token(self):
+        base_token = self._get_token()
+        access_token = self.users_service.access_token_manager.create_access_token(
+            base_token, self._get_user()
+        )
+        self.users_service.auth_cache_manager.revoke_access_tokens(base_token.id)
+
+        self.assertIsNone(self.users_service.user_from_token(sha_token=access_token))
+
+    @patch("src.users.services.users_service.ACCESS_TOKENS", True)
+    def test_user_from_access_token_revocations_unknown(self):
+        base_token = self._get_token()
+        access_token = self.users_service.access_token_manager.create_access_token(
+            base_token, self._get_user()
+        )
+        self.users_service.auth_cache_manager.is_access_token_revoked = MagicMock(
+            return_value=None
+        )
+        self.users_service.token_manager.load_token = MagicMock(return_value=None)
+
+        # The token was deleted (eg: logout)
+        self.assertIsNone(self.users_service.user_from_token(sha_token=access_token))
+        self.users_service.token_manager.load_token.assert_called_once_with(
+            ANY, base_token.id
+        )
+
+    @patch("src.users.services.users_service.ACCESS_TOKENS", True)
+    def test_user_from_access_token_refreshed_after_revocation(self):
+        base_token = self._get_token()
+        self.users_service.auth_cache_manager.revoke_access_tokens(base_token.id)
+        sleep(0.01)
+        base_user = self._get_user()
+        access_token = self.users_service.access_token_manager.create_access_token(
+            base_token, base_user
+        )
+        self.users_service.user_manager.get_user = MagicMock(return_value=base_user)
+
+        self.assertIsNotNone(self.users_service.user_from_token(sha_token=access_token))
+
+    def test_user_from_access_token_disabled(self):
+        access_token = self.users_service.access_token_manager.create_access_token(
+            self._get_token(), self._get_user()
+        )
+
+        self.assertIsNone(self.users_service.user_from_token(sha_token=access_token))
+
+    def test_logout_with_access_token(self):
+        base_token = self._get_token()
+        access_token = self.users_service.access_token_manager.create_access_token(
+            base_token, self._get_user()
+        )
+        self.users_service.token_manager.load_token = MagicMock(return_value=base_token)
+        self.users_service.token_manager.delete_token = MagicMock()
+
+        issued_at = self.users_service.access_token_manager.get_claims(access_token)[
+            "iat"
+        ]
+        result = self.users_service.logout(sha_token=access_token)
+
+        self.users_service.token_manager.load_token.assert_called_once_with(
+            ANY, base_token.id
+        )
+        self.users_service.token_manager.delete_token.assert_called_once()
+        self.assertTrue(
+            self.users_service.auth_cache_manager.is_access_token_revoked(
+                base_token.id, issued_at
+            )
+        )
+        self.assertTrue(result)
+
     def test_request_password_change(self):
         base_user = self._get_user()
         base_request_change = RequestChange(
@@ -1,4 +1,6 @@
-from sqlalchemy import TextClause, text
+from contextlib import contextmanager
+
+from sqlalchemy import Engine, TextClause, event, text
 
 
 def text_query_table_exists() -> TextClause:
@@ -31,3 +33,36 @@ def text_query_column_exists() -> TextClause:
 
 def check_connection_query() -> TextClause:
     return text("SELECT 1;")
+
+
+def text_query_disable_seqscan() -> TextClause:
+    return text("SET LOCAL enable_seqscan = off;")
+
+
+@contextmanager
+def capture_statements(engine: Engine):
+    """Record SQL statements (and their parameters) sent to the database"""
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def get_seq_scans(plan: dict) -> list[str]:
+    """Return relations read sequentially in an EXPLAIN (FORMAT JSON) plan"""
+
+    relations = []
+    if plan.get("Node Type") == "Seq Scan":
+        relations.append(plan["Relation Name"])
+
+    for sub_plan in plan.get("Plans", []):
+        relations.extend(get_seq_scans(sub_plan))
+
+    return relations